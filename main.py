@@ -1,354 +1,3679 @@
 import logging
 import os
-from dotenv import load_dotenv
-import sentry_sdk
-import pandas as pd
+import sys
+import csv
+import gzip
+import time
+import queue
+import random
+import atexit
+import signal
+import threading
+import argparse
+import itertools
+import collections
+import multiprocessing
+import concurrent.futures
+import hashlib
+import math
+import struct
+import json
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+import logging.handlers
+# numpy se carga en el primer uso de un camino vectorizado (ver _NumpyDiferido); pandas, sentry_sdk y
+# python-dotenv se importan solo donde se usan, para que el arranque sea rápido
 # import matplotlib.pyplot as plt # Descomentar si se va a usar para visualizaciones
 # import seaborn as sns # Descomentar si se va a usar para visualizaciones
 from collections import Counter # Para el análisis de frecuencia de aminoácidos
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd # Solo para las anotaciones de tipo
+
+# --- Carga diferida de NumPy ---
+class _NumpyDiferido:
+    """
+    Ocupa el nombre np hasta que algún camino vectorizado lo usa: el primer acceso a un atributo importa numpy,
+    construye las tablas de codificación (_construir_tablas_vectorizadas) y sustituye np por el módulo real,
+    así que a partir de ahí no hay ningún coste añadido. Los comandos que no usan NumPy no pagan su importación.
+    """
+
+    def __getattr__(self, nombre):
+        return getattr(cargar_numpy(), nombre)
+
+np = _NumpyDiferido()
+
+def cargar_numpy():
+    """Importa numpy y construye las tablas vectorizadas si aún no se ha hecho. Devuelve el módulo."""
+    global np
+    if isinstance(np, _NumpyDiferido):
+        import numpy
+        np = numpy
+        _construir_tablas_vectorizadas()
+    return np
 
 # --- Carga de variables de entorno e inicialización de Sentry ---
-load_dotenv() 
+SENTRY_DSN = None # Se asigna en inicializar_entorno
+_entorno_inicializado = False
+
+def inicializar_entorno(usar_sentry: bool = True):
+    """
+    Carga el archivo .env, inicializa Sentry (si usar_sentry y hay SENTRY_DSN) y configura el logging en programa.log.
+    Se llama al empezar cada punto de entrada (menú, lote, benchmark, CLI), no al importar el módulo.
+    """
+    global SENTRY_DSN, _entorno_inicializado
+    if _entorno_inicializado:
+        return
+    _entorno_inicializado = True
+
+    if usar_sentry:
+        from dotenv import load_dotenv
+        load_dotenv()
+        SENTRY_DSN = os.getenv("SENTRY_DSN")
+
+        if SENTRY_DSN:
+            import sentry_sdk
+            sentry_sdk.init(
+                dsn=SENTRY_DSN,
+                # Tasa de muestreo para el monitoreo de rendimiento; desactivada por defecto porque cada traza tiene coste
+                traces_sample_rate=float(os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.0"))
+            )
+            logging.info("Sentry inicializado correctamente.")
+        else:
+            logging.warning("SENTRY_DSN no encontrado en .env. Sentry no estará activo.")
+
+    # --- Configuración del sistema de logging ---
+    # Crea un logger personalizado
+    logger_principal = logging.getLogger('sequence_processor')
+    logger_principal.setLevel(logging.DEBUG)
+
+    # Elimina cualquier handler existente para evitar que los mensajes vayan a la consola por defecto
+    for handler in logger_principal.handlers[:]:
+        logger_principal.removeHandler(handler)
+    for handler in logging.root.handlers[:]: # También limpia el root logger
+        logging.root.removeHandler(handler)
+
+    # Crea un FileHandler para escribir en el archivo
+    file_handler = logging.FileHandler('programa.log', encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG) # Nivel mínimo para este handler
+
+    # Define el formato para el archivo
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+    file_handler.setFormatter(formatter)
+
+    # Añade el FileHandler al logger principal
+    logger_principal.addHandler(file_handler)
+
+# --- Constantes para análisis de proteínas ---
+MIN_LONGITUD_PROTEINA_FUNCIONAL = 5
+MAX_LONGITUD_PROTEINA_FUNCIONAL = 100
+
+# --- Análisis de datos ---
+UMBRAL_ANALISIS_STREAMING_BYTES = 256 * 1024 * 1024 # A partir de este tamaño el análisis se hace por bloques
+
+# --- Tabla de codones ---
+tabla_codones = {
+    'UUU': 'F', 'UUC': 'F', 'UUA': 'L', 'UUG': 'L',
+    'UCU': 'S', 'UCC': 'S', 'UCA': 'S', 'UCG': 'S',
+    'UAU': 'Y', 'UAC': 'Y', 'UAA': 'STOP', 'UAG': 'STOP',
+    'UGU': 'C', 'UGC': 'C', 'UGA': 'STOP', 'UGG': 'W',
+    'CUU': 'L', 'CUC': 'L', 'CUA': 'L', 'CUG': 'L',
+    'CCU': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
+    'CAU': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
+    'CGU': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
+    'AUU': 'I', 'AUC': 'I', 'AUA': 'I', 'AUG': 'M',
+    'ACU': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T',
+    'AAU': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K',
+    'AGU': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R',
+    'GUU': 'V', 'GUC': 'V', 'GUA': 'V', 'GUG': 'V',
+    'GCU': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
+    'GAU': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
+    'GGU': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G'
+}
+
+# --- Motor de traducción vectorizado (NumPy) ---
+# Cada base se codifica como un entero pequeño (A=0, C=1, G=2, U/T=3, inválida=4) y cada codón
+# como un índice 16*b1 + 4*b2 + b3 en [0, 64). El índice 64 representa un codón desconocido.
+CODIGO_BASE_INVALIDA = 4
+INDICE_CODON_DESCONOCIDO = 64
+SIMBOLO_STOP = ord('*')
+SIMBOLO_DESCONOCIDO = ord('?')
+UMBRAL_TRADUCCION_VECTORIZADA = 3000 # Longitud de ARN a partir de la cual el motor 'auto' usa NumPy
+
+def _construir_tabla_codificacion(bases: str) -> 'np.ndarray':
+    tabla = np.full(256, CODIGO_BASE_INVALIDA, dtype=np.uint8)
+    for codigo, base in enumerate(bases):
+        tabla[ord(base)] = codigo
+    return tabla
+
+def _construir_tabla_aminoacidos() -> 'np.ndarray':
+    tabla = np.full(INDICE_CODON_DESCONOCIDO + 1, SIMBOLO_DESCONOCIDO, dtype=np.uint8)
+    for codon, aminoacido in tabla_codones.items():
+        indice = sum(4 ** (2 - i) * 'ACGU'.index(base) for i, base in enumerate(codon))
+        tabla[indice] = SIMBOLO_STOP if aminoacido == 'STOP' else ord(aminoacido)
+    return tabla
+
+def _construir_tablas_vectorizadas():
+    """Crea las tablas de búsqueda de los motores NumPy; la llama cargar_numpy una sola vez."""
+    global CODIFICACION_ARN, TABLA_AMINOACIDOS, CODIFICACION_ACIDO_NUCLEICO, _DESPLAZAMIENTOS_2BITS, _CODIFICACION_AMINOACIDOS
+    CODIFICACION_ARN = _construir_tabla_codificacion('ACGU')
+    TABLA_AMINOACIDOS = _construir_tabla_aminoacidos()
+    # Secuencias empaquetadas: T y U comparten código
+    CODIFICACION_ACIDO_NUCLEICO = _construir_tabla_codificacion('ACGT')
+    CODIFICACION_ACIDO_NUCLEICO[ord('U')] = 3
+    _DESPLAZAMIENTOS_2BITS = np.array([6, 4, 2, 0], dtype=np.uint8)
+    # Perfiles de composición: X agrupa '?' y cualquier otro símbolo
+    _CODIFICACION_AMINOACIDOS = np.full(256, len(AMINOACIDOS_PERFIL) - 1, dtype=np.int64)
+    for indice, aminoacido in enumerate(AMINOACIDOS_PERFIL[:-1]):
+        _CODIFICACION_AMINOACIDOS[ord(aminoacido)] = indice
+
+def codificar_secuencia(secuencia: str, acido_nucleico: bool = False) -> 'np.ndarray':
+    """
+    Convierte una secuencia de texto en un buffer uint8 de códigos de base (0-3, 4 para bases inválidas).
+    Por defecto codifica ARN (T es inválida); con acido_nucleico=True, T y U comparten el código 3.
+    """
+    if secuencia.isascii():
+        crudo = np.frombuffer(secuencia.encode('ascii'), dtype=np.uint8)
+    else:
+        # Caracteres fuera de ASCII: se conserva una posición por carácter y se marcan como inválidos
+        crudo = np.minimum(np.frombuffer(secuencia.encode('utf-32-le'), dtype=np.uint32), 255)
+    return (CODIFICACION_ACIDO_NUCLEICO if acido_nucleico else CODIFICACION_ARN)[crudo]
+
+def calcular_indices_codones(codigos: 'np.ndarray') -> 'np.ndarray':
+    """
+    Agrupa los códigos de base en tripletes (marco 0) y devuelve el índice de cada codón (64 si es desconocido).
+    Los nucleótidos sobrantes al final (longitud no múltiplo de 3) se ignoran.
+    """
+    numero_codones = len(codigos) // 3
+    tripletes = codigos[:numero_codones * 3].reshape(numero_codones, 3)
+    indices = tripletes[:, 0] * 16 + tripletes[:, 1] * 4 + tripletes[:, 2]
+    indices[(tripletes == CODIGO_BASE_INVALIDA).any(axis=1)] = INDICE_CODON_DESCONOCIDO
+    return indices
+
+def traducir_indices_codones(indices: 'np.ndarray'):
+    """
+    Traduce un arreglo de índices de codón hasta el primer STOP.
+    Devuelve (proteina, conteo_codones_desconocidos, indice_codon_stop o None).
+    """
+    aminoacidos = TABLA_AMINOACIDOS[indices]
+    es_stop = aminoacidos == SIMBOLO_STOP
+    indice_stop = int(es_stop.argmax()) if es_stop.any() else None
+    fin = len(aminoacidos) if indice_stop is None else indice_stop
+    conteo_desconocidos = int(np.count_nonzero(indices[:fin] == INDICE_CODON_DESCONOCIDO))
+    return aminoacidos[:fin].tobytes().decode('ascii'), conteo_desconocidos, indice_stop
+
+def traducir_arn_vectorizado(arn: str):
+    """
+    Equivalente vectorizado del bucle de traducción de AnalizadorProteinas.traducir_arn.
+    Devuelve (proteina, conteo_codones_desconocidos, posicion_stop o None), con la posición en nucleótidos.
+    """
+    proteina, conteo_desconocidos, indice_stop = traducir_indices_codones(calcular_indices_codones(codificar_secuencia(arn)))
+    return proteina, conteo_desconocidos, None if indice_stop is None else indice_stop * 3
+
+def traducir_arns_vectorizado(arns: list) -> list:
+    """
+    Traduce varios ARN en una sola pasada vectorizada: concatena el marco 0 útil de cada uno (sin los nucleótidos
+    sobrantes, así los codones no cruzan de una secuencia a otra), calcula todos los índices de codón a la vez y
+    reparte el resultado. Devuelve, para cada ARN, lo mismo que traducir_arn_vectorizado.
+    """
+    if not arns:
+        return []
+    utiles = [arn[:len(arn) - len(arn) % 3] for arn in arns]
+    numero_codones = np.fromiter((len(arn) // 3 for arn in utiles), dtype=np.int64, count=len(utiles))
+    fines = np.cumsum(numero_codones)
+    inicios = fines - numero_codones
+    indices = calcular_indices_codones(codificar_secuencia("".join(utiles)))
+    aminoacidos = TABLA_AMINOACIDOS[indices]
+    # Primer STOP de cada secuencia: el primero de todos los STOP que no queda antes de su inicio
+    paradas = np.append(np.flatnonzero(aminoacidos == SIMBOLO_STOP), len(indices))
+    primera_parada = paradas[np.searchsorted(paradas, inicios)]
+    con_stop = primera_parada < fines
+    fin_proteina = np.where(con_stop, primera_parada, fines)
+    desconocidos_acumulados = np.concatenate(([0], np.cumsum(indices == INDICE_CODON_DESCONOCIDO)))
+    conteos_desconocidos = desconocidos_acumulados[fin_proteina] - desconocidos_acumulados[inicios]
+    texto = aminoacidos.tobytes().decode('ascii')
+    return [(texto[inicio:fin], conteo, 3 * (fin - inicio) if stop else None)
+            for inicio, fin, conteo, stop in zip(inicios.tolist(), fin_proteina.tolist(), conteos_desconocidos.tolist(), con_stop.tolist())]
+
+INDICE_CODON_INICIO = 0 * 16 + 3 * 4 + 2 # AUG
+
+def calcular_indices_codones_solapados(codigos: 'np.ndarray') -> 'np.ndarray':
+    """
+    Calcula el índice de codón en cada posición de la secuencia (los tres marcos a la vez).
+    El codón del marco f y orden j está en la posición f + 3*j del resultado.
+    """
+    if len(codigos) < 3:
+        return np.empty(0, dtype=np.uint8)
+    indices = codigos[:-2] * 16 + codigos[1:-1] * 4 + codigos[2:]
+    invalidos = (codigos == CODIGO_BASE_INVALIDA)
+    indices[invalidos[:-2] | invalidos[1:-1] | invalidos[2:]] = INDICE_CODON_DESCONOCIDO
+    return indices
+
+def buscar_orfs_en_marco(indices_marco: 'np.ndarray', longitud_minima: int, longitud_maxima: int):
+    """
+    Localiza los ORF AUG->STOP de un marco de lectura (vista de índices de codón, sin copiar).
+    Para cada STOP se toma el primer AUG posterior al STOP anterior del mismo marco (ORF máximo).
+    Devuelve tres arreglos: codón de inicio, codón de STOP y longitud en aminoácidos (sin contar el STOP).
+    """
+    return buscar_orfs_en_ventana(indices_marco, longitud_minima, longitud_maxima)[:3]
+
+def buscar_orfs_en_ventana(indices_marco: 'np.ndarray', longitud_minima: int, longitud_maxima: int,
+                           desplazamiento: int = 0, inicio_abierto: int = None):
+    """
+    Como buscar_orfs_en_marco, pero para un marco recorrido por ventanas consecutivas.
+    desplazamiento es el número de codón (del marco completo) del primer codón de la ventana e inicio_abierto,
+    el codón del primer AUG posterior al último STOP de las ventanas anteriores (o None).
+    Devuelve (inicios, paradas, longitudes, inicio_abierto) con codones del marco completo; el último valor
+    es el estado que se pasa a la ventana siguiente.
+    """
+    vacio = np.empty(0, dtype=np.int64)
+    aminoacidos = TABLA_AMINOACIDOS[indices_marco]
+    inicios = np.flatnonzero(indices_marco == INDICE_CODON_INICIO) + desplazamiento
+    paradas = np.flatnonzero(aminoacidos == SIMBOLO_STOP) + desplazamiento
+    if len(paradas) == 0:
+        if inicio_abierto is None and len(inicios):
+            inicio_abierto = int(inicios[0])
+        return vacio, vacio, vacio, inicio_abierto
+    # Estado para la ventana siguiente: primer AUG tras el último STOP
+    posicion_siguiente = np.searchsorted(inicios, paradas[-1] + 1)
+    siguiente_abierto = int(inicios[posicion_siguiente]) if posicion_siguiente < len(inicios) else None
+    if len(inicios) == 0 and inicio_abierto is None:
+        return vacio, vacio, vacio, siguiente_abierto
+
+    paradas_previas = np.concatenate(([desplazamiento - 1], paradas[:-1]))
+    posicion = np.searchsorted(inicios, paradas_previas + 1)
+    con_inicio = posicion < len(inicios)
+    inicio_orf = inicios[np.minimum(posicion, len(inicios) - 1)] if len(inicios) else np.zeros(len(paradas), dtype=np.int64)
+    con_inicio &= inicio_orf < paradas
+    if inicio_abierto is not None:
+        # El primer STOP de la ventana cierra el AUG que quedó abierto en las anteriores
+        con_inicio[0] = True
+        inicio_orf[0] = inicio_abierto
+    longitudes = paradas - inicio_orf
+    seleccion = con_inicio & (longitudes >= longitud_minima) & (longitudes <= longitud_maxima)
+    return inicio_orf[seleccion], paradas[seleccion], longitudes[seleccion], siguiente_abierto
+
+
+# --- Secuencias empaquetadas a 2 bits ---
+# A=0, C=1, G=2, T/U=3 en 2 bits por base (4 bases por byte, la primera en los bits altos).
+# Las bases que no son ACGT/U (N, códigos IUPAC, caracteres inválidos) se guardan aparte como excepciones dispersas.
+# Las tablas CODIFICACION_ACIDO_NUCLEICO y _DESPLAZAMIENTOS_2BITS se crean en _construir_tablas_vectorizadas.
+_COMPLEMENTOS_EXCEPCIONES = bytes.maketrans(b'ACGTURYSWKMBDHVN', b'TGCAAYRSWMKVHDBN')
+TAMANO_VENTANA_EMPAQUETADA = 12 * 1024 * 1024 # Bases desempaquetadas a la vez (múltiplo de 12: 4 bases/byte y 3 por codón)
+
+def empaquetar_codigos(codigos: 'np.ndarray') -> 'np.ndarray':
+    """Empaqueta códigos de base 0-3 en bytes de 4 bases (se rellena con A hasta múltiplo de 4)."""
+    relleno = (-len(codigos)) % 4
+    if relleno:
+        codigos = np.concatenate((codigos, np.zeros(relleno, dtype=np.uint8)))
+    grupos = codigos.reshape(-1, 4)
+    return (grupos[:, 0] << 6) | (grupos[:, 1] << 4) | (grupos[:, 2] << 2) | grupos[:, 3]
+
+
+class SecuenciaEmpaquetada:
+    """
+    Secuencia de ADN/ARN almacenada a 2 bits por base, con una lista dispersa de excepciones
+    (posición, carácter) para N y demás bases no ACGT. Se puede guardar y cargar desde disco con
+    np.memmap sin copiar los datos, y ventana(inicio, fin) devuelve una vista sin copia.
+    Solo se desempaqueta (1 byte por base) la ventana que se está procesando.
+    """
+    MAGIA = b'HXSQ2BIT'
+    CABECERA = struct.Struct('<8sQQQ4s') # magia, longitud, número de excepciones, desplazamiento de las excepciones, alfabeto
+
+    def __init__(self, datos: 'np.ndarray', longitud: int, posiciones_excepciones: 'np.ndarray', bases_excepciones: 'np.ndarray',
+                 desplazamiento: int = 0, alfabeto: str = 'ACGT'):
+        self.datos = datos
+        self.longitud = longitud
+        self.posiciones_excepciones = posiciones_excepciones # Ordenadas, relativas a datos (no a la ventana)
+        self.bases_excepciones = bases_excepciones
+        self.desplazamiento = desplazamiento
+        self.alfabeto = alfabeto # 'ACGT' para ADN, 'ACGU' para ARN: el empaquetado es el mismo
+
+    @classmethod
+    def desde_texto(cls, secuencia: str) -> 'SecuenciaEmpaquetada':
+        """Empaqueta una secuencia de texto (ADN o ARN ya limpios)."""
+        codigos = codificar_secuencia(secuencia, acido_nucleico=True)
+        posiciones = np.flatnonzero(codigos == CODIGO_BASE_INVALIDA)
+        bases = np.frombuffer(secuencia.encode('ascii', errors='replace'), dtype=np.uint8)[posiciones]
+        codigos[posiciones] = 0
+        alfabeto = 'ACGU' if 'U' in secuencia and 'T' not in secuencia else 'ACGT'
+        return cls(empaquetar_codigos(codigos), len(secuencia), posiciones.astype(np.int64), bases.astype(np.uint8), alfabeto=alfabeto)
+
+    @classmethod
+    def cargar(cls, ruta_archivo: str) -> 'SecuenciaEmpaquetada':
+        """Abre un archivo creado con guardar() o empaquetar_fasta() mediante np.memmap (sin leerlo entero)."""
+        with open(ruta_archivo, 'rb') as archivo:
+            magia, longitud, numero_excepciones, desplazamiento_excepciones, alfabeto = cls.CABECERA.unpack(archivo.read(cls.CABECERA.size))
+        if magia != cls.MAGIA:
+            raise ValueError(f"'{ruta_archivo}' no es un archivo de secuencia empaquetada.")
+        datos = np.memmap(ruta_archivo, dtype=np.uint8, mode='r', offset=cls.CABECERA.size, shape=((longitud + 3) // 4,))
+        if numero_excepciones:
+            posiciones = np.memmap(ruta_archivo, dtype='<i8', mode='r', offset=desplazamiento_excepciones, shape=(numero_excepciones,))
+            bases = np.memmap(ruta_archivo, dtype=np.uint8, mode='r', offset=desplazamiento_excepciones + 8 * numero_excepciones,
+                              shape=(numero_excepciones,))
+        else:
+            posiciones, bases = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8)
+        return cls(datos, longitud, posiciones, bases, alfabeto=alfabeto.decode('ascii'))
+
+    def guardar(self, ruta_archivo: str):
+        """Guarda la secuencia (o ventana) en el formato binario que lee cargar()."""
+        with open(ruta_archivo, 'wb') as archivo:
+            archivo.write(self.CABECERA.pack(self.MAGIA, 0, 0, 0, b'ACGT'))
+            escritor = _EscritorEmpaquetado(archivo, self.alfabeto)
+            for inicio in range(0, self.longitud, TAMANO_VENTANA_EMPAQUETADA):
+                ventana = self.ventana(inicio, min(inicio + TAMANO_VENTANA_EMPAQUETADA, self.longitud))
+                escritor.agregar(ventana.codigos(marcar_excepciones=False), *ventana._excepciones_relativas())
+            escritor.cerrar()
+
+    def __len__(self):
+        return self.longitud
+
+    def _rango_excepciones(self, inicio: int, fin: int):
+        desde = np.searchsorted(self.posiciones_excepciones, self.desplazamiento + inicio)
+        hasta = np.searchsorted(self.posiciones_excepciones, self.desplazamiento + fin)
+        return desde, hasta
+
+    def _excepciones_relativas(self):
+        desde, hasta = self._rango_excepciones(0, self.longitud)
+        return (np.asarray(self.posiciones_excepciones[desde:hasta]) - self.desplazamiento,
+                np.asarray(self.bases_excepciones[desde:hasta]))
+
+    def ventana(self, inicio: int, fin: int) -> 'SecuenciaEmpaquetada':
+        """Vista [inicio, fin) que comparte los datos empaquetados (no copia nada)."""
+        inicio, fin = max(0, inicio), min(self.longitud, fin)
+        return SecuenciaEmpaquetada(self.datos, max(0, fin - inicio), self.posiciones_excepciones, self.bases_excepciones,
+                                    self.desplazamiento + inicio, self.alfabeto)
+
+    def __getitem__(self, rebanada):
+        if not isinstance(rebanada, slice) or rebanada.step not in (None, 1):
+            raise TypeError("SecuenciaEmpaquetada solo admite rebanadas contiguas, p. ej. secuencia[100:200].")
+        inicio, fin, _ = rebanada.indices(self.longitud)
+        return self.ventana(inicio, fin)
+
+    def codigos(self, inicio: int = 0, fin: int = None, marcar_excepciones: bool = True) -> 'np.ndarray':
+        """
+        Desempaqueta [inicio, fin) a un arreglo uint8 de códigos 0-3, con CODIGO_BASE_INVALIDA (4) en las excepciones,
+        que es la entrada que esperan los motores de traducción vectorizados.
+        """
+        fin = self.longitud if fin is None else min(fin, self.longitud)
+        if fin <= inicio:
+            return np.empty(0, dtype=np.uint8)
+        absoluto_inicio, absoluto_fin = self.desplazamiento + inicio, self.desplazamiento + fin
+        bytes_ventana = np.asarray(self.datos[absoluto_inicio // 4:(absoluto_fin + 3) // 4])
+        codigos = ((bytes_ventana[:, None] >> _DESPLAZAMIENTOS_2BITS) & 3).astype(np.uint8).ravel()
+        codigos = codigos[absoluto_inicio % 4:absoluto_inicio % 4 + (fin - inicio)]
+        if marcar_excepciones:
+            desde, hasta = self._rango_excepciones(inicio, fin)
+            codigos[np.asarray(self.posiciones_excepciones[desde:hasta]) - absoluto_inicio] = CODIGO_BASE_INVALIDA
+        return codigos
+
+    def a_texto(self) -> str:
+        """Reconstruye el texto de la secuencia (o ventana), incluidas las excepciones."""
+        texto = np.frombuffer(self.alfabeto.encode('ascii'), dtype=np.uint8)[self.codigos(marcar_excepciones=False)]
+        posiciones, bases = self._excepciones_relativas()
+        texto[posiciones] = bases
+        return texto.tobytes().decode('ascii')
+
+    def muestra(self, longitud_maxima: int = 200) -> str:
+        """Texto de ejemplo para la telemetría, como recortar_muestra pero desempaquetando solo el principio."""
+        if self.longitud > longitud_maxima:
+            return self.ventana(0, longitud_maxima).a_texto() + f"... ({self.longitud} caracteres)"
+        return self.a_texto()
+
+    def transcribir(self) -> 'SecuenciaEmpaquetada':
+        """ARN de la secuencia: T y U comparten código, así que es una vista con alfabeto ACGU (sin copia)."""
+        return SecuenciaEmpaquetada(self.datos, self.longitud, self.posiciones_excepciones, self.bases_excepciones,
+                                    self.desplazamiento, 'ACGU')
+
+    def complementaria_inversa(self) -> 'SecuenciaEmpaquetada':
+        """
+        Cadena complementaria inversa, empaquetada también a 2 bits. Se calcula por ventanas desde el final
+        (complementar un código de 2 bits es 3 - código), con memoria auxiliar acotada por TAMANO_VENTANA_EMPAQUETADA.
+        """
+        partes, posiciones_resultado, bases_resultado = [], [], []
+        for fin in range(self.longitud, 0, -TAMANO_VENTANA_EMPAQUETADA):
+            inicio = max(0, fin - TAMANO_VENTANA_EMPAQUETADA)
+            ventana = self.ventana(inicio, fin)
+            partes.append(empaquetar_codigos(3 - ventana.codigos(marcar_excepciones=False)[::-1]))
+            posiciones, bases = ventana._excepciones_relativas()
+            posiciones_resultado.append((self.longitud - 1 - (inicio + posiciones))[::-1])
+            bases_resultado.append(np.frombuffer(bases.tobytes().translate(_COMPLEMENTOS_EXCEPCIONES), dtype=np.uint8)[::-1])
+        if not partes:
+            return SecuenciaEmpaquetada(np.empty(0, dtype=np.uint8), 0, np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint8), alfabeto=self.alfabeto)
+        return SecuenciaEmpaquetada(np.concatenate(partes), self.longitud, np.concatenate(posiciones_resultado).astype(np.int64),
+                                    np.concatenate(bases_resultado), alfabeto=self.alfabeto)
+
+    def __repr__(self):
+        return f"SecuenciaEmpaquetada({self.longitud} bases, {len(self._excepciones_relativas()[0])} excepciones)"
+
+
+class _EscritorEmpaquetado:
+    """Escribe por bloques el formato de SecuenciaEmpaquetada en un archivo ya abierto tras la cabecera."""
+
+    def __init__(self, archivo, alfabeto: str = 'ACGT'):
+        self.archivo = archivo
+        self.alfabeto = alfabeto
+        self.longitud = 0
+        self._pendientes = np.empty(0, dtype=np.uint8)
+        self._posiciones = []
+        self._bases = []
+
+    def agregar(self, codigos: 'np.ndarray', posiciones: 'np.ndarray', bases: 'np.ndarray'):
+        self._posiciones.append(np.asarray(posiciones, dtype='<i8') + self.longitud)
+        self._bases.append(np.asarray(bases, dtype=np.uint8))
+        self.longitud += len(codigos)
+        codigos = np.concatenate((self._pendientes, codigos)) if len(self._pendientes) else codigos
+        completos = len(codigos) - len(codigos) % 4
+        self.archivo.write(empaquetar_codigos(codigos[:completos]).tobytes())
+        self._pendientes = codigos[completos:].copy()
+
+    def cerrar(self):
+        if len(self._pendientes):
+            self.archivo.write(empaquetar_codigos(self._pendientes).tobytes())
+        posiciones = np.concatenate(self._posiciones) if self._posiciones else np.empty(0, dtype='<i8')
+        bases = np.concatenate(self._bases) if self._bases else np.empty(0, dtype=np.uint8)
+        desplazamiento_excepciones = self.archivo.tell()
+        self.archivo.write(posiciones.astype('<i8').tobytes())
+        self.archivo.write(bases.tobytes())
+        self.archivo.seek(0)
+        self.archivo.write(SecuenciaEmpaquetada.CABECERA.pack(SecuenciaEmpaquetada.MAGIA, self.longitud, len(posiciones), desplazamiento_excepciones,
+                                                              self.alfabeto.encode('ascii')))
+
+
+def empaquetar_fasta(ruta_fasta: str, ruta_salida: str) -> int:
+    """
+    Convierte el primer registro de un FASTA (p. ej. un cromosoma) al formato empaquetado, línea a línea,
+    sin cargar la secuencia en memoria. Las letras se pasan a mayúsculas. Devuelve el número de bases.
+    """
+    abrir = gzip.open if ruta_fasta.endswith('.gz') else open
+    with abrir(ruta_fasta, 'rt', encoding='utf-8') as entrada, open(ruta_salida, 'wb') as salida:
+        salida.write(SecuenciaEmpaquetada.CABECERA.pack(SecuenciaEmpaquetada.MAGIA, 0, 0, 0, b'ACGT'))
+        escritor = _EscritorEmpaquetado(salida)
+        lineas, bases_acumuladas, cabeceras = [], 0, 0
+        hay_t = hay_u = False
+        for linea in entrada:
+            if linea.startswith('>'):
+                cabeceras += 1
+                if cabeceras > 1:
+                    break
+                continue
+            linea = linea.strip().upper()
+            lineas.append(linea)
+            bases_acumuladas += len(linea)
+            hay_t, hay_u = hay_t or 'T' in linea, hay_u or 'U' in linea
+            if bases_acumuladas >= TAMANO_VENTANA_EMPAQUETADA:
+                escritor.agregar(*_codificar_bloque_texto("".join(lineas)))
+                lineas, bases_acumuladas = [], 0
+        if lineas:
+            escritor.agregar(*_codificar_bloque_texto("".join(lineas)))
+        # Mismo criterio que SecuenciaEmpaquetada.desde_texto: ARN solo si hay U y ninguna T
+        escritor.alfabeto = 'ACGU' if hay_u and not hay_t else 'ACGT'
+        escritor.cerrar()
+        return escritor.longitud
+
+def _codificar_bloque_texto(texto: str):
+    codigos = codificar_secuencia(texto, acido_nucleico=True)
+    posiciones = np.flatnonzero(codigos == CODIGO_BASE_INVALIDA)
+    codigos[posiciones] = 0
+    return codigos, posiciones, np.frombuffer(texto.encode('ascii', errors='replace'), dtype=np.uint8)[posiciones]
+
+
+# --- Reporte asíncrono de anomalías ---
+class TransporteSentry:
+    """Envía a Sentry los eventos producidos por ReportadorAnomalias."""
+
+    def enviar(self, evento: dict):
+        import sentry_sdk
+        with sentry_sdk.push_scope() as scope:
+            for clave, valor in evento.get('etiquetas', {}).items():
+                scope.set_tag(clave, valor)
+            if evento.get('extras'):
+                scope.set_extras(evento['extras'])
+            if evento.get('exc_info'):
+                sentry_sdk.capture_exception(evento['exc_info'])
+            else:
+                sentry_sdk.capture_message(evento['mensaje'], level=evento['nivel'])
+
+
+class TransporteLocal:
+    """Transporte en memoria (para pruebas o ejecuciones sin Sentry): acumula los eventos en una lista."""
+
+    def __init__(self):
+        self.eventos = []
+
+    def enviar(self, evento: dict):
+        self.eventos.append(evento)
+
+
+def recortar_muestra(muestra: str, longitud_maxima: int) -> str:
+    """Recorta una secuencia de ejemplo para la telemetría, indicando su longitud original."""
+    if muestra is not None and len(muestra) > longitud_maxima:
+        return muestra[:longitud_maxima] + f"... ({len(muestra)} caracteres)"
+    return muestra
+
+
+class ReportadorAnomalias:
+    """
+    Envía la telemetría desde un hilo en segundo plano para que el pipeline nunca se bloquee.
+    Las anomalías se agregan por tipo (codones_desconocidos, proteina_corta, proteina_larga, ...) y se
+    publican como un evento resumen cada intervalo_resumen segundos, con algunas secuencias de ejemplo
+    elegidas por muestreo de reservorio. Los errores se envían individualmente, también en segundo plano.
+    Si la cola está llena se aplica la política de desborde:
+        'descartar_nuevo': se descarta el elemento que llega.
+        'descartar_antiguo': se descarta el elemento más antiguo de la cola para hacer sitio.
+    """
+    POLITICAS_DESBORDE = ('descartar_nuevo', 'descartar_antiguo')
+
+    def __init__(self, transporte, capacidad_cola: int = 10000, intervalo_resumen: float = 30.0,
+                 muestras_por_tipo: int = 5, longitud_maxima_muestra: int = 200, politica_desborde: str = 'descartar_nuevo'):
+        if politica_desborde not in self.POLITICAS_DESBORDE:
+            raise ValueError(f"Política de desborde desconocida: '{politica_desborde}'. Opciones: {', '.join(self.POLITICAS_DESBORDE)}.")
+        self.transporte = transporte
+        self.intervalo_resumen = intervalo_resumen
+        self.muestras_por_tipo = muestras_por_tipo
+        self.longitud_maxima_muestra = longitud_maxima_muestra
+        self.politica_desborde = politica_desborde
+        self.descartados = {} # Elementos perdidos por cola llena, por tipo de anomalía ('evento' para los individuales)
+        self._cola = queue.Queue(maxsize=capacidad_cola)
+        self._bloqueo = threading.Lock()
+        self._agregados = {}
+        self._aleatorio = random.Random()
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name='reportador_anomalias', daemon=True)
+        self._hilo.start()
+
+    def reportar_anomalia(self, tipo: str, muestra: str = None, datos: dict = None):
+        """Encola una anomalía para su agregación. La muestra se recorta para no retener secuencias enormes."""
+        self._encolar(('anomalia', tipo, recortar_muestra(muestra, self.longitud_maxima_muestra), datos))
+
+    def reportar_evento(self, mensaje: str, nivel: str, extras: dict = None, exc_info=None):
+        """Encola un evento individual (errores y críticos) para enviarlo sin agregación."""
+        self._encolar(('evento', {'mensaje': mensaje, 'nivel': nivel, 'extras': extras, 'exc_info': exc_info}))
+
+    def incorporar(self, elementos):
+        """Encola los elementos recogidos por un TelemetriaTrabajador (ya recortados) como si se hubieran reportado aquí."""
+        for elemento in elementos:
+            self._encolar(elemento)
+
+    def _encolar(self, elemento):
+        try:
+            self._cola.put_nowait(elemento)
+            return
+        except queue.Full:
+            pass
+        if self.politica_desborde == 'descartar_antiguo':
+            try:
+                self._contar_descartado(self._cola.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self._cola.put_nowait(elemento)
+                return
+            except queue.Full:
+                pass
+        self._contar_descartado(elemento)
+
+    def _contar_descartado(self, elemento):
+        tipo = elemento[1] if elemento[0] == 'anomalia' else 'evento'
+        with self._bloqueo:
+            self.descartados[tipo] = self.descartados.get(tipo, 0) + 1
+
+    def _agregar(self, tipo, muestra, datos):
+        agregado = self._agregados.setdefault(tipo, {'conteo': 0, 'muestras': []})
+        agregado['conteo'] += 1
+        if muestra is None:
+            return
+        ejemplo = {'secuencia': muestra, **(datos or {})}
+        if len(agregado['muestras']) < self.muestras_por_tipo:
+            agregado['muestras'].append(ejemplo)
+        else:
+            # Muestreo de reservorio: cada anomalía tiene la misma probabilidad de quedar como ejemplo
+            posicion = self._aleatorio.randrange(agregado['conteo'])
+            if posicion < self.muestras_por_tipo:
+                agregado['muestras'][posicion] = ejemplo
+
+    def _enviar(self, evento: dict):
+        try:
+            self.transporte.enviar(evento)
+        except Exception as e:
+            # La telemetría nunca debe interrumpir el procesamiento
+            logging.getLogger('simulador_biologico').debug("Fallo al enviar telemetría: %s", e)
+
+    def _publicar_resumenes(self):
+        agregados, self._agregados = self._agregados, {}
+        with self._bloqueo:
+            descartados, self.descartados = self.descartados, {}
+        for tipo, agregado in agregados.items():
+            self._enviar({
+                'mensaje': f"Anomalía Biológica (resumen): {agregado['conteo']} eventos de tipo '{tipo}'",
+                'nivel': 'warning',
+                'etiquetas': {'tipo_anomalia': tipo, 'conteo': agregado['conteo']},
+                'extras': {'muestras': agregado['muestras']},
+            })
+        if descartados:
+            # Un único evento por intervalo con el desglose por tipo, para no repetir la misma cifra en cada resumen
+            total = sum(descartados.values())
+            self._enviar({
+                'mensaje': f"Telemetría: {total} eventos descartados por cola llena",
+                'nivel': 'warning',
+                'etiquetas': {'tipo_anomalia': 'eventos_descartados', 'conteo': total},
+                'extras': {'descartados_por_tipo': descartados},
+            })
+
+    def _procesar(self, elemento):
+        if elemento[0] == 'anomalia':
+            self._agregar(*elemento[1:])
+        else:
+            self._enviar(elemento[1])
+
+    def _bucle(self):
+        proximo_resumen = time.monotonic() + self.intervalo_resumen
+        while not self._detener.is_set():
+            try:
+                self._procesar(self._cola.get(timeout=max(0.0, min(proximo_resumen - time.monotonic(), 0.5))))
+            except queue.Empty:
+                pass
+            if time.monotonic() >= proximo_resumen:
+                self._publicar_resumenes()
+                proximo_resumen = time.monotonic() + self.intervalo_resumen
+        # Vacía lo pendiente antes de terminar
+        while True:
+            try:
+                self._procesar(self._cola.get_nowait())
+            except queue.Empty:
+                break
+        self._publicar_resumenes()
+
+    def cerrar(self, tiempo_espera: float = 5.0):
+        """Detiene el hilo tras publicar todo lo pendiente."""
+        self._detener.set()
+        self._hilo.join(tiempo_espera)
+
+
+class TelemetriaTrabajador:
+    """
+    Sustituto de ReportadorAnomalias en los procesos trabajadores: en lugar de enviar nada, guarda las anomalías
+    y eventos para devolverlos con el resultado de cada bloque. El proceso principal los pasa a su propio
+    reportador (ReportadorAnomalias.incorporar), así los resúmenes agrupados no se pierden al terminar el pool.
+    """
+
+    def __init__(self, longitud_maxima_muestra: int = 200):
+        self.longitud_maxima_muestra = longitud_maxima_muestra
+        self.pendientes = []
+
+    def reportar_anomalia(self, tipo: str, muestra: str = None, datos: dict = None):
+        self.pendientes.append(('anomalia', tipo, recortar_muestra(muestra, self.longitud_maxima_muestra), datos))
+
+    def reportar_evento(self, mensaje: str, nivel: str, extras: dict = None, exc_info=None):
+        if exc_info:
+            # La traza no se puede enviar entre procesos: se adjunta como texto
+            import traceback
+            extras = {**(extras or {}), 'traza': "".join(traceback.format_exception(*exc_info))}
+        self.pendientes.append(('evento', {'mensaje': mensaje, 'nivel': nivel, 'extras': extras, 'exc_info': None}))
+
+    def extraer(self) -> list:
+        pendientes, self.pendientes = self.pendientes, []
+        return pendientes
+
+
+_reportador_sentry = None
+
+def obtener_reportador_sentry():
+    """Devuelve el ReportadorAnomalias compartido hacia Sentry, creándolo la primera vez."""
+    global _reportador_sentry
+    if _reportador_sentry is None:
+        _reportador_sentry = ReportadorAnomalias(TransporteSentry())
+        atexit.register(_reportador_sentry.cerrar)
+    return _reportador_sentry
+
+
+# --- Registro diferido y asíncrono ---
+LONGITUD_MAXIMA_SECUENCIA_REGISTRO = 80 # Caracteres de una secuencia que se escriben en el log
+
+class SecuenciaResumida:
+    """
+    Envoltorio que difiere el formateo de una secuencia en los mensajes de log.
+    Solo se convierte a texto si el mensaje llega a emitirse; las secuencias largas se recortan
+    y se identifican con su longitud y un resumen BLAKE2b.
+    """
+    __slots__ = ('secuencia', 'longitud_maxima')
+
+    def __init__(self, secuencia: str, longitud_maxima: int = LONGITUD_MAXIMA_SECUENCIA_REGISTRO):
+        self.secuencia = secuencia
+        self.longitud_maxima = longitud_maxima
+
+    def __str__(self):
+        if len(self.secuencia) <= self.longitud_maxima:
+            return self.secuencia
+        resumen = hashlib.blake2b(self.secuencia.encode('utf-8'), digest_size=8).hexdigest()
+        return f"{self.secuencia[:self.longitud_maxima]}... ({len(self.secuencia)} caracteres, blake2b={resumen})"
+
+def configurar_registro_asincrono(ruta_archivo='programa.log', nombre_registrador='simulador_biologico', nivel=logging.INFO,
+                                  max_bytes=10 * 1024 * 1024, copias_respaldo=5):
+    """
+    Sustituye la escritura síncrona en disco por un QueueHandler: el hilo que registra solo encola el
+    LogRecord y un QueueListener lo escribe en un RotatingFileHandler desde otro hilo.
+    Devuelve el QueueListener ya iniciado (se detiene automáticamente al salir del programa; stop() se puede
+    llamar antes sin problema).
+    """
+    manejador_archivo = logging.handlers.RotatingFileHandler(ruta_archivo, maxBytes=max_bytes, backupCount=copias_respaldo, encoding='utf-8')
+    manejador_archivo.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+
+    cola_registro = queue.SimpleQueue()
+    registrador = logging.getLogger(nombre_registrador)
+    registrador.setLevel(nivel)
+    registrador.addHandler(logging.handlers.QueueHandler(cola_registro))
+
+    escuchador = _EscuchadorRegistro(cola_registro, manejador_archivo, respect_handler_level=True)
+    escuchador.start()
+    atexit.register(escuchador.stop)
+    return escuchador
+
+class _EscuchadorRegistro(logging.handlers.QueueListener):
+    """QueueListener cuyo stop() es idempotente (QueueListener.stop falla si ya se detuvo)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.activo = False
+
+    def start(self):
+        super().start()
+        self.activo = True
+
+    def stop(self):
+        if self.activo:
+            self.activo = False
+            super().stop()
+
+
+# --- Métricas e instrumentación ---
+# Límites (en segundos) de los cubos de los histogramas de tiempos, como en los histogramas de Prometheus
+LIMITES_HISTOGRAMA_SEGUNDOS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                               1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class HistogramaTiempos:
+    """
+    Histograma de duraciones con cubos fijos (LIMITES_HISTOGRAMA_SEGUNDOS).
+    Registrar una duración solo la añade a una lista; las muestras se agrupan en cubos con NumPy cada
+    tamano_lote observaciones (o al consultar), de modo que el coste por llamada es mínimo.
+    """
+    def __init__(self, tamano_lote: int = 4096):
+        self.tamano_lote = tamano_lote
+        self._limites_ns = np.array([limite * 1e9 for limite in LIMITES_HISTOGRAMA_SEGUNDOS], dtype=np.int64)
+        self.conteos = np.zeros(len(LIMITES_HISTOGRAMA_SEGUNDOS) + 1, dtype=np.int64) # El último cubo es +Inf
+        self.suma_ns = 0
+        self.cuenta = 0
+        self._muestras = []
+        self._cerrojo = threading.Lock()
+
+    def observar_ns(self, duracion_ns: int):
+        self._muestras.append(duracion_ns)
+        if len(self._muestras) >= self.tamano_lote:
+            self.consolidar()
+
+    def consolidar(self):
+        """Agrupa en cubos las muestras pendientes."""
+        with self._cerrojo:
+            # Se toman solo las n primeras: lo que otros hilos añadan mientras tanto queda para la próxima vez
+            numero = len(self._muestras)
+            if not numero:
+                return
+            muestras = np.array(self._muestras[:numero], dtype=np.int64)
+            del self._muestras[:numero]
+            self.conteos += np.bincount(np.searchsorted(self._limites_ns, muestras, side='left'), minlength=len(self.conteos))
+            self.suma_ns += int(muestras.sum())
+            self.cuenta += numero
+
+    def extraer(self, reiniciar: bool = False):
+        """Devuelve (conteos, suma_ns, cuenta); con reiniciar=True los pone a cero."""
+        self.consolidar()
+        with self._cerrojo:
+            datos = (self.conteos.tolist(), self.suma_ns, self.cuenta)
+            if reiniciar:
+                self.conteos[:] = 0
+                self.suma_ns = self.cuenta = 0
+        return datos
+
+    def combinar(self, conteos, suma_ns: int, cuenta: int):
+        with self._cerrojo:
+            self.conteos += np.asarray(conteos, dtype=np.int64)
+            self.suma_ns += suma_ns
+            self.cuenta += cuenta
+
+    def percentil(self, q: float) -> float:
+        """Percentil aproximado (en segundos): el límite superior del cubo que lo contiene."""
+        self.consolidar()
+        if not self.cuenta:
+            return 0.0
+        indice = int(np.searchsorted(np.cumsum(self.conteos), math.ceil(q / 100.0 * self.cuenta)))
+        return LIMITES_HISTOGRAMA_SEGUNDOS[indice] if indice < len(LIMITES_HISTOGRAMA_SEGUNDOS) else math.inf
+
+
+class RegistroMetricas:
+    """
+    Almacén de métricas de una ejecución: contadores y histogramas de tiempos identificados por
+    (nombre, etiquetas), al estilo de Prometheus. Ejemplos:
+        secuencias_procesadas_total{resultado="valido"}
+        anomalias_total{tipo="proteina_corta"}
+        duracion_etapa_segundos{etapa="AnalizadorProteinas.traducir_arn"}
+    """
+    def __init__(self):
+        self.contadores = {}
+        self.histogramas = {}
+        self._cerrojo = threading.Lock()
+
+    @staticmethod
+    def _clave(nombre, etiquetas):
+        return (nombre, tuple(sorted(etiquetas.items())) if etiquetas else ())
+
+    def incrementar(self, nombre: str, valor=1, etiquetas: dict = None):
+        clave = self._clave(nombre, etiquetas)
+        with self._cerrojo:
+            self.contadores[clave] = self.contadores.get(clave, 0) + valor
+
+    def histograma(self, nombre: str, etiquetas: dict = None) -> HistogramaTiempos:
+        clave = self._clave(nombre, etiquetas)
+        histograma = self.histogramas.get(clave)
+        if histograma is None:
+            with self._cerrojo:
+                histograma = self.histogramas.setdefault(clave, HistogramaTiempos())
+        return histograma
+
+    @contextlib.contextmanager
+    def cronometrar(self, nombre: str, etiquetas: dict = None):
+        """Mide la duración del bloque with en el histograma indicado."""
+        histograma = self.histograma(nombre, etiquetas)
+        inicio = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            histograma.observar_ns(time.perf_counter_ns() - inicio)
+
+    def exportar(self, reiniciar: bool = False) -> dict:
+        """
+        Devuelve los valores acumulados en un diccionario serializable (contadores y, por histograma,
+        conteos por cubo, suma en ns y cuenta). Con reiniciar=True se vacía el registro, lo que permite
+        enviar a otro proceso solo lo acumulado desde la última exportación.
+        """
+        with self._cerrojo:
+            contadores, histogramas = self.contadores, list(self.histogramas.items())
+            if reiniciar:
+                self.contadores = {}
+        # Los histogramas se vacían en su sitio: las envolturas de instrumentar conservan una referencia a ellos
+        return {'contadores': dict(contadores),
+                'histogramas': {clave: histograma.extraer(reiniciar) for clave, histograma in histogramas}}
+
+    def _copias(self):
+        with self._cerrojo:
+            return sorted(self.contadores.items()), sorted(self.histogramas.items(), key=lambda elemento: elemento[0])
+
+    def incorporar(self, datos: dict):
+        """Suma al registro los valores exportados por otro (p. ej. desde un proceso trabajador)."""
+        for clave, valor in datos['contadores'].items():
+            with self._cerrojo:
+                self.contadores[clave] = self.contadores.get(clave, 0) + valor
+        for (nombre, etiquetas), (conteos, suma_ns, cuenta) in datos['histogramas'].items():
+            self.histograma(nombre, dict(etiquetas)).combinar(conteos, suma_ns, cuenta)
+
+    def resumen(self) -> dict:
+        """Resumen legible: contadores y, por histograma, llamadas, tiempo total, media y percentiles aproximados."""
+        resumen = {'contadores': {}, 'histogramas': {}}
+        contadores, histogramas = self._copias()
+        for (nombre, etiquetas), valor in contadores:
+            resumen['contadores'][_nombre_metrica(nombre, etiquetas)] = valor
+        for (nombre, etiquetas), histograma in histogramas:
+            histograma.consolidar()
+            resumen['histogramas'][_nombre_metrica(nombre, etiquetas)] = {
+                'llamadas': histograma.cuenta,
+                'segundos_totales': histograma.suma_ns / 1e9,
+                'media_us': histograma.suma_ns / histograma.cuenta / 1000.0 if histograma.cuenta else 0.0,
+                'p50_us_max': histograma.percentil(50) * 1e6,
+                'p99_us_max': histograma.percentil(99) * 1e6,
+            }
+        return resumen
+
+    def a_prometheus(self) -> str:
+        """Devuelve las métricas en el formato de texto de exposición de Prometheus."""
+        lineas = []
+        ultimo_nombre = None
+        contadores, histogramas = self._copias()
+        for (nombre, etiquetas), valor in contadores:
+            if nombre != ultimo_nombre:
+                lineas.append(f"# TYPE {nombre} counter")
+                ultimo_nombre = nombre
+            lineas.append(f"{_nombre_metrica(nombre, etiquetas)} {valor}")
+        for (nombre, etiquetas), histograma in histogramas:
+            if nombre != ultimo_nombre:
+                lineas.append(f"# TYPE {nombre} histogram")
+                ultimo_nombre = nombre
+            histograma.consolidar()
+            acumulado = 0
+            for limite, conteo in zip(LIMITES_HISTOGRAMA_SEGUNDOS + ('+Inf',), histograma.conteos.tolist()):
+                acumulado += conteo
+                lineas.append(f"{_nombre_metrica(nombre + '_bucket', etiquetas + (('le', str(limite)),))} {acumulado}")
+            lineas.append(f"{_nombre_metrica(nombre + '_sum', etiquetas)} {histograma.suma_ns / 1e9}")
+            lineas.append(f"{_nombre_metrica(nombre + '_count', etiquetas)} {histograma.cuenta}")
+        return "\n".join(lineas) + "\n"
+
+
+def _nombre_metrica(nombre, etiquetas):
+    if not etiquetas:
+        return nombre
+    return nombre + "{" + ",".join(f'{clave}="{valor}"' for clave, valor in etiquetas) + "}"
+
+
+def instrumentar(objeto, metricas: RegistroMetricas, metodos=None):
+    """
+    Sustituye en la instancia (no en la clase) cada método de metodos (por defecto, todos los públicos)
+    por una envoltura que mide su duración en duracion_etapa_segundos{etapa="Clase.metodo"}; el número de llamadas es la cuenta del histograma.
+    Las instancias sin instrumentar no pagan ningún coste. Devuelve el mismo objeto.
+    """
+    clase = type(objeto)
+    if metodos is None:
+        metodos = [nombre for nombre, valor in vars(clase).items() if not nombre.startswith('_') and callable(valor)]
+    for nombre_metodo in metodos:
+        setattr(objeto, nombre_metodo, _envolver_con_cronometro(getattr(objeto, nombre_metodo),
+                metricas.histograma('duracion_etapa_segundos', {'etapa': f"{clase.__name__}.{nombre_metodo}"})))
+    return objeto
+
+def _envolver_con_cronometro(metodo, histograma):
+    reloj = time.perf_counter_ns
+    observar = histograma.observar_ns
+
+    def envoltura(*args, **kwargs):
+        inicio = reloj()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            observar(reloj() - inicio)
+    envoltura.__name__ = metodo.__name__
+    envoltura.__doc__ = metodo.__doc__
+    return envoltura
+
+
+def _escribir_atomico(ruta_archivo: str, contenido: str):
+    # Se escribe en un temporal y se renombra: quien lea el archivo (p. ej. node_exporter) nunca lo ve a medias
+    temporal = f"{ruta_archivo}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta_archivo)
+
+class SumideroConsola:
+    """Imprime por la salida estándar un resumen de las métricas."""
+
+    def __init__(self, flujo=None):
+        self.flujo = flujo
+
+    def publicar(self, metricas: RegistroMetricas):
+        resumen = metricas.resumen()
+        flujo = self.flujo or sys.stdout
+        print("\n--- Métricas ---", file=flujo)
+        for nombre, valor in resumen['contadores'].items():
+            print(f"  {nombre}: {valor}", file=flujo)
+        for nombre, histograma in resumen['histogramas'].items():
+            if not histograma['llamadas']:
+                continue
+            print(f"  {nombre}: {histograma['llamadas']} llamadas, {histograma['segundos_totales']:.3f} s, "
+                  f"media {histograma['media_us']:.1f} us, p50 <= {histograma['p50_us_max']:.1f} us, p99 <= {histograma['p99_us_max']:.1f} us", file=flujo)
+
+class SumideroJSON:
+    """Escribe el resumen de las métricas (y los cubos de cada histograma) en un archivo JSON."""
+
+    def __init__(self, ruta_archivo: str):
+        self.ruta_archivo = ruta_archivo
+
+    def publicar(self, metricas: RegistroMetricas):
+        resumen = metricas.resumen()
+        resumen['limites_histograma_segundos'] = list(LIMITES_HISTOGRAMA_SEGUNDOS)
+        resumen['cubos'] = {_nombre_metrica(nombre, etiquetas): histograma.conteos.tolist()
+                            for (nombre, etiquetas), histograma in metricas._copias()[1]}
+        _escribir_atomico(self.ruta_archivo, json.dumps(resumen, indent=2, ensure_ascii=False))
+
+class SumideroPrometheus:
+    """Escribe las métricas en formato de texto de Prometheus (para el textfile collector de node_exporter)."""
+
+    def __init__(self, ruta_archivo: str):
+        self.ruta_archivo = ruta_archivo
+
+    def publicar(self, metricas: RegistroMetricas):
+        _escribir_atomico(self.ruta_archivo, metricas.a_prometheus())
+
+
+class PublicadorMetricas:
+    """
+    Publica las métricas en los sumideros indicados cada intervalo segundos desde un hilo en segundo plano,
+    y una última vez al detenerse. Con intervalo=None solo se publica al detenerse.
+    """
+    def __init__(self, metricas: RegistroMetricas, sumideros, intervalo: float = None):
+        self.metricas = metricas
+        self.sumideros = list(sumideros)
+        self.intervalo = intervalo
+        self._detener = threading.Event()
+        self._hilo = None
+        if intervalo:
+            self._hilo = threading.Thread(target=self._bucle, name='publicador-metricas', daemon=True)
+            self._hilo.start()
+
+    def publicar(self):
+        for sumidero in self.sumideros:
+            sumidero.publicar(self.metricas)
+
+    def _bucle(self):
+        while not self._detener.wait(self.intervalo):
+            self.publicar()
+
+    def detener(self):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+        self.publicar()
+
+
+@contextlib.contextmanager
+def perfilar_ejecucion(ruta_salida: str = None, lineas: int = 20):
+    """
+    Ejecuta el bloque with bajo cProfile. Si se indica ruta_salida se guardan las estadísticas
+    (abrir con pstats o snakeviz); si no, se imprimen las funciones con más tiempo acumulado.
+    """
+    import cProfile
+    import pstats
+    perfilador = cProfile.Profile()
+    perfilador.enable()
+    try:
+        yield perfilador
+    finally:
+        perfilador.disable()
+        if ruta_salida:
+            perfilador.dump_stats(ruta_salida)
+        else:
+            pstats.Stats(perfilador).sort_stats('cumulative').print_stats(lineas)
+
+
+# --- Almacenamiento de resultados ---
+_senales_instaladas = False
+
+def _salir_por_senal(numero_senal, marco):
+    raise SystemExit(128 + numero_senal)
+
+def _instalar_salida_en_senales():
+    """
+    Hace que SIGTERM y SIGHUP terminen el programa con SystemExit (en lugar de matarlo), de modo que los
+    escritores registrados en atexit vuelquen sus filas. No se tocan las señales que ya tengan otro manejador.
+    Cambia manejadores de todo el proceso, así que solo la llaman los puntos de entrada (menú, lote y CLI),
+    nunca el código que se usa como biblioteca.
+    """
+    global _senales_instaladas
+    if _senales_instaladas or threading.current_thread() is not threading.main_thread():
+        return
+    _senales_instaladas = True
+    for nombre in ('SIGTERM', 'SIGHUP'):
+        senal = getattr(signal, nombre, None) # SIGHUP no existe en Windows
+        if senal is not None and signal.getsignal(senal) == signal.SIG_DFL:
+            signal.signal(senal, _salir_por_senal)
+
+COLUMNAS_RESULTADOS = ['ADN_Original', 'ADN_Limpio', 'ARN_Secuencia', 'Proteina_Secuencia', 'Longitud_Proteina']
+
+class EscritorResultados:
+    """
+    Acumula filas de resultados en memoria y las escribe por bloques de tamano_bloque filas,
+    abriendo el archivo una sola vez. Formatos admitidos:
+        'csv': mismo esquema que datos_adn.csv (COLUMNAS_RESULTADOS); si el archivo existe se añaden filas.
+        'parquet': formato columnar binario (requiere pyarrow); cada bloque es un row group. Un archivo Parquet no
+                   admite añadir filas, así que si ya existe se rechaza (FileExistsError) en lugar de sobrescribirlo.
+    Si no se indica formato se deduce de la extensión del archivo. Con indice (IndiceResultados, solo CSV),
+    cada bloque escrito se indexa a continuación.
+    Se usa como gestor de contexto; las filas pendientes también se vuelcan al salir del programa o ante una excepción.
+    """
+    FORMATOS = ('csv', 'parquet')
+
+    def __init__(self, nombre_archivo='datos_adn.csv', formato: str = None, tamano_bloque: int = 10000, indice: 'IndiceResultados' = None):
+        if formato is None:
+            formato = 'parquet' if nombre_archivo.endswith('.parquet') else 'csv'
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato de resultados desconocido: '{formato}'. Opciones: {', '.join(self.FORMATOS)}.")
+        if formato == 'parquet' and os.path.exists(nombre_archivo):
+            raise FileExistsError(f"El archivo Parquet '{nombre_archivo}' ya existe y no se puede ampliar; use otro nombre o un CSV.")
+        self.nombre_archivo = nombre_archivo
+        self.formato = formato
+        self.tamano_bloque = tamano_bloque
+        self.indice = indice
+        self.filas_escritas = 0
+        self.bytes_escritos = 0 # Se calcula al cerrar
+        self._tamano_inicial = 0
+        self._pendientes = []
+        self._archivo = None
+        self._escritor = None
+        self._cerrado = False
+        # Si el programa termina (o falla) sin cerrar el escritor, lo pendiente se vuelca al salir
+        # (los puntos de entrada convierten SIGTERM/SIGHUP en una salida normal para que atexit también se ejecute)
+        atexit.register(self.cerrar)
+
+    def agregar(self, fila):
+        """Añade una fila (en el orden de COLUMNAS_RESULTADOS) y vuelca el bloque si se llenó."""
+        self._pendientes.append(fila)
+        if len(self._pendientes) >= self.tamano_bloque:
+            self.vaciar()
+
+    def agregar_filas(self, filas):
+        for fila in filas:
+            self.agregar(fila)
+
+    def vaciar(self):
+        """Escribe en disco las filas pendientes."""
+        if not self._pendientes:
+            return
+        if self._escritor is None:
+            self._abrir()
+        if self.formato == 'csv':
+            self._escritor.writerows(self._pendientes)
+            self._archivo.flush()
+            if self.indice is not None:
+                self.indice.actualizar()
+        else:
+            import pyarrow as pa
+            columnas = list(zip(*self._pendientes))
+            tabla = pa.Table.from_arrays([pa.array(columna) for columna in columnas], schema=self._esquema)
+            self._escritor.write_table(tabla)
+        self.filas_escritas += len(self._pendientes)
+        self._pendientes.clear()
+
+    def _abrir(self):
+        if self.formato == 'csv':
+            self._tamano_inicial = os.path.getsize(self.nombre_archivo) if os.path.exists(self.nombre_archivo) else 0
+            escribir_cabecera = self._tamano_inicial == 0
+            self._archivo = open(self.nombre_archivo, 'a', newline='', encoding='utf-8')
+            self._escritor = csv.writer(self._archivo, lineterminator='\n')
+            if escribir_cabecera:
+                self._escritor.writerow(COLUMNAS_RESULTADOS)
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("El formato 'parquet' requiere el paquete opcional 'pyarrow' (pip install pyarrow).") from e
+            self._esquema = pa.schema([(columna, pa.string()) for columna in COLUMNAS_RESULTADOS[:-1]] + [(COLUMNAS_RESULTADOS[-1], pa.int64())])
+            self._escritor = pq.ParquetWriter(self.nombre_archivo, self._esquema)
+
+    def cerrar(self):
+        """Vuelca las filas pendientes y cierra el archivo."""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        atexit.unregister(self.cerrar)
+        try:
+            self.vaciar()
+        finally:
+            if self.formato == 'parquet' and self._escritor is not None:
+                self._escritor.close()
+                self.bytes_escritos = os.path.getsize(self.nombre_archivo)
+            if self._archivo is not None:
+                # En modo 'a' la posición es el final del archivo
+                self.bytes_escritos = self._archivo.tell() - self._tamano_inicial
+                self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_exc, valor_exc, traza):
+        self.cerrar()
+        return False
+
+
+def leer_bloques_resultados(nombre_archivo, columnas=None, tamano_bloque: int = 100000):
+    """
+    Lee un archivo de resultados (CSV o Parquet) por bloques de tamano_bloque filas, cargando solo las columnas pedidas.
+    Devuelve un generador de DataFrames.
+    """
+    if nombre_archivo.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(nombre_archivo).iter_batches(batch_size=tamano_bloque, columns=columnas):
+            yield lote.to_pandas()
+    else:
+        import pandas as pd
+        yield from pd.read_csv(nombre_archivo, usecols=columnas, chunksize=tamano_bloque)
+
+
+# --- Índice de resultados ---
+class IndiceResultados:
+    """
+    Índice persistente (SQLite, en <resultados>.idx.sqlite) sobre un archivo de resultados CSV, para consultar
+    sin cargar el archivo entero. Cada fila se guarda como su posición en bytes dentro del CSV, y se indexa por:
+        - resumen BLAKE2b de ADN_Limpio y de Proteina_Secuencia (búsqueda exacta),
+        - Longitud_Proteina (consultas por rango),
+        - k-mers de la proteína (búsqueda de motivos; los candidatos se confirman leyendo la fila).
+    El índice recuerda hasta qué byte del CSV ha indexado: actualizar() solo lee las filas añadidas después.
+    Junto a ese byte guarda una huella del archivo (inodo y resumen del primer y el último bloque indexados) para
+    reconstruirse si el CSV se reemplazó, aunque el nuevo sea igual de grande o mayor. Las filas se delimitan
+    como lo hace csv (un salto de línea dentro de un campo entre comillas no termina la fila).
+    """
+    VERSION = 1
+    TAMANO_BLOQUE_HUELLA = 4096
+
+    def __init__(self, ruta_resultados: str = 'datos_adn.csv', ruta_indice: str = None, k: int = 3):
+        if ruta_resultados.endswith('.parquet'):
+            raise ValueError("El índice solo admite archivos de resultados CSV.")
+        import sqlite3
+        self.ruta_resultados = ruta_resultados
+        self.ruta_indice = ruta_indice or f"{ruta_resultados}.idx.sqlite"
+        # El servicio actualiza el índice desde su hilo de escritura; el cerrojo serializa el acceso
+        self._conexion = sqlite3.connect(self.ruta_indice, check_same_thread=False)
+        self._cerrojo = threading.Lock()
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS metadatos (clave TEXT PRIMARY KEY, valor TEXT);
+            CREATE TABLE IF NOT EXISTS filas (
+                id INTEGER PRIMARY KEY,
+                desplazamiento INTEGER NOT NULL,
+                tamano INTEGER NOT NULL,
+                resumen_adn INTEGER NOT NULL,
+                resumen_proteina INTEGER NOT NULL,
+                longitud_proteina INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS filas_resumen_adn ON filas (resumen_adn);
+            CREATE INDEX IF NOT EXISTS filas_resumen_proteina ON filas (resumen_proteina);
+            CREATE INDEX IF NOT EXISTS filas_longitud_proteina ON filas (longitud_proteina);
+            CREATE TABLE IF NOT EXISTS kmers (kmer TEXT NOT NULL, fila INTEGER NOT NULL, PRIMARY KEY (kmer, fila)) WITHOUT ROWID;
+        """)
+        metadatos = dict(self._conexion.execute("SELECT clave, valor FROM metadatos"))
+        if not metadatos:
+            self._guardar_metadatos(k=k, version=self.VERSION, bytes_indexados=0, huella='')
+            self.k = k
+        else:
+            self.k = int(metadatos['k'])
+            if int(metadatos['version']) != self.VERSION or self.k != k:
+                self.k = k
+                self.reconstruir()
+        self._conexion.commit()
+
+    def _guardar_metadatos(self, **valores):
+        self._conexion.executemany("INSERT OR REPLACE INTO metadatos (clave, valor) VALUES (?, ?)",
+                                   [(clave, str(valor)) for clave, valor in valores.items()])
+
+    @property
+    def bytes_indexados(self) -> int:
+        return int(self._conexion.execute("SELECT valor FROM metadatos WHERE clave = 'bytes_indexados'").fetchone()[0])
+
+    @property
+    def filas_indexadas(self) -> int:
+        return self._conexion.execute("SELECT COUNT(*) FROM filas").fetchone()[0]
+
+    @staticmethod
+    def resumen(texto: str) -> int:
+        """Resumen BLAKE2b de 8 bytes como entero con signo (cabe en un INTEGER de SQLite)."""
+        return int.from_bytes(hashlib.blake2b(texto.encode('utf-8'), digest_size=8).digest(), 'little', signed=True)
+
+    def _kmers(self, proteina: str):
+        # Además de los k-mers, los sufijos finales más cortos que k: así todo motivo de menos de k
+        # residuos es prefijo de alguna entrada y se puede buscar por rango
+        return set(proteina[i:i + self.k] for i in range(len(proteina)))
+
+    def reconstruir(self):
+        """Borra el índice y vuelve a indexar el archivo completo."""
+        with self._cerrojo:
+            self._conexion.execute("DELETE FROM filas")
+            self._conexion.execute("DELETE FROM kmers")
+            self._guardar_metadatos(k=self.k, version=self.VERSION, bytes_indexados=0, huella='')
+            self._conexion.commit()
+        return self.actualizar()
+
+    def _huella(self, archivo, bytes_indexados: int) -> str:
+        """Inodo del CSV y resumen BLAKE2b del primer y el último bloque de los bytes ya indexados."""
+        bloque = min(bytes_indexados, self.TAMANO_BLOQUE_HUELLA)
+        resumen = hashlib.blake2b(digest_size=16)
+        archivo.seek(0)
+        resumen.update(archivo.read(bloque))
+        archivo.seek(bytes_indexados - bloque)
+        resumen.update(archivo.read(bloque))
+        return f"{os.fstat(archivo.fileno()).st_ino}:{resumen.hexdigest()}"
+
+    def _huella_guardada(self) -> str:
+        fila = self._conexion.execute("SELECT valor FROM metadatos WHERE clave = 'huella'").fetchone()
+        return fila[0] if fila else ''
+
+
+    def actualizar(self) -> int:
+        """
+        Indexa las filas añadidas al CSV desde la última actualización (solo filas completas).
+        Si el archivo es más pequeño que lo ya indexado o su huella cambió (se reemplazó o truncó), se reconstruye.
+        Devuelve el número de filas nuevas.
+        """
+        if not os.path.exists(self.ruta_resultados):
+            return 0
+        with open(self.ruta_resultados, 'rb') as archivo:
+            bytes_indexados = self.bytes_indexados
+            if bytes_indexados and (os.fstat(archivo.fileno()).st_size < bytes_indexados
+                                    or self._huella(archivo, bytes_indexados) != self._huella_guardada()):
+                return self.reconstruir()
+            with self._cerrojo:
+                desplazamiento = bytes_indexados
+                siguiente_id = (self._conexion.execute("SELECT MAX(id) FROM filas").fetchone()[0] or 0) + 1
+                filas, kmers = [], []
+                archivo.seek(desplazamiento)
+                registro = b''
+                for linea in archivo:
+                    registro += linea
+                    if not linea.endswith(b'\n'):
+                        break # Fila a medio escribir: se indexará en la próxima actualización
+                    if registro.count(b'"') % 2:
+                        continue # Salto de línea dentro de un campo entre comillas: la fila sigue en la línea siguiente
+                    tamano = len(registro)
+                    campos = next(csv.reader([registro.decode('utf-8')]), None)
+                    if campos and campos != COLUMNAS_RESULTADOS and len(campos) == len(COLUMNAS_RESULTADOS):
+                        adn_limpio, proteina = campos[1], campos[3]
+                        filas.append((siguiente_id, desplazamiento, tamano, self.resumen(adn_limpio), self.resumen(proteina), int(campos[4])))
+                        kmers.extend((kmer, siguiente_id) for kmer in self._kmers(proteina))
+                        siguiente_id += 1
+                    desplazamiento += tamano
+                    registro = b''
+                self._conexion.executemany("INSERT INTO filas VALUES (?, ?, ?, ?, ?, ?)", filas)
+                self._conexion.executemany("INSERT OR IGNORE INTO kmers VALUES (?, ?)", kmers)
+                self._guardar_metadatos(bytes_indexados=desplazamiento, huella=self._huella(archivo, desplazamiento))
+                self._conexion.commit()
+        return len(filas)
+
+    def _leer_filas(self, consulta: str, parametros=(), limite: int = None, filtro=None) -> list:
+        """Lee del CSV (por posición) las filas que devuelve la consulta, en orden de archivo."""
+        resultados = []
+        with self._cerrojo:
+            posiciones = self._conexion.execute(consulta, parametros).fetchall()
+        if not posiciones:
+            return resultados # Sin coincidencias no hace falta el CSV, que puede no existir aún (filas sin vaciar)
+        with open(self.ruta_resultados, 'rb') as archivo:
+            for desplazamiento, tamano in sorted(posiciones):
+                archivo.seek(desplazamiento)
+                campos = next(csv.reader([archivo.read(tamano).decode('utf-8')]))
+                fila = dict(zip(COLUMNAS_RESULTADOS, campos))
+                fila['Longitud_Proteina'] = int(fila['Longitud_Proteina'])
+                if filtro is None or filtro(fila):
+                    resultados.append(fila)
+                    if limite is not None and len(resultados) >= limite:
+                        break
+        return resultados
+
+    def buscar_por_adn(self, adn_limpio: str, limite: int = None) -> list:
+        """Filas cuyo ADN_Limpio es exactamente adn_limpio (¿se procesó ya este ADN?)."""
+        return self._leer_filas("SELECT desplazamiento, tamano FROM filas WHERE resumen_adn = ?", (self.resumen(adn_limpio),),
+                                limite, lambda fila: fila['ADN_Limpio'] == adn_limpio)
+
+    def contiene_adn(self, adn_limpio: str) -> bool:
+        return bool(self.buscar_por_adn(adn_limpio, limite=1))
+
+    def buscar_por_proteina(self, proteina: str, limite: int = None) -> list:
+        """Filas que producen exactamente esta proteína."""
+        return self._leer_filas("SELECT desplazamiento, tamano FROM filas WHERE resumen_proteina = ?", (self.resumen(proteina),),
+                                limite, lambda fila: fila['Proteina_Secuencia'] == proteina)
+
+    def buscar_por_longitud(self, minimo: int = None, maximo: int = None, limite: int = None) -> list:
+        """Filas con minimo <= Longitud_Proteina <= maximo (cualquiera de los dos límites puede omitirse)."""
+        minimo = -1 if minimo is None else minimo
+        maximo = 2 ** 62 if maximo is None else maximo
+        consulta = "SELECT desplazamiento, tamano FROM filas WHERE longitud_proteina BETWEEN ? AND ?"
+        if limite is not None:
+            # El índice ordena por longitud y _leer_filas por posición; con límite se toman las primeras del archivo
+            consulta += " ORDER BY id LIMIT ?"
+            return self._leer_filas(consulta, (minimo, maximo, limite))
+        return self._leer_filas(consulta, (minimo, maximo))
+
+    def buscar_motivo(self, motivo: str, limite: int = None) -> list:
+        """
+        Filas cuya proteína contiene el motivo. Los candidatos salen del índice de k-mers (todas las filas
+        que contienen todos los k-mers del motivo) y se confirman con una búsqueda de subcadena.
+        """
+        if not motivo:
+            raise ValueError("El motivo no puede estar vacío.")
+        if len(motivo) >= self.k:
+            kmers_motivo = sorted(set(motivo[i:i + self.k] for i in range(len(motivo) - self.k + 1)))
+            marcadores = ", ".join("?" * len(kmers_motivo))
+            consulta = (f"SELECT desplazamiento, tamano FROM filas WHERE id IN (SELECT fila FROM kmers WHERE kmer IN ({marcadores}) "
+                        f"GROUP BY fila HAVING COUNT(*) = ?)")
+            parametros = (*kmers_motivo, len(kmers_motivo))
+        else:
+            # Motivo más corto que k: es prefijo de algún k-mer (o sufijo final) de la proteína
+            consulta = "SELECT desplazamiento, tamano FROM filas WHERE id IN (SELECT fila FROM kmers WHERE kmer >= ? AND kmer < ?)"
+            parametros = (motivo, motivo[:-1] + chr(ord(motivo[-1]) + 1))
+        return self._leer_filas(consulta, parametros, limite, lambda fila: motivo in fila['Proteina_Secuencia'])
+
+    def cerrar(self):
+        with self._cerrojo:
+            self._conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_exc, valor_exc, traza):
+        self.cerrar()
+        return False
+
+
+def consultar_indice(indice: IndiceResultados, parametros: dict) -> list:
+    """
+    Resuelve una consulta expresada como diccionario (CLI y servicio): 'adn', 'proteina', 'motivo' o
+    'minimo'/'maximo' (longitud de proteína), más un 'limite' opcional. Antes se indexan las filas nuevas.
+    """
+    limite = int(parametros['limite']) if parametros.get('limite') is not None else None
+    indice.actualizar()
+    if parametros.get('adn') is not None:
+        return indice.buscar_por_adn(parametros['adn'].upper(), limite)
+    if parametros.get('proteina') is not None:
+        return indice.buscar_por_proteina(parametros['proteina'].upper(), limite)
+    if parametros.get('motivo') is not None:
+        return indice.buscar_motivo(parametros['motivo'].upper(), limite)
+    if parametros.get('minimo') is not None or parametros.get('maximo') is not None:
+        minimo = int(parametros['minimo']) if parametros.get('minimo') is not None else None
+        maximo = int(parametros['maximo']) if parametros.get('maximo') is not None else None
+        return indice.buscar_por_longitud(minimo, maximo, limite)
+    raise ValueError("Indique adn, proteina, motivo o minimo/maximo.")
+
+
+# --- Estadísticas incrementales ---
+class EstadisticasIncrementales:
+    """
+    Media, mínimo, máximo y desviación estándar calculados por bloques sin guardar los datos.
+    Cada bloque se resume con NumPy y se combina con el acumulado mediante la fórmula de
+    Chan/Welford para varianzas en paralelo, de modo que también se pueden combinar resultados parciales.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0 # Suma de cuadrados de las desviaciones respecto a la media
+        self.minimo = math.inf
+        self.maximo = -math.inf
+
+    def actualizar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64)
+        if len(valores) == 0:
+            return
+        bloque = EstadisticasIncrementales()
+        bloque.n = len(valores)
+        bloque.media = float(valores.mean())
+        bloque.m2 = float(((valores - bloque.media) ** 2).sum())
+        bloque.minimo = float(valores.min())
+        bloque.maximo = float(valores.max())
+        self.combinar(bloque)
+
+    def combinar(self, otra: 'EstadisticasIncrementales'):
+        if otra.n == 0:
+            return
+        n_total = self.n + otra.n
+        delta = otra.media - self.media
+        self.media += delta * otra.n / n_total
+        self.m2 += otra.m2 + delta * delta * self.n * otra.n / n_total
+        self.n = n_total
+        self.minimo = min(self.minimo, otra.minimo)
+        self.maximo = max(self.maximo, otra.maximo)
+
+    @property
+    def desviacion_estandar(self) -> float:
+        """Desviación estándar muestral (ddof=1), igual que pandas.describe()."""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else math.nan
+
+
+class HyperLogLog:
+    """
+    Estimador aproximado del número de elementos distintos con memoria fija (2**precision registros de un byte).
+    Recibe hashes de 64 bits ya calculados (p. ej. pandas.util.hash_pandas_object) y se puede combinar con otros.
+    El error estándar relativo es aproximadamente 1.04 / sqrt(2**precision) (~0.8 % con precision=14).
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("La precisión de HyperLogLog debe estar entre 4 y 18.")
+        self.precision = precision
+        self.registros = np.zeros(1 << precision, dtype=np.uint8)
+
+    def agregar_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        bits_restantes = 64 - self.precision
+        indices = (hashes >> np.uint64(bits_restantes)).astype(np.int64)
+        resto = hashes & np.uint64((1 << bits_restantes) - 1)
+        # Posición del primer bit a 1 en los bits restantes. frexp da la longitud en bits de forma exacta solo por
+        # debajo de 2**53, así que se aplica a cada mitad de 32 bits por separado (válido para cualquier precisión)
+        alto, bajo = resto >> np.uint64(32), resto & np.uint64(0xFFFFFFFF)
+        longitud_bits = np.where(alto > 0, np.frexp(alto.astype(np.float64))[1] + 32, np.frexp(bajo.astype(np.float64))[1])
+        rangos = (bits_restantes - longitud_bits + 1).astype(np.uint8)
+        np.maximum.at(self.registros, indices, rangos)
+
+    def combinar(self, otro: 'HyperLogLog'):
+        np.maximum(self.registros, otro.registros, out=self.registros)
+
+    def estimar(self) -> int:
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimacion = alfa * m * m / float(np.sum(np.ldexp(1.0, -self.registros.astype(np.int64))))
+        registros_vacios = int(np.count_nonzero(self.registros == 0))
+        if estimacion <= 2.5 * m and registros_vacios:
+            estimacion = m * math.log(m / registros_vacios) # Corrección para cardinalidades pequeñas
+        return int(round(estimacion))
+
+
+def _acumular_resultados(nombre_archivo, tamano_bloque: int, conteo_aproximado: bool, longitud_proteina_larga: int,
+                         al_encontrar_largas=None):
+    """
+    Recorre por bloques un archivo de resultados y acumula las estadísticas de longitud, el número de proteínas más
+    largas que longitud_proteina_larga y los ADN limpios únicos (exactos o con HyperLogLog). Si se pasa
+    al_encontrar_largas, se llama con las filas largas de cada bloque (con ADN_Original) a medida que aparecen.
+    Devuelve (estadisticas, proteinas_largas, adn_limpio_unicos).
+    """
+    import pandas as pd
+    estadisticas = EstadisticasIncrementales()
+    hashes_unicos = HyperLogLog() if conteo_aproximado else set()
+    proteinas_largas = 0
+    columnas = ['ADN_Limpio', 'Longitud_Proteina'] if al_encontrar_largas is None else ['ADN_Original', 'ADN_Limpio', 'Longitud_Proteina']
+    for bloque in leer_bloques_resultados(nombre_archivo, columnas, tamano_bloque):
+        longitudes = bloque['Longitud_Proteina'].to_numpy()
+        estadisticas.actualizar(longitudes)
+        es_larga = longitudes > longitud_proteina_larga
+        proteinas_largas += int(np.count_nonzero(es_larga))
+        if al_encontrar_largas is not None and es_larga.any():
+            al_encontrar_largas(bloque[es_larga])
+        hashes = pd.util.hash_pandas_object(bloque['ADN_Limpio'].dropna(), index=False).to_numpy()
+        if conteo_aproximado:
+            hashes_unicos.agregar_hashes(hashes)
+        else:
+            hashes_unicos.update(np.unique(hashes).tolist())
+    return estadisticas, proteinas_largas, hashes_unicos.estimar() if conteo_aproximado else len(hashes_unicos)
+
+
+def resumir_resultados(nombre_archivo='datos_adn.csv', tamano_bloque: int = 100000, conteo_aproximado: bool = False,
+                       longitud_proteina_larga: int = 10) -> dict:
+    """
+    Calcula por bloques las mismas estadísticas que AnalizadorProteinas.cargar_y_analizar_datos, pero sin
+    imprimirlas: devuelve un diccionario (apto para JSON) con el total de secuencias, las estadísticas de longitud,
+    el número de proteínas más largas que longitud_proteina_larga y el número de ADN limpios únicos.
+    """
+    estadisticas, proteinas_largas, adn_limpio_unicos = _acumular_resultados(nombre_archivo, tamano_bloque, conteo_aproximado,
+                                                                             longitud_proteina_larga)
+    return {
+        'archivo': nombre_archivo,
+        'secuencias': estadisticas.n,
+        'longitud_proteina': {
+            'promedio': float(estadisticas.media) if estadisticas.n else None,
+            'minimo': float(estadisticas.minimo) if estadisticas.n else None,
+            'maximo': float(estadisticas.maximo) if estadisticas.n else None,
+            # Con una sola fila la desviación muestral no está definida (NaN no es JSON válido)
+            'desviacion_estandar': float(estadisticas.desviacion_estandar) if estadisticas.n > 1 else None,
+        },
+        'proteinas_largas': proteinas_largas,
+        'adn_limpio_unicos': adn_limpio_unicos,
+        'conteo_aproximado': conteo_aproximado,
+    }
+
+
+# --- Clases ---
+
+class RegistradorSecuencias:
+    #Clase para encapsular las operaciones de logging para secuencias de ADN/ARN/Proteínas.
+    
+    def __init__(self, nombre_registrador='simulador_biologico', reportador: ReportadorAnomalias = None, niveles_etapa: dict = None,
+                 metricas: RegistroMetricas = None):
+    
+        
+        self.registrador = logging.getLogger(nombre_registrador)
+        # La telemetría (Sentry u otro transporte) se envía en segundo plano a través del reportador
+        if reportador is None and SENTRY_DSN:
+            reportador = obtener_reportador_sentry()
+        self.reportador = reportador
+        # Si hay registro de métricas, las anomalías se cuentan por tipo en anomalias_total
+        self.metricas = metricas
+        # Cada etapa (limpiar_adn, traducir_arn, ...) registra en un logger hijo con su propio nivel opcional
+        self._registradores_etapa = {}
+        for etapa, nivel in (niveles_etapa or {}).items():
+            self.configurar_nivel_etapa(etapa, nivel)
+
+    def configurar_nivel_etapa(self, etapa, nivel):
+        """Fija el nivel de log de una etapa concreta (p. ej. 'limpiar_adn' -> logging.WARNING)."""
+        self._registrador_etapa(etapa).setLevel(nivel)
+
+    def _registrador_etapa(self, etapa):
+        if etapa is None:
+            return self.registrador
+        registrador_etapa = self._registradores_etapa.get(etapa)
+        if registrador_etapa is None:
+            registrador_etapa = self.registrador.getChild(etapa)
+            self._registradores_etapa[etapa] = registrador_etapa
+        return registrador_etapa
+
+    def registrar_info(self, mensaje, *args, etapa=None):
+        """
+        Registra un mensaje de información. Los argumentos se formatean con el estilo '%' de logging
+        solo si el nivel INFO está activo para la etapa, por lo que no hay coste cuando está desactivado.
+        """
+        registrador = self._registrador_etapa(etapa)
+        if registrador.isEnabledFor(logging.INFO):
+            registrador.info(mensaje, *args)
+
+    def registrar_advertencia(self, mensaje, *args, extra_data=None, etapa=None, reportar=True):
+      
+        registrador = self._registrador_etapa(etapa)
+        if registrador.isEnabledFor(logging.WARNING):
+            registrador.warning(mensaje, *args)
+        # reportar=False cuando la misma situación ya se notifica como anomalía tipada con reportar_anomalia
+        if self.reportador and reportar:
+            self.reportador.reportar_anomalia('advertencia', muestra=mensaje % args if args else mensaje, datos=extra_data)
+
+    def registrar_error(self, mensaje, info_exc=False, extra_data=None):
+        
+        
+        self.registrador.error(mensaje, exc_info=info_exc)
+        if self.reportador:
+            self.reportador.reportar_evento(f"Error: {mensaje}", 'error', extras=extra_data,
+                                            exc_info=sys.exc_info() if info_exc else None)
+
+    def registrar_critico(self, mensaje, info_exc=False, extra_data=None):
+        """
+        Registra un mensaje crítico y, opcionalmente, envía la excepción a Sentry.
+        Args:
+            mensaje (str): Mensaje crítico.
+            info_exc (bool): Si es True, incluye información de la excepción.
+            extra_data (dict, optional): Datos adicionales para enviar a Sentry.
+        """
+        self.registrador.critical(mensaje, exc_info=info_exc)
+        if self.reportador:
+            self.reportador.reportar_evento(f"Crítico: {mensaje}", 'fatal', extras=extra_data,
+                                            exc_info=sys.exc_info() if info_exc else None)
+
+    def reportar_anomalia(self, tipo, muestra=None, datos=None):
+        """
+        Notifica una anomalía biológica al reportador en segundo plano (sin bloquear el pipeline).
+        Args:
+            tipo (str): Tipo de anomalía (codones_desconocidos, proteina_corta, proteina_larga).
+            muestra (str, optional): Secuencia de ejemplo asociada a la anomalía.
+            datos (dict, optional): Datos adicionales (longitudes, conteos).
+        """
+        if self.metricas is not None:
+            self.metricas.incrementar('anomalias_total', etiquetas={'tipo': tipo})
+        if self.reportador:
+            self.reportador.reportar_anomalia(tipo, muestra=muestra, datos=datos)
+
+
+
+class NormalizadorSecuencias:
+    """
+    Normalización de ADN a nivel de bytes con tablas de traducción de 256 entradas precalculadas.
+    Cada operación (mayúsculas, validación, transcripción, complementaria) es un único bytes.translate
+    en C, en lugar de bucles por carácter en Python. Política para los códigos de ambigüedad IUPAC:
+        'rechazar': solo A, C, G, T son válidas (comportamiento original).
+        'aceptar': los códigos IUPAC (R, Y, S, W, K, M, B, D, H, V, N) se consideran válidos y se conservan.
+        'enmascarar': los códigos IUPAC se consideran válidos y se sustituyen por N.
+    """
+    POLITICAS_IUPAC = ('rechazar', 'aceptar', 'enmascarar')
+    BASES_IUPAC = b'RYSWKMBDHVN'
+    COMPLEMENTOS = b'ACGTRYSWKMBDHVN'
+    COMPLEMENTARIAS = b'TGCAYRSWMKVHDBN'
+
+    def __init__(self, politica_iupac: str = 'rechazar'):
+        if politica_iupac not in self.POLITICAS_IUPAC:
+            raise ValueError(f"Política IUPAC desconocida: '{politica_iupac}'. Opciones: {', '.join(self.POLITICAS_IUPAC)}.")
+        self.politica_iupac = politica_iupac
+        # Mayúsculas (y enmascarado IUPAC si corresponde) en una sola tabla
+        tabla = bytearray(range(256))
+        for mayuscula in range(ord('A'), ord('Z') + 1):
+            tabla[mayuscula + 32] = mayuscula
+        if politica_iupac == 'enmascarar':
+            for base in self.BASES_IUPAC:
+                tabla[base] = tabla[base + 32] = ord('N')
+        self.tabla_limpieza = bytes(tabla)
+        # Las demás tablas se componen sobre la de limpieza para hacerlo todo en una sola pasada
+        self.tabla_arn = self.tabla_limpieza.translate(bytes.maketrans(b'T', b'U'))
+        self.tabla_complementaria = self.tabla_limpieza.translate(bytes.maketrans(self.COMPLEMENTOS, self.COMPLEMENTARIAS))
+        self.bases_validas = b'ACGT' if politica_iupac == 'rechazar' else b'ACGT' + self.BASES_IUPAC
+        self._sin_bases_validas = dict.fromkeys(self.bases_validas) # Para str.translate: borra las bases válidas
+
+    def _normalizar_texto_no_ascii(self, adn: str) -> dict:
+        """
+        Camino para str con caracteres no ASCII, que nunca es válida: se trabaja sobre el texto para que
+        adn_limpio y bases_invalidas contengan los caracteres reales (p. ej. 'Ñ') y no un sustituto.
+        """
+        # str.translate con la tabla de bytes: los caracteres fuera de la tabla (> 255) quedan igual
+        adn_limpio = adn.replace("5'-", "").replace("-3'", "").translate(self.tabla_limpieza)
+        invalidas = set(adn_limpio.translate(self._sin_bases_validas))
+        return {
+            'adn_limpio': adn_limpio,
+            'valido': False,
+            'bases_invalidas': invalidas,
+            'primera_posicion_invalida': min(adn_limpio.find(base) for base in invalidas),
+            'arn': None,
+            'complementaria_inversa': None,
+        }
+
+    def bases_invalidas(self, adn_limpio: bytes) -> bytes:
+        """Devuelve los bytes que no son bases válidas (vacío si la secuencia es válida)."""
+        return adn_limpio.translate(None, self.bases_validas)
+
+    def normalizar(self, adn, complementaria_inversa: bool = False) -> dict:
+        """
+        Limpia, valida, transcribe y opcionalmente obtiene la complementaria inversa de una secuencia
+        (str, bytes, bytearray o memoryview). Devuelve un diccionario con:
+            adn_limpio, valido, bases_invalidas (set), primera_posicion_invalida (int o None),
+            arn (None si no es válido) y complementaria_inversa (None si no se pidió o no es válido).
+        """
+        if isinstance(adn, str):
+            if not adn.isascii():
+                return self._normalizar_texto_no_ascii(adn)
+            datos = adn.encode('ascii')
+        else:
+            datos = bytes(adn) # bytes, bytearray o memoryview
+        if b"5'-" in datos:
+            datos = datos.replace(b"5'-", b"")
+        if b"-3'" in datos:
+            datos = datos.replace(b"-3'", b"")
+        adn_limpio = datos.translate(self.tabla_limpieza)
+        invalidas = self.bases_invalidas(adn_limpio)
+
+        # latin-1: un carácter por byte, así los bytes no ASCII de la entrada se informan como inválidos sin fallar
+        resultado = {
+            'adn_limpio': adn_limpio.decode('latin-1'),
+            'valido': not invalidas,
+            'bases_invalidas': set(invalidas.decode('latin-1')),
+            'primera_posicion_invalida': min(adn_limpio.find(bytes([base])) for base in set(invalidas)) if invalidas else None,
+            'arn': None,
+            'complementaria_inversa': None,
+        }
+        if invalidas:
+            return resultado
+        resultado['arn'] = datos.translate(self.tabla_arn).decode('ascii')
+        if complementaria_inversa:
+            resultado['complementaria_inversa'] = datos.translate(self.tabla_complementaria)[::-1].decode('ascii')
+        return resultado
+
+
+class GestorADN:
+    """
+    Gestiona las operaciones de limpieza, validación, transcripción de ADN y obtención de complementarias.
+    """
+    def __init__(self, registrador: RegistradorSecuencias, mostrar_avisos: bool = True, politica_iupac: str = 'rechazar'):  
+        self.registrador = registrador
+        self.mostrar_avisos = mostrar_avisos # En modo lote no se imprimen avisos por consola
+        self.complementos = {'A': 'T', 'T': 'A', 'C': 'G', 'G': 'C'}
+        self.normalizador = NormalizadorSecuencias(politica_iupac)
+
+    def limpiar_adn(self, adn: str) -> str:
+        """
+        Elimina el formato 3' 5' y convierte la secuencia de ADN a mayúsculas.
+        """
+        adn_limpio = adn.replace("5'-","").replace("-3'","").upper()
+        self.registrador.registrar_info("ADN limpiado: '%s' -> '%s'", SecuenciaResumida(adn), SecuenciaResumida(adn_limpio), etapa='limpiar_adn')
+        return adn_limpio
+
+    def transcribir_adn(self, adn: str) -> str:
+        """
+        Cambia las secuencias de ADN a ARN (reemplazando T por U).
+        """
+        arn = adn.replace('T','U')
+        self.registrador.registrar_info("ADN transcrito a ARN: '%s' -> '%s'", SecuenciaResumida(adn), SecuenciaResumida(arn), etapa='transcribir_adn')
+        return arn
+
+    def validar_adn(self, adn: str) -> bool:
+        """
+        Verifica que la secuencia de ADN solo contenga caracteres válidos (A, T, C, G, o también IUPAC según la política).
+        """
+        if adn.isascii():
+            bases_invalidas = self.normalizador.bases_invalidas(adn.encode('ascii')).decode('ascii')
+        else:
+            bases_invalidas = [base for base in adn if not base.isascii() or base.encode('ascii') not in self.normalizador.bases_validas]
+        if bases_invalidas:
+            self.registrador.registrar_advertencia("Validación de ADN fallida: '%s' contiene caracteres inválidos: %s.", SecuenciaResumida(adn), ', '.join(set(bases_invalidas)), etapa='validar_adn')
+            return False
+        self.registrador.registrar_info("Validación de ADN exitosa para: '%s'", SecuenciaResumida(adn), etapa='validar_adn')
+        return True
+
+    def normalizar_adn(self, adn, complementaria_inversa: bool = False) -> dict:
+        """
+        Ruta fusionada de limpiar_adn + validar_adn + transcribir_adn (y opcionalmente la complementaria inversa)
+        sobre bytes. Devuelve el diccionario de NormalizadorSecuencias.normalizar.
+        """
+        resultado = self.normalizador.normalizar(adn, complementaria_inversa)
+        if not resultado['valido']:
+            self.registrador.registrar_advertencia("Validación de ADN fallida: '%s' contiene caracteres inválidos: %s (primera posición inválida: %d).",
+                                                   SecuenciaResumida(resultado['adn_limpio']), ', '.join(resultado['bases_invalidas']),
+                                                   resultado['primera_posicion_invalida'], etapa='validar_adn')
+        else:
+            self.registrador.registrar_info("ADN normalizado: '%s' -> ARN '%s'", SecuenciaResumida(resultado['adn_limpio']),
+                                            SecuenciaResumida(resultado['arn']), etapa='normalizar_adn')
+        return resultado
+
+    def obtener_cadena_complementaria(self, adn: str) -> str:
+        """
+        Genera la cadena de ADN complementaria (A-T, C-G).
+        """
+        if not self.validar_adn(adn):
+            self.registrador.registrar_error(f"No se pudo obtener la cadena complementaria: ADN inválido '{adn}'.")
+            return ""
+        
+        # Tras validar, la secuencia es ASCII y todas sus bases tienen complementaria en la tabla
+        cadena_complementaria = adn.encode('ascii').translate(self.normalizador.tabla_complementaria).decode('ascii')
+
+        self.registrador.registrar_info("Cadena complementaria de '%s' es '%s'", SecuenciaResumida(adn), SecuenciaResumida(cadena_complementaria), etapa='obtener_cadena_complementaria')
+        return cadena_complementaria
+
+class AnalizadorProteinas:
+    """
+    Maneja la traducción de ARN a proteína y el análisis de la secuencia de proteínas.
+    """
+    MOTORES_TRADUCCION = ('auto', 'python', 'vectorizado')
+
+    def __init__(self, registrador: RegistradorSecuencias, mostrar_avisos: bool = True, motor_traduccion: str = 'auto',
+                 tamano_bloque_resultados: int = 1000):  
+        if motor_traduccion not in self.MOTORES_TRADUCCION:
+            raise ValueError(f"Motor de traducción desconocido: '{motor_traduccion}'. Opciones: {', '.join(self.MOTORES_TRADUCCION)}.")
+        self.registrador = registrador
+        self.mostrar_avisos = mostrar_avisos # En modo lote no se imprimen avisos por consola
+        self.motor_traduccion = motor_traduccion
+        self.tamano_bloque_resultados = tamano_bloque_resultados
+        self._escritores_resultados = {}
+
+    def _traducir_codones(self, arn: str):
+        """
+        Traduce el marco 0 del ARN hasta el primer STOP con el motor configurado.
+        Devuelve (proteina, conteo_codones_desconocidos, posicion_stop o None).
+        """
+        if self.motor_traduccion == 'vectorizado' or (self.motor_traduccion == 'auto' and len(arn) >= UMBRAL_TRADUCCION_VECTORIZADA):
+            return traducir_arn_vectorizado(arn)
+
+        aminoacidos = []
+        conteo_codones_desconocidos = 0
+        for i in range(0, len(arn) -2, 3):
+            aminoacido = tabla_codones.get(arn[i:i+3], '?')
+            if aminoacido == '?':
+                conteo_codones_desconocidos += 1
+            if aminoacido == 'STOP':
+                return "".join(aminoacidos), conteo_codones_desconocidos, i
+            aminoacidos.append(aminoacido)
+        return "".join(aminoacidos), conteo_codones_desconocidos, None
+
+    def traducir_arn(self, arn: str) -> str:
+        """
+        Traduce la secuencia de ARN en una secuencia de proteínas usando la tabla de codones.
+        También detecta y cuenta codones desconocidos, reportando anomalías.
+        """
+        return self._registrar_traduccion(arn, *self._traducir_codones(arn))
+
+    def traducir_arns(self, arns: list) -> list:
+        """
+        traducir_arn para varias secuencias. Salvo con el motor 'python', todas se traducen en una sola pasada
+        de NumPy (traducir_arns_vectorizado), lo que aprovecha los micro-lotes de secuencias cortas del servicio.
+        Los avisos y anomalías de cada secuencia son los mismos que con traducir_arn.
+        """
+        if self.motor_traduccion == 'python':
+            return [self.traducir_arn(arn) for arn in arns]
+        return [self._registrar_traduccion(arn, *traduccion) for arn, traduccion in zip(arns, traducir_arns_vectorizado(arns))]
+
+    def _registrar_traduccion(self, arn: str, proteina: str, conteo_codones_desconocidos: int, posicion_stop) -> str:
+        """Registra los avisos y anomalías de una traducción ya hecha y devuelve la proteína."""
+        if len(arn) % 3 != 0:
+            mensaje = "La secuencia de ARN '%s' (longitud %d) no es un múltiplo de 3. Se truncarán los últimos nucleótidos."
+            self.registrador.registrar_advertencia(mensaje, SecuenciaResumida(arn), len(arn), etapa='traducir_arn')
+            if self.mostrar_avisos:
+                print(f"Advertencia: {mensaje % (arn, len(arn))}")
+            
+        if posicion_stop is not None:
+            self.registrador.registrar_info("Codón de parada 'STOP' encontrado en '%s' en posición %d. Traducción terminada.", SecuenciaResumida(arn), posicion_stop, etapa='traducir_arn')
+        
+        if conteo_codones_desconocidos > 0: 
+            mensaje_usuario = f"¡Anomalía detectada! Se encontraron {conteo_codones_desconocidos} codones desconocidos en la secuencia de ARN. Esto podría indicar un error o una mutación."
+            self.registrador.registrar_advertencia("Anomalía: %d codones desconocidos encontrados en la secuencia de ARN '%s'.", conteo_codones_desconocidos, SecuenciaResumida(arn), etapa='traducir_arn', reportar=False)
+            if self.mostrar_avisos:
+                print(mensaje_usuario)
+            self.registrador.reportar_anomalia('codones_desconocidos', muestra=arn,
+                                               datos={"longitud_arn": len(arn), "conteo_desconocidos": conteo_codones_desconocidos})
+
+        self.registrador.registrar_info("ARN '%s' traducido a proteína: '%s'", SecuenciaResumida(arn), SecuenciaResumida(proteina), etapa='traducir_arn')
+        return proteina
+
+    def traducir_secuencia_empaquetada(self, secuencia: SecuenciaEmpaquetada) -> str:
+        """
+        Traduce (marco 0, hasta el primer STOP) una SecuenciaEmpaquetada de ADN o ARN sin convertirla a texto.
+        Se desempaqueta por ventanas de TAMANO_VENTANA_EMPAQUETADA bases, así que la memoria auxiliar
+        no depende del tamaño de la secuencia. Produce la misma proteína que traducir_arn sobre el texto.
+        """
+        partes = []
+        conteo_codones_desconocidos = 0
+        longitud_util = secuencia.longitud - secuencia.longitud % 3
+        for inicio in range(0, longitud_util, TAMANO_VENTANA_EMPAQUETADA):
+            indices = calcular_indices_codones(secuencia.codigos(inicio, min(inicio + TAMANO_VENTANA_EMPAQUETADA, longitud_util)))
+            proteina_ventana, desconocidos_ventana, indice_stop = traducir_indices_codones(indices)
+            partes.append(proteina_ventana)
+            conteo_codones_desconocidos += desconocidos_ventana
+            if indice_stop is not None:
+                self.registrador.registrar_info("Codón de parada 'STOP' encontrado en %r en posición %d. Traducción terminada.",
+                                                secuencia, inicio + 3 * indice_stop, etapa='traducir_arn')
+                break
+        proteina = "".join(partes)
+
+        if conteo_codones_desconocidos > 0:
+            self.registrador.registrar_advertencia("Anomalía: %d codones desconocidos encontrados en %r.", conteo_codones_desconocidos, secuencia, etapa='traducir_arn', reportar=False)
+            self.registrador.reportar_anomalia('codones_desconocidos', muestra=secuencia.transcribir().muestra(),
+                                               datos={"longitud_arn": secuencia.longitud, "conteo_desconocidos": conteo_codones_desconocidos})
+        self.registrador.registrar_info("%r traducida a proteína: '%s'", secuencia, SecuenciaResumida(proteina), etapa='traducir_arn')
+        return proteina
+
+    def buscar_orfs(self, adn, gestor_adn: 'GestorADN', longitud_minima: int = MIN_LONGITUD_PROTEINA_FUNCIONAL,
+                    longitud_maxima: int = MAX_LONGITUD_PROTEINA_FUNCIONAL) -> list:
+        """
+        Busca marcos de lectura abiertos (AUG -> STOP) en los seis marcos: tres sobre el ARN transcrito
+        y tres sobre la cadena complementaria inversa. Solo se devuelven los ORF cuya proteína
+        (sin contar el STOP) tiene entre longitud_minima y longitud_maxima aminoácidos.
+        Cada ORF es un diccionario con hebra ('+'/'-'), marco, inicio y fin (coordenadas 0-based sobre
+        la hebra directa, fin exclusivo e incluyendo el STOP), longitud y proteína.
+        adn puede ser texto o una SecuenciaEmpaquetada (que se recorre por ventanas, ver _buscar_orfs_empaquetada).
+        """
+        if isinstance(adn, SecuenciaEmpaquetada):
+            orfs = self._buscar_orfs_empaquetada(adn, longitud_minima, longitud_maxima)
+            self.registrador.registrar_info("Búsqueda de ORF en seis marcos completada: %d ORF encontrados en ADN de longitud %d.", len(orfs), adn.longitud, etapa='buscar_orfs')
+            return orfs
+        codigos = codificar_secuencia(gestor_adn.transcribir_adn(adn))
+        # La complementaria inversa se obtiene en el espacio de códigos (A<->U, C<->G equivale a 3 - código)
+        codigos_inversos = codigos[::-1].copy()
+        validos = codigos_inversos != CODIGO_BASE_INVALIDA
+        codigos_inversos[validos] = 3 - codigos_inversos[validos]
+
+        longitud_adn = len(codigos)
+        orfs = []
+        for hebra, codigos_hebra in (('+', codigos), ('-', codigos_inversos)):
+            indices = calcular_indices_codones_solapados(codigos_hebra)
+            for marco in range(3):
+                indices_marco = indices[marco::3]
+                inicios, paradas, longitudes = buscar_orfs_en_marco(indices_marco, longitud_minima, longitud_maxima)
+                for inicio, parada, longitud in zip(inicios.tolist(), paradas.tolist(), longitudes.tolist()):
+                    proteina = TABLA_AMINOACIDOS[indices_marco[inicio:parada]].tobytes().decode('ascii')
+                    inicio_nt, fin_nt = marco + 3 * inicio, marco + 3 * parada + 3
+                    if hebra == '-':
+                        inicio_nt, fin_nt = longitud_adn - fin_nt, longitud_adn - inicio_nt
+                    orfs.append({'hebra': hebra, 'marco': marco, 'inicio': inicio_nt, 'fin': fin_nt,
+                                 'longitud': longitud, 'proteina': proteina})
+
+        self.registrador.registrar_info("Búsqueda de ORF en seis marcos completada: %d ORF encontrados en ADN de longitud %d.", len(orfs), longitud_adn, etapa='buscar_orfs')
+        return orfs
+
+    @staticmethod
+    def _codigos_hebra(secuencia: SecuenciaEmpaquetada, hebra: str, inicio: int, fin: int) -> 'np.ndarray':
+        """Códigos de las posiciones [inicio, fin) de la hebra indicada; la '-' se lee al revés y complementada."""
+        if hebra == '+':
+            return secuencia.codigos(inicio, fin)
+        codigos = secuencia.codigos(secuencia.longitud - fin, secuencia.longitud - inicio)[::-1].copy()
+        validos = codigos != CODIGO_BASE_INVALIDA
+        codigos[validos] = 3 - codigos[validos]
+        return codigos
+
+    def _buscar_orfs_empaquetada(self, secuencia: SecuenciaEmpaquetada, longitud_minima: int, longitud_maxima: int) -> list:
+        """
+        buscar_orfs sobre una SecuenciaEmpaquetada sin desempaquetarla entera: cada hebra se recorre por ventanas
+        de TAMANO_VENTANA_EMPAQUETADA bases (más 2 de solape para los codones del borde), arrastrando por marco
+        el AUG abierto. La memoria auxiliar no depende de la longitud; el resultado es el mismo que sobre el texto.
+        """
+        longitud_adn = secuencia.longitud
+        orfs = []
+        for hebra in ('+', '-'):
+            encontrados = [[], [], []]
+            abiertos = [None, None, None]
+            for inicio_ventana in range(0, max(longitud_adn - 2, 0), TAMANO_VENTANA_EMPAQUETADA):
+                codigos = self._codigos_hebra(secuencia, hebra, inicio_ventana, min(inicio_ventana + TAMANO_VENTANA_EMPAQUETADA + 2, longitud_adn))
+                indices = calcular_indices_codones_solapados(codigos)
+                for marco in range(3):
+                    # inicio_ventana es múltiplo de 3, así que el marco local coincide con el global
+                    inicios, paradas, longitudes, abiertos[marco] = buscar_orfs_en_ventana(
+                        indices[marco::3], longitud_minima, longitud_maxima, inicio_ventana // 3, abiertos[marco])
+                    encontrados[marco].extend(zip(inicios.tolist(), paradas.tolist(), longitudes.tolist()))
+            for marco in range(3):
+                for inicio, parada, longitud in encontrados[marco]:
+                    inicio_nt, fin_nt = marco + 3 * inicio, marco + 3 * parada + 3
+                    # Solo se desempaqueta el propio ORF para obtener su proteína
+                    indices_orf = calcular_indices_codones(self._codigos_hebra(secuencia, hebra, inicio_nt, fin_nt - 3))
+                    proteina = TABLA_AMINOACIDOS[indices_orf].tobytes().decode('ascii')
+                    if hebra == '-':
+                        inicio_nt, fin_nt = longitud_adn - fin_nt, longitud_adn - inicio_nt
+                    orfs.append({'hebra': hebra, 'marco': marco, 'inicio': inicio_nt, 'fin': fin_nt,
+                                 'longitud': longitud, 'proteina': proteina})
+        return orfs
+
+    def analizar_longitud_proteina(self, secuencia_proteina: str) -> int:
+        """
+        Calcula y registra la longitud de la secuencia de proteínas.
+        También monitorea anomalías en la longitud de las proteínas (demasiado cortas/largas).
+        """
+        longitud = len(secuencia_proteina)
+        self.registrador.registrar_info("Longitud de la proteína '%s': %d aminoácidos.", SecuenciaResumida(secuencia_proteina), longitud, etapa='analizar_longitud_proteina')
+        
+        if longitud < MIN_LONGITUD_PROTEINA_FUNCIONAL and longitud > 0:
+            mensaje_usuario = f"¡Anomalía detectada! Proteína inusualmente corta ({longitud} aminoácidos). Esto podría afectar su función."
+            self.registrador.registrar_advertencia("Anomalía: Proteína inusualmente corta detectada (%d aminoácidos): '%s'.", longitud, SecuenciaResumida(secuencia_proteina), etapa='analizar_longitud_proteina', reportar=False)
+            if self.mostrar_avisos:
+                print(mensaje_usuario)
+            self.registrador.reportar_anomalia('proteina_corta', muestra=secuencia_proteina, datos={"longitud_proteina": longitud})
+        elif longitud > MAX_LONGITUD_PROTEINA_FUNCIONAL:
+            mensaje_usuario = f"¡Anomalía detectada! Proteína inusualmente larga ({longitud} aminoácidos). Esto podría ser un error de traducción."
+            self.registrador.registrar_advertencia("Anomalía: Proteína inusualmente larga detectada (%d aminoácidos): '%s'.", longitud, SecuenciaResumida(secuencia_proteina), etapa='analizar_longitud_proteina', reportar=False)
+            if self.mostrar_avisos:
+                print(mensaje_usuario)
+            self.registrador.reportar_anomalia('proteina_larga', muestra=secuencia_proteina, datos={"longitud_proteina": longitud})
+        
+        return longitud
+
+    def analizar_frecuencia_aminoacidos(self, secuencia_proteina: str):
+        """
+        Calcula y muestra la frecuencia de cada aminoácido en una secuencia de proteína.
+        """
+        if not secuencia_proteina:
+            print("No hay proteína para analizar la frecuencia de aminoácidos.")
+            return
+
+        total_aminoacidos = len(secuencia_proteina)
+        
+        print("\n--- Frecuencia de Aminoácidos ---")
+        for aminoacido, conteo, porcentaje in self.calcular_frecuencia_aminoacidos(secuencia_proteina):
+            print(f"  {aminoacido}: {conteo} ({porcentaje:.2f}%)")
+        self.registrador.registrar_info(f"Análisis de frecuencia de aminoácidos completado para proteína de longitud {total_aminoacidos}.")
+
+    @staticmethod
+    def calcular_frecuencia_aminoacidos(secuencia_proteina: str) -> list:
+        """Devuelve [(aminoácido, conteo, porcentaje), ...] de más a menos frecuente."""
+        total_aminoacidos = len(secuencia_proteina)
+        return [(aminoacido, conteo, conteo / total_aminoacidos * 100) for aminoacido, conteo in Counter(secuencia_proteina).most_common()]
+
+    def save_results_to_csv(self, adn_original: str, adn_limpio: str, secuencia_arn: str, proteina_secuencia: str, nombre_archivo='datos_adn.csv'):
+        """
+        Guarda los resultados del procesamiento en un archivo CSV.
+        Las filas se acumulan en un EscritorResultados por archivo y se escriben por bloques.
+        """
+        escritor = self._escritores_resultados.get(nombre_archivo)
+        if escritor is None:
+            escritor = EscritorResultados(nombre_archivo, formato='csv', tamano_bloque=self.tamano_bloque_resultados)
+            self._escritores_resultados[nombre_archivo] = escritor
+            self.registrador.registrar_info("Escritor de resultados abierto para '%s'.", nombre_archivo)
+        escritor.agregar((adn_original, adn_limpio, secuencia_arn, proteina_secuencia, len(proteina_secuencia)))
+
+    def vaciar_resultados(self, nombre_archivo=None):
+        """
+        Escribe en disco las filas pendientes de save_results_to_csv (de un archivo o de todos).
+        """
+        for archivo, escritor in self._escritores_resultados.items():
+            if nombre_archivo is None or archivo == nombre_archivo:
+                escritor.vaciar()
+                self.registrador.registrar_info("Resultados pendientes escritos en '%s'.", archivo)
+
+    def cargar_y_analizar_datos(self, nombre_archivo='datos_adn.csv', modo='auto', tamano_bloque: int = 100000, conteo_aproximado: bool = False):
+        """
+        Carga datos desde un CSV y realiza un análisis básico con pandas, presentando los resultados claramente.
+        Args:
+            modo (str): 'completo' carga el archivo entero; 'streaming' lo recorre por bloques con memoria acotada;
+                'auto' elige 'streaming' si el archivo supera UMBRAL_ANALISIS_STREAMING_BYTES.
+            tamano_bloque (int): Filas por bloque en modo streaming.
+            conteo_aproximado (bool): En modo streaming, cuenta secuencias únicas con HyperLogLog en lugar de un conjunto de hashes.
+        """
+        self.vaciar_resultados(nombre_archivo)
+        if not os.path.exists(nombre_archivo):
+            self.registrador.registrar_advertencia(f"El archivo '{nombre_archivo}' no existe para análisis.")
+            print(f"\nNo se pudo encontrar el archivo '{nombre_archivo}' para análisis de datos. Por favor, procese algunas secuencias primero.")
+            return
+
+        if modo == 'auto':
+            modo = 'streaming' if os.path.getsize(nombre_archivo) > UMBRAL_ANALISIS_STREAMING_BYTES else 'completo'
+        if modo == 'streaming':
+            return self._analizar_datos_por_bloques(nombre_archivo, tamano_bloque, conteo_aproximado)
+
+        import pandas as pd
+        try:
+            df = pd.read_csv(nombre_archivo)
+            self.registrador.registrar_info(f"Datos cargados desde '{nombre_archivo}'.")
+
+            print("\n--- Análisis de Datos de Secuencias ---")
+            print(f"Total de secuencias procesadas: {len(df)}")
+
+            if not df.empty:
+                print("\nEstadísticas de longitud de proteínas:")
+                estadisticas_longitud_proteina = df['Longitud_Proteina'].describe()
+                print(f"  Promedio: {estadisticas_longitud_proteina['mean']:.2f} aminoácidos")
+                print(f"  Mínimo: {estadisticas_longitud_proteina['min']:.0f} aminoácidos")
+                print(f"  Máximo: {estadisticas_longitud_proteina['max']:.0f} aminoácidos")
+                print(f"  Desviación estándar: {estadisticas_longitud_proteina['std']:.2f} aminoácidos")
+
+                
+                print("\n--- Búsqueda de Proteínas Largas (Longitud > 10) ---")
+                long_proteins = df[df['Longitud_Proteina'] > 10]
+                if not long_proteins.empty:
+                    print(f"Se encontraron {len(long_proteins)} secuencias con proteínas de longitud mayor a 10:")
+                    for indice, fila in long_proteins.iterrows():
+                        print(f"  - ADN Original: {fila['ADN_Original']} | Longitud Proteína: {fila['Longitud_Proteina']}")
+                else:
+                    print("No hay proteínas con longitud mayor a 10.")
+
+               
+                unique_adn_count = df['ADN_Limpio'].nunique()
+                print(f"\nNúmero de secuencias de ADN limpias únicas: {unique_adn_count}")
+
+               
+               
+
+            else:
+                print("\nEl archivo de datos está vacío. No hay estadísticas para mostrar.")
+
+            print("--- Fin del Análisis ---")
+            self.registrador.registrar_info("Análisis de datos con pandas completado.")
+
+        except pd.errors.EmptyDataError:
+            self.registrador.registrar_error(f"El archivo '{nombre_archivo}' está vacío.", info_exc=True)
+            print(f"Error: El archivo '{nombre_archivo}' está vacío. No hay datos para analizar.")
+        except Exception as e:
+            self.registrador.registrar_error(f"Error al cargar o analizar el archivo '{nombre_archivo}': {e}", info_exc=True)
+            print(f"Ocurrió un error inesperado al analizar los datos: {e}")
+            if SENTRY_DSN:
+                import sentry_sdk
+                sentry_sdk.capture_exception()
+
+    def _analizar_datos_por_bloques(self, nombre_archivo, tamano_bloque, conteo_aproximado):
+        """
+        Versión fuera de memoria de cargar_y_analizar_datos: lee solo las columnas necesarias por bloques,
+        combina las estadísticas de longitud de forma incremental y emite las proteínas largas a medida que aparecen.
+        """
+        import pandas as pd
+
+        def imprimir_largas(largas):
+            for adn_original, longitud in zip(largas['ADN_Original'].tolist(), largas['Longitud_Proteina'].tolist()):
+                print(f"  - ADN Original: {adn_original} | Longitud Proteína: {longitud}")
+
+        try:
+            print("\n--- Análisis de Datos de Secuencias (por bloques) ---")
+            print("\n--- Búsqueda de Proteínas Largas (Longitud > 10) ---")
+            estadisticas, proteinas_largas, adn_limpio_unicos = _acumular_resultados(nombre_archivo, tamano_bloque, conteo_aproximado, 10,
+                                                                                     al_encontrar_largas=imprimir_largas)
+            if proteinas_largas:
+                print(f"Se encontraron {proteinas_largas} secuencias con proteínas de longitud mayor a 10.")
+            else:
+                print("No hay proteínas con longitud mayor a 10.")
+
+            print(f"\nTotal de secuencias procesadas: {estadisticas.n}")
+            if estadisticas.n:
+                print("\nEstadísticas de longitud de proteínas:")
+                print(f"  Promedio: {estadisticas.media:.2f} aminoácidos")
+                print(f"  Mínimo: {estadisticas.minimo:.0f} aminoácidos")
+                print(f"  Máximo: {estadisticas.maximo:.0f} aminoácidos")
+                print(f"  Desviación estándar: {estadisticas.desviacion_estandar:.2f} aminoácidos")
+                if conteo_aproximado:
+                    print(f"\nNúmero de secuencias de ADN limpias únicas (aproximado): {adn_limpio_unicos}")
+                else:
+                    print(f"\nNúmero de secuencias de ADN limpias únicas: {adn_limpio_unicos}")
+            else:
+                print("\nEl archivo de datos está vacío. No hay estadísticas para mostrar.")
+
+            print("--- Fin del Análisis ---")
+            self.registrador.registrar_info("Análisis por bloques de '%s' completado (%d filas).", nombre_archivo, estadisticas.n)
+
+        except pd.errors.EmptyDataError:
+            self.registrador.registrar_error(f"El archivo '{nombre_archivo}' está vacío.", info_exc=True)
+            print(f"Error: El archivo '{nombre_archivo}' está vacío. No hay datos para analizar.")
+        except Exception as e:
+            self.registrador.registrar_error(f"Error al cargar o analizar el archivo '{nombre_archivo}': {e}", info_exc=True)
+            print(f"Ocurrió un error inesperado al analizar los datos: {e}")
+
+
+# --- Perfiles de composición ---
+AMINOACIDOS_PERFIL = 'ACDEFGHIKLMNPQRSTVWYX' # X agrupa '?' y cualquier otro símbolo (_CODIFICACION_AMINOACIDOS)
+CODONES_PERFIL = [a + b + c for a in 'ACGU' for b in 'ACGU' for c in 'ACGU'] # En el orden de los índices de codón
+
+class PerfiladorComposicion:
+    """
+    Perfil de composición de un lote completo de resultados: conteo de aminoácidos, uso de codones
+    (codones traducidos más el STOP) y conteo de k-mers de aminoácidos (dipéptidos con k=2).
+    Todo se cuenta con np.bincount sobre residuos codificados como enteros, bloque a bloque, y los
+    perfiles parciales (de bloques o de trabajadores) se suman con combinar().
+    """
+
+    def __init__(self, k: int = 2):
+        if not 1 <= k <= 4:
+            raise ValueError("k debe estar entre 1 y 4 (hay 21**k k-mers posibles).")
+        self.k = k
+        self.numero_proteinas = 0
+        self.conteos_aminoacidos = np.zeros(len(AMINOACIDOS_PERFIL), dtype=np.int64)
+        self.conteos_codones = np.zeros(64, dtype=np.int64)
+        self.conteos_kmers = np.zeros(len(AMINOACIDOS_PERFIL) ** k, dtype=np.int64)
+
+    @staticmethod
+    def _codificar_proteinas(proteinas):
+        longitudes = np.fromiter((len(proteina) for proteina in proteinas), dtype=np.int64, count=len(proteinas))
+        codigos = _CODIFICACION_AMINOACIDOS[np.frombuffer("".join(proteinas).encode('ascii', errors='replace'), dtype=np.uint8)]
+        return codigos, longitudes
+
+    def agregar_proteinas(self, proteinas):
+        """Suma al perfil los aminoácidos y k-mers de una lista de proteínas (los k-mers no cruzan proteínas)."""
+        proteinas = list(proteinas)
+        if not proteinas:
+            return
+        codigos, longitudes = self._codificar_proteinas(proteinas)
+        self.numero_proteinas += len(proteinas)
+        self.conteos_aminoacidos += np.bincount(codigos, minlength=len(AMINOACIDOS_PERFIL))
+        if len(codigos) < self.k:
+            return
+        ventanas = len(codigos) - self.k + 1
+        indices_kmer = np.zeros(ventanas, dtype=np.int64)
+        for desplazamiento in range(self.k):
+            indices_kmer = indices_kmer * len(AMINOACIDOS_PERFIL) + codigos[desplazamiento:desplazamiento + ventanas]
+        # Posición de cada residuo dentro de su proteína, para descartar los k-mers que cruzan de una a otra
+        inicios = np.cumsum(longitudes) - longitudes
+        posicion_en_proteina = np.arange(len(codigos)) - np.repeat(inicios, longitudes)
+        longitud_de_su_proteina = np.repeat(longitudes, longitudes)
+        validos = (posicion_en_proteina <= longitud_de_su_proteina - self.k)[:ventanas]
+        self.conteos_kmers += np.bincount(indices_kmer[validos], minlength=len(self.conteos_kmers))
+
+    def agregar_codones(self, arns, longitudes_proteina):
+        """Suma el uso de codones de los ARN: los codones traducidos y el STOP (si lo hay) de cada transcrito."""
+        fragmentos = [arn[:min(3 * (longitud + 1), len(arn) - len(arn) % 3)] for arn, longitud in zip(arns, longitudes_proteina)]
+        indices = calcular_indices_codones(codificar_secuencia("".join(fragmentos)))
+        self.conteos_codones += np.bincount(indices, minlength=INDICE_CODON_DESCONOCIDO + 1)[:64]
+
+    @staticmethod
+    def matriz_composicion(proteinas) -> 'pd.DataFrame':
+        """Matriz proteínas x aminoácidos con el conteo de cada residuo por secuencia."""
+        import pandas as pd
+        proteinas = list(proteinas)
+        codigos, longitudes = PerfiladorComposicion._codificar_proteinas(proteinas)
+        identificadores = np.repeat(np.arange(len(proteinas)), longitudes)
+        conteos = np.bincount(identificadores * len(AMINOACIDOS_PERFIL) + codigos, minlength=len(proteinas) * len(AMINOACIDOS_PERFIL))
+        return pd.DataFrame(conteos.reshape(len(proteinas), len(AMINOACIDOS_PERFIL)), columns=list(AMINOACIDOS_PERFIL))
+
+    def combinar(self, otro: 'PerfiladorComposicion'):
+        if otro.k != self.k:
+            raise ValueError("No se pueden combinar perfiles con distinto k.")
+        self.numero_proteinas += otro.numero_proteinas
+        self.conteos_aminoacidos += otro.conteos_aminoacidos
+        self.conteos_codones += otro.conteos_codones
+        self.conteos_kmers += otro.conteos_kmers
+
+    @classmethod
+    def perfilar_archivo(cls, nombre_archivo='datos_adn.csv', k: int = 2, tamano_bloque: int = 100000, ruta_matriz: str = None):
+        """
+        Perfila un archivo de resultados (CSV o Parquet) por bloques. Si se indica ruta_matriz,
+        la matriz de composición por secuencia se va escribiendo en ese CSV bloque a bloque.
+        """
+        perfil = cls(k)
+        primera_escritura = True
+        for bloque in leer_bloques_resultados(nombre_archivo, ['ARN_Secuencia', 'Proteina_Secuencia', 'Longitud_Proteina'], tamano_bloque):
+            proteinas = bloque['Proteina_Secuencia'].fillna('').astype(str).tolist()
+            perfil.agregar_proteinas(proteinas)
+            perfil.agregar_codones(bloque['ARN_Secuencia'].fillna('').astype(str).tolist(), bloque['Longitud_Proteina'].tolist())
+            if ruta_matriz:
+                cls.matriz_composicion(proteinas).to_csv(ruta_matriz, mode='w' if primera_escritura else 'a', header=primera_escritura, index=False)
+                primera_escritura = False
+        return perfil
+
+    def _kmer(self, indice: int) -> str:
+        letras = []
+        for _ in range(self.k):
+            indice, resto = divmod(indice, len(AMINOACIDOS_PERFIL))
+            letras.append(AMINOACIDOS_PERFIL[resto])
+        return "".join(reversed(letras))
+
+    def a_tablas(self) -> dict:
+        """Devuelve el perfil como DataFrames: 'aminoacidos', 'codones' y 'kmers' (solo los k-mers observados)."""
+        import pandas as pd
+        total_aminoacidos = max(int(self.conteos_aminoacidos.sum()), 1)
+        aminoacidos = pd.DataFrame({'Aminoacido': list(AMINOACIDOS_PERFIL), 'Conteo': self.conteos_aminoacidos,
+                                    'Porcentaje': self.conteos_aminoacidos * 100.0 / total_aminoacidos})
+        total_codones = max(int(self.conteos_codones.sum()), 1)
+        codones = pd.DataFrame({'Codon': CODONES_PERFIL, 'Aminoacido': [tabla_codones[codon] for codon in CODONES_PERFIL],
+                                'Conteo': self.conteos_codones, 'Frecuencia': self.conteos_codones / total_codones})
+        observados = np.flatnonzero(self.conteos_kmers)
+        kmers = pd.DataFrame({'Kmer': [self._kmer(int(indice)) for indice in observados], 'Conteo': self.conteos_kmers[observados]})
+        return {'aminoacidos': aminoacidos, 'codones': codones, 'kmers': kmers}
+
+    def guardar(self, prefijo: str):
+        """
+        Guarda el perfil en <prefijo>_aminoacidos.csv, <prefijo>_codones.csv, <prefijo>_kmers.csv
+        y <prefijo>_resumen.csv (k y número de proteínas).
+        """
+        import pandas as pd
+        for nombre, tabla in self.a_tablas().items():
+            tabla.to_csv(f"{prefijo}_{nombre}.csv", index=False)
+        pd.DataFrame({'k': [self.k], 'Numero_Proteinas': [self.numero_proteinas]}).to_csv(f"{prefijo}_resumen.csv", index=False)
+
+    @classmethod
+    def cargar(cls, prefijo: str) -> 'PerfiladorComposicion':
+        """Reconstruye un perfil guardado con guardar()."""
+        import pandas as pd
+        resumen = pd.read_csv(f"{prefijo}_resumen.csv")
+        aminoacidos = pd.read_csv(f"{prefijo}_aminoacidos.csv", keep_default_na=False)
+        codones = pd.read_csv(f"{prefijo}_codones.csv", keep_default_na=False)
+        kmers = pd.read_csv(f"{prefijo}_kmers.csv", keep_default_na=False)
+        perfil = cls(int(resumen['k'].iloc[0]))
+        perfil.numero_proteinas = int(resumen['Numero_Proteinas'].iloc[0])
+        perfil.conteos_aminoacidos[:] = aminoacidos.set_index('Aminoacido').reindex(list(AMINOACIDOS_PERFIL))['Conteo'].to_numpy()
+        perfil.conteos_codones[:] = codones.set_index('Codon').reindex(CODONES_PERFIL)['Conteo'].to_numpy()
+        for kmer, conteo in zip(kmers['Kmer'].tolist(), kmers['Conteo'].tolist()):
+            indice = 0
+            for letra in kmer:
+                indice = indice * len(AMINOACIDOS_PERFIL) + AMINOACIDOS_PERFIL.index(letra)
+            perfil.conteos_kmers[indice] = conteo
+        return perfil
+
+
+# --- Caché de traducciones ---
+class CacheTraducciones:
+    """
+    Caché LRU de resultados del pipeline indexada por el contenido del ADN limpio (o su resumen BLAKE2b).
+    Guarda la proteína, su longitud y las anomalías detectadas (tipo, muestra, datos), y expulsa las entradas menos usadas
+    cuando el tamaño estimado supera presupuesto_bytes. Pensada para lotes con lecturas muy repetidas.
+    """
+    BYTES_POR_ENTRADA = 200 # Estimación del coste fijo de cada entrada (nodo del OrderedDict, tupla, enteros)
+
+    def __init__(self, presupuesto_bytes: int = 64 * 1024 * 1024, usar_resumen: bool = True):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.usar_resumen = usar_resumen # Con secuencias largas la clave de 16 bytes ahorra memoria
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self._entradas = collections.OrderedDict()
+
+    def clave(self, adn_limpio: str):
+        if self.usar_resumen:
+            return hashlib.blake2b(adn_limpio.encode('utf-8'), digest_size=16).digest()
+        return adn_limpio
+
+    def obtener(self, clave):
+        """Devuelve (proteina, longitud, anomalias) o None, actualizando los contadores y el orden LRU."""
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        self._entradas.move_to_end(clave)
+        return entrada
+
+    def guardar(self, clave, proteina: str, longitud: int, anomalias: tuple):
+        if clave in self._entradas:
+            return
+        tamano = self._tamano_entrada(clave, proteina, anomalias)
+        if tamano > self.presupuesto_bytes:
+            return
+        self._entradas[clave] = (proteina, longitud, anomalias)
+        self.bytes_usados += tamano
+        while self.bytes_usados > self.presupuesto_bytes:
+            clave_antigua, (proteina_antigua, _, anomalias_antiguas) = self._entradas.popitem(last=False)
+            self.bytes_usados -= self._tamano_entrada(clave_antigua, proteina_antigua, anomalias_antiguas)
+            self.expulsiones += 1
+
+    def _tamano_entrada(self, clave, proteina: str, anomalias: tuple) -> int:
+        # Las muestras que no son la propia proteína (el ARN de codones_desconocidos) también ocupan memoria
+        return (sys.getsizeof(clave) + sys.getsizeof(proteina) + self.BYTES_POR_ENTRADA
+                + sum(sys.getsizeof(muestra) for _, muestra, _ in anomalias if muestra is not proteina))
+
+    def estadisticas(self) -> dict:
+        consultas = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            'expulsiones': self.expulsiones,
+            'entradas': len(self._entradas),
+            'bytes_usados': self.bytes_usados,
+        }
+
+def detectar_anomalias(arn: str, proteina: str) -> tuple:
+    """
+    Anomalías (tipo, muestra, datos) que traducir_arn/analizar_longitud_proteina reportan para este resultado,
+    con la misma muestra que el camino sin caché: el ARN para codones_desconocidos y la proteína para las de longitud.
+    """
+    anomalias = []
+    conteo_desconocidos = proteina.count('?')
+    if conteo_desconocidos:
+        anomalias.append(('codones_desconocidos', arn, {"longitud_arn": len(arn), "conteo_desconocidos": conteo_desconocidos}))
+    if 0 < len(proteina) < MIN_LONGITUD_PROTEINA_FUNCIONAL:
+        anomalias.append(('proteina_corta', proteina, {"longitud_proteina": len(proteina)}))
+    elif len(proteina) > MAX_LONGITUD_PROTEINA_FUNCIONAL:
+        anomalias.append(('proteina_larga', proteina, {"longitud_proteina": len(proteina)}))
+    return tuple(anomalias)
+
+
+# --- Procesamiento por lotes (FASTA/FASTQ) ---
+
+def leer_registros_secuencias(ruta_archivo: str):
+    """
+    Lee un archivo FASTA o FASTQ (opcionalmente comprimido con gzip) como un generador.
+    Devuelve un registro (identificador, secuencia) a la vez, sin cargar el archivo completo en memoria.
+    El formato se detecta por el primer carácter del archivo ('>' para FASTA, '@' para FASTQ); si no es
+    ninguno de los dos, cada línea no vacía es una secuencia (identificada por su número de línea).
+    Con ruta_archivo='-' se lee la entrada estándar.
+    """
+    if ruta_archivo == '-':
+        archivo_entrada = contextlib.nullcontext(sys.stdin)
+    elif ruta_archivo.endswith('.gz'):
+        archivo_entrada = gzip.open(ruta_archivo, 'rt', encoding='utf-8')
+    else:
+        archivo_entrada = open(ruta_archivo, 'r', encoding='utf-8')
+    with archivo_entrada as archivo:
+        primera_linea = archivo.readline()
+        while primera_linea and not primera_linea.strip():
+            primera_linea = archivo.readline()
+        if not primera_linea:
+            return
+
+        if primera_linea.startswith('@'):
+            # FASTQ: bloques de 4 líneas (cabecera, secuencia, '+', calidades)
+            cabecera = primera_linea
+            while cabecera:
+                if cabecera.strip():
+                    if not cabecera.startswith('@'):
+                        raise ValueError(f"Registro FASTQ mal formado: se esperaba '@' y se encontró '{cabecera.strip()[:50]}'.")
+                    secuencia = archivo.readline().strip()
+                    archivo.readline() # Línea '+'
+                    archivo.readline() # Línea de calidades
+                    yield cabecera[1:].strip(), secuencia
+                cabecera = archivo.readline()
+        elif primera_linea.startswith('>'):
+            # FASTA: la secuencia puede ocupar varias líneas hasta la siguiente cabecera
+            identificador = primera_linea[1:].strip()
+            partes = []
+            for linea in archivo:
+                if linea.startswith('>'):
+                    yield identificador, "".join(partes)
+                    identificador = linea[1:].strip()
+                    partes = []
+                else:
+                    partes.append(linea.strip())
+            yield identificador, "".join(partes)
+        else:
+            # Texto plano: una secuencia por línea
+            for numero_linea, linea in enumerate(itertools.chain([primera_linea], archivo), start=1):
+                if linea.strip():
+                    yield str(numero_linea), linea.strip()
+
+
+class ProcesadorLotes:
+    """
+    Procesa archivos FASTA/FASTQ de forma no interactiva, registro a registro, con el pipeline
+    limpiar_adn -> validar_adn -> transcribir_adn -> traducir_arn -> analizar_longitud_proteina
+    (las tres primeras etapas fusionadas en GestorADN.normalizar_adn).
+    Con metricas, las etapas del pipeline de gestor_adn y analizador_proteinas (ETAPAS_GESTOR_ADN y
+    ETAPAS_ANALIZADOR_PROTEINAS) se instrumentan (ver instrumentar) y el registrador cuenta las anomalías por tipo;
+    sin metricas el pipeline no tiene ningún coste adicional.
+    """
+    ETAPAS_GESTOR_ADN = ('limpiar_adn', 'validar_adn', 'transcribir_adn', 'normalizar_adn')
+    ETAPAS_ANALIZADOR_PROTEINAS = ('traducir_arn', 'traducir_arns', 'analizar_longitud_proteina')
+
+    def __init__(self, gestor_adn: GestorADN, analizador_proteinas: AnalizadorProteinas, registrador: RegistradorSecuencias,
+                 cache: CacheTraducciones = None, metricas: RegistroMetricas = None):
+        self.gestor_adn = gestor_adn
+        self.analizador_proteinas = analizador_proteinas
+        self.registrador = registrador
+        self.cache = cache
+        self.metricas = metricas
+        if metricas is not None:
+            instrumentar(gestor_adn, metricas, self.ETAPAS_GESTOR_ADN)
+            instrumentar(analizador_proteinas, metricas, self.ETAPAS_ANALIZADOR_PROTEINAS)
+            registrador.metricas = metricas
+
+    def procesar_registro(self, adn_original: str):
+        """
+        Ejecuta el pipeline completo sobre una secuencia.
+        Devuelve la fila de resultados (en el orden de COLUMNAS_RESULTADOS) o None si el ADN no es válido.
+        Con caché, un ADN limpio ya visto se sigue normalizando (la clave es el ADN limpio, así que mayúsculas y espacios
+        no cuentan) pero se salta la traducción y el análisis de longitud; sus anomalías se vuelven a notificar al reportador.
+        """
+        # Limpieza, validación y transcripción fusionadas en GestorADN.normalizar_adn (mismo resultado, menos pasadas)
+        normalizado = self.gestor_adn.normalizar_adn(adn_original)
+        adn_limpio, arn = normalizado['adn_limpio'], normalizado['arn']
+        clave, fila = self._consultar_cache(adn_original, normalizado)
+        if fila is not None or not normalizado['valido']:
+            return fila
+        return self._completar_fila(adn_original, adn_limpio, arn, clave, self.analizador_proteinas.traducir_arn(arn))
+
+    def procesar_registros(self, secuencias) -> list:
+        """
+        procesar_registro para varias secuencias: las que hay que traducir se traducen juntas con
+        AnalizadorProteinas.traducir_arns. Devuelve las mismas filas que procesar_registro, en el mismo orden.
+        """
+        filas = [None] * len(secuencias)
+        pendientes = [] # (posición, ADN original, ADN limpio, ARN, clave de caché) de las que hay que traducir
+        for posicion, adn_original in enumerate(secuencias):
+            normalizado = self.gestor_adn.normalizar_adn(adn_original)
+            clave, filas[posicion] = self._consultar_cache(adn_original, normalizado)
+            if filas[posicion] is None and normalizado['valido']:
+                pendientes.append((posicion, adn_original, normalizado['adn_limpio'], normalizado['arn'], clave))
+        proteinas = self.analizador_proteinas.traducir_arns([arn for _, _, _, arn, _ in pendientes])
+        for (posicion, adn_original, adn_limpio, arn, clave), proteina in zip(pendientes, proteinas):
+            filas[posicion] = self._completar_fila(adn_original, adn_limpio, arn, clave, proteina)
+        return filas
+
+    def _consultar_cache(self, adn_original: str, normalizado: dict):
+        """Devuelve (clave de caché o None, fila si es un acierto o None); en un acierto se renotifican sus anomalías."""
+        if self.cache is None:
+            return None, None
+        clave = self.cache.clave(normalizado['adn_limpio'])
+        entrada = self.cache.obtener(clave)
+        if entrada is None:
+            return clave, None
+        proteina, longitud_proteina, anomalias = entrada
+        for tipo, muestra, datos in anomalias:
+            self.registrador.reportar_anomalia(tipo, muestra=muestra, datos=datos)
+        return clave, (adn_original, normalizado['adn_limpio'], normalizado['arn'], proteina, longitud_proteina)
+
+    def _completar_fila(self, adn_original: str, adn_limpio: str, arn: str, clave, proteina: str):
+        longitud_proteina = self.analizador_proteinas.analizar_longitud_proteina(proteina)
+        if self.cache is not None:
+            self.cache.guardar(clave, proteina, longitud_proteina, detectar_anomalias(arn, proteina))
+        return (adn_original, adn_limpio, arn, proteina, longitud_proteina)
+
+    def procesar_archivo(self, ruta_entrada: str, ruta_salida='datos_adn.csv', tamano_bloque: int = 10000) -> dict:
+        """
+        Procesa todos los registros de un archivo FASTA/FASTQ y escribe los resultados de forma incremental,
+        por bloques de tamano_bloque filas, con un EscritorResultados (CSV o Parquet según la extensión de salida).
+        Devuelve un diccionario con los contadores y el rendimiento (registros/s y bases/s).
+        """
+        registros = registros_validos = bases = 0
+        inicio = time.perf_counter()
+
+        with EscritorResultados(ruta_salida, tamano_bloque=tamano_bloque) as escritor:
+            for identificador, secuencia in leer_registros_secuencias(ruta_entrada):
+                registros += 1
+                bases += len(secuencia)
+                fila = self.procesar_registro(secuencia)
+                if fila is None:
+                    self.registrador.registrar_advertencia("Registro '%s' descartado: ADN inválido.", identificador)
+                    continue
+                registros_validos += 1
+                escritor.agregar(fila)
+
+        estadisticas = resumir_rendimiento(registros, registros_validos, bases, time.perf_counter() - inicio)
+        if self.cache is not None:
+            estadisticas['cache'] = self.cache.estadisticas()
+        if self.metricas is not None:
+            registrar_metricas_lote(self.metricas, estadisticas, ruta_entrada, escritor)
+        self.registrador.registrar_info("Lote '%s' procesado: %s", ruta_entrada, estadisticas)
+        return estadisticas
+
+
+def registrar_metricas_lote(metricas: RegistroMetricas, estadisticas: dict, ruta_entrada: str, escritor: EscritorResultados):
+    """Suma a las métricas los contadores de un lote ya procesado (secuencias, bytes leídos/escritos y caché)."""
+    metricas.incrementar('secuencias_procesadas_total', estadisticas['registros_validos'], {'resultado': 'valido'})
+    metricas.incrementar('secuencias_procesadas_total', estadisticas['registros_invalidos'], {'resultado': 'invalido'})
+    metricas.incrementar('bases_procesadas_total', estadisticas['bases'])
+    if os.path.isfile(ruta_entrada):
+        # Con '-' (entrada estándar) u otros flujos no hay tamaño que medir
+        metricas.incrementar('bytes_leidos_total', os.path.getsize(ruta_entrada))
+    metricas.incrementar('bytes_escritos_total', escritor.bytes_escritos)
+    if 'cache' in estadisticas:
+        metricas.incrementar('cache_consultas_total', estadisticas['cache']['aciertos'], {'resultado': 'acierto'})
+        metricas.incrementar('cache_consultas_total', estadisticas['cache']['fallos'], {'resultado': 'fallo'})
+
+
+def resumir_rendimiento(registros: int, registros_validos: int, bases: int, segundos: float) -> dict:
+    """Construye el diccionario de contadores y rendimiento de un procesamiento por lotes."""
+    return {
+        'registros': registros,
+        'registros_validos': registros_validos,
+        'registros_invalidos': registros - registros_validos,
+        'bases': bases,
+        'segundos': segundos,
+        'registros_por_segundo': registros / segundos if segundos > 0 else 0.0,
+        'bases_por_segundo': bases / segundos if segundos > 0 else 0.0,
+    }
+
+
+# --- Procesamiento paralelo ---
+_procesador_trabajador = None
+
+class _ReenvioRegistro(logging.Handler):
+    """Reenvía al logger correspondiente del proceso principal los registros recibidos de los trabajadores."""
+
+    def emit(self, registro):
+        logging.getLogger(registro.name).handle(registro)
+
+def _inicializar_trabajador(cola_registro, nivel_registro, motor_traduccion, presupuesto_cache_bytes=0, metricas_activas=False,
+                            reenviar_telemetria=False):
+    """
+    Prepara un proceso trabajador: sus propios GestorADN/AnalizadorProteinas y un logger que no escribe
+    en disco, sino que envía los registros al proceso principal a través de una cola multiproceso.
+    Con reenviar_telemetria, las anomalías se recogen en un TelemetriaTrabajador y vuelven con cada bloque.
+    """
+    global _procesador_trabajador, _reportador_sentry
+    registrador_base = logging.getLogger('simulador_biologico')
+    for manejador in registrador_base.handlers[:]:
+        registrador_base.removeHandler(manejador)
+    registrador_base.addHandler(logging.handlers.QueueHandler(cola_registro))
+    registrador_base.setLevel(nivel_registro)
+    # El hilo del reportador no sobrevive al fork: cada trabajador crea el suyo si hace falta
+    _reportador_sentry = None
+
+    registrador = RegistradorSecuencias(reportador=TelemetriaTrabajador() if reenviar_telemetria else None)
+    _procesador_trabajador = ProcesadorLotes(
+        GestorADN(registrador, mostrar_avisos=False),
+        AnalizadorProteinas(registrador, mostrar_avisos=False, motor_traduccion=motor_traduccion),
+        registrador,
+        cache=CacheTraducciones(presupuesto_cache_bytes) if presupuesto_cache_bytes else None,
+        metricas=RegistroMetricas() if metricas_activas else None,
+    )
+
+def _procesar_bloque_trabajador(bloque):
+    """
+    Procesa un bloque de registros (identificador, secuencia) en un trabajador.
+    Devuelve (filas, bases, aciertos_cache, fallos_cache, metricas, telemetria) de este bloque; metricas son las
+    acumuladas por el trabajador desde el bloque anterior (RegistroMetricas.exportar) o None si están desactivadas,
+    y telemetria, los elementos de TelemetriaTrabajador para el reportador del proceso principal (o una lista vacía).
+    """
+    filas = []
+    bases = 0
+    cache = _procesador_trabajador.cache
+    aciertos_previos, fallos_previos = (cache.aciertos, cache.fallos) if cache else (0, 0)
+    for identificador, secuencia in bloque:
+        bases += len(secuencia)
+        fila = _procesador_trabajador.procesar_registro(secuencia)
+        if fila is None:
+            _procesador_trabajador.registrador.registrar_advertencia("Registro '%s' descartado: ADN inválido.", identificador)
+        filas.append(fila)
+    metricas = _procesador_trabajador.metricas
+    metricas_bloque = metricas.exportar(reiniciar=True) if metricas is not None else None
+    reportador = _procesador_trabajador.registrador.reportador
+    telemetria = reportador.extraer() if isinstance(reportador, TelemetriaTrabajador) else []
+    if cache is None:
+        return filas, bases, 0, 0, metricas_bloque, telemetria
+    return filas, bases, cache.aciertos - aciertos_previos, cache.fallos - fallos_previos, metricas_bloque, telemetria
+
+
+class ProcesadorParalelo:
+    """
+    Reparte los registros de un archivo FASTA/FASTQ en bloques entre un pool de procesos.
+    Cada trabajador tiene sus propias instancias de GestorADN/AnalizadorProteinas y el mismo pipeline que
+    ProcesadorLotes, por lo que la salida es idéntica a la del modo secuencial. Con ordenado=True las filas
+    se escriben en el orden del archivo de entrada; con ordenado=False, en el orden en que terminan los bloques.
+    """
+    def __init__(self, registrador: RegistradorSecuencias, numero_trabajadores: int = None, tamano_bloque: int = 1000,
+                 ordenado: bool = True, motor_traduccion: str = 'auto', presupuesto_cache_bytes: int = 0,
+                 metricas: RegistroMetricas = None):
+        self.registrador = registrador
+        self.metricas = metricas # Cada trabajador mide por su cuenta y envía sus métricas con cada bloque
+        self.presupuesto_cache_bytes = presupuesto_cache_bytes # Caché por trabajador (0 = sin caché)
+        self.numero_trabajadores = numero_trabajadores or os.cpu_count() or 1
+        self.tamano_bloque = tamano_bloque
+        self.ordenado = ordenado
+        self.motor_traduccion = motor_traduccion
 
-SENTRY_DSN = os.getenv("SENTRY_DSN")
+    def _bloques(self, ruta_entrada):
+        registros = leer_registros_secuencias(ruta_entrada)
+        while True:
+            bloque = list(itertools.islice(registros, self.tamano_bloque))
+            if not bloque:
+                return
+            yield bloque
 
-if SENTRY_DSN:
-    sentry_sdk.init(
-        dsn=SENTRY_DSN,
-        traces_sample_rate=1.0 # Tasa de muestreo para el monitoreo de rendimiento (ajustar según necesidad)
-    )
-    logging.info("Sentry inicializado correctamente.")
-else:
-    logging.warning("SENTRY_DSN no encontrado en .env. Sentry no estará activo.")
+    def procesar_archivo(self, ruta_entrada: str, ruta_salida='datos_adn.csv', tamano_bloque_escritura: int = 10000) -> dict:
+        """
+        Procesa el archivo en paralelo y escribe los resultados con un EscritorResultados.
+        Como mucho hay 2 bloques en vuelo por trabajador, de modo que la memoria no depende del tamaño del archivo.
+        Devuelve el mismo diccionario de contadores y rendimiento que ProcesadorLotes.procesar_archivo.
+        """
+        registros = registros_validos = bases = aciertos_cache = fallos_cache = 0
+        inicio = time.perf_counter()
 
+        cola_registro = multiprocessing.Queue()
+        escuchador = logging.handlers.QueueListener(cola_registro, _ReenvioRegistro())
+        escuchador.start()
+        nivel_registro = logging.getLogger('simulador_biologico').getEffectiveLevel()
+        maximo_en_vuelo = 2 * self.numero_trabajadores
 
-# --- Configuración del sistema de logging ---
-# Crea un logger personalizado
-logger_principal = logging.getLogger('sequence_processor')
-logger_principal.setLevel(logging.DEBUG)
+        def consumir(futuro):
+            nonlocal registros, registros_validos, bases, aciertos_cache, fallos_cache
+            filas, bases_bloque, aciertos_bloque, fallos_bloque, metricas_bloque, telemetria = futuro.result()
+            if metricas_bloque is not None:
+                self.metricas.incorporar(metricas_bloque)
+            if telemetria:
+                self.registrador.reportador.incorporar(telemetria)
+            registros += len(filas)
+            bases += bases_bloque
+            aciertos_cache += aciertos_bloque
+            fallos_cache += fallos_bloque
+            for fila in filas:
+                if fila is not None:
+                    registros_validos += 1
+                    escritor.agregar(fila)
 
-# Elimina cualquier handler existente para evitar que los mensajes vayan a la consola por defecto
-for handler in logger_principal.handlers[:]:
-    logger_principal.removeHandler(handler)
-for handler in logging.root.handlers[:]: # También limpia el root logger
-    logging.root.removeHandler(handler)
+        try:
+            with EscritorResultados(ruta_salida, tamano_bloque=tamano_bloque_escritura) as escritor, \
+                    concurrent.futures.ProcessPoolExecutor(max_workers=self.numero_trabajadores, initializer=_inicializar_trabajador,
+                                                           initargs=(cola_registro, nivel_registro, self.motor_traduccion,
+                                                                     self.presupuesto_cache_bytes, self.metricas is not None,
+                                                                     self.registrador.reportador is not None)) as ejecutor:
+                en_vuelo = collections.deque()
+                for bloque in self._bloques(ruta_entrada):
+                    en_vuelo.append(ejecutor.submit(_procesar_bloque_trabajador, bloque))
+                    while len(en_vuelo) >= maximo_en_vuelo:
+                        if self.ordenado:
+                            consumir(en_vuelo.popleft())
+                        else:
+                            terminados, _ = concurrent.futures.wait(en_vuelo, return_when=concurrent.futures.FIRST_COMPLETED)
+                            for futuro in terminados:
+                                en_vuelo.remove(futuro)
+                                consumir(futuro)
+                if self.ordenado:
+                    while en_vuelo:
+                        consumir(en_vuelo.popleft())
+                else:
+                    for futuro in concurrent.futures.as_completed(list(en_vuelo)):
+                        consumir(futuro)
+        finally:
+            escuchador.stop()
 
-# Crea un FileHandler para escribir en el archivo
-file_handler = logging.FileHandler('programa.log', encoding='utf-8')
-file_handler.setLevel(logging.DEBUG) # Nivel mínimo para este handler
+        estadisticas = resumir_rendimiento(registros, registros_validos, bases, time.perf_counter() - inicio)
+        if self.presupuesto_cache_bytes:
+            consultas = aciertos_cache + fallos_cache
+            estadisticas['cache'] = {'aciertos': aciertos_cache, 'fallos': fallos_cache,
+                                     'tasa_aciertos': aciertos_cache / consultas if consultas else 0.0}
+        if self.metricas is not None:
+            registrar_metricas_lote(self.metricas, estadisticas, ruta_entrada, escritor)
+        self.registrador.registrar_info("Lote '%s' procesado en paralelo con %d trabajadores: %s", ruta_entrada, self.numero_trabajadores, estadisticas)
+        return estadisticas
 
-# Define el formato para el archivo
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
-file_handler.setFormatter(formatter)
 
-# Añade el FileHandler al logger principal
-logger_principal.addHandler(file_handler)
+def main_lote(argumentos):
+    """
+    Punto de entrada no interactivo: python main.py lote <entrada.fasta|fastq[.gz]> [salida.csv] [--trabajadores N]
+    """
+    analizador_argumentos = argparse.ArgumentParser(prog='python main.py lote', description="Procesa un archivo FASTA/FASTQ completo.")
+    analizador_argumentos.add_argument('entrada', help="Archivo FASTA/FASTQ (opcionalmente .gz).")
+    analizador_argumentos.add_argument('salida', nargs='?', default='datos_adn.csv', help="Archivo de resultados (.csv o .parquet).")
+    analizador_argumentos.add_argument('--trabajadores', type=int, default=1, help="Procesos en paralelo (0 = todos los núcleos).")
+    analizador_argumentos.add_argument('--bloque', type=int, default=1000, help="Registros por bloque enviado a cada trabajador.")
+    analizador_argumentos.add_argument('--desordenado', action='store_true', help="Escribe los bloques según terminan, sin conservar el orden de entrada.")
+    analizador_argumentos.add_argument('--cache-mb', type=int, default=0, help="Memoria de la caché de traducciones en MB (0 = sin caché; por trabajador).")
+    analizador_argumentos.add_argument('--metricas-consola', action='store_true', help="Muestra un resumen de métricas por etapa.")
+    analizador_argumentos.add_argument('--metricas-json', metavar='RUTA', help="Escribe las métricas en un archivo JSON.")
+    analizador_argumentos.add_argument('--metricas-prometheus', metavar='RUTA', help="Escribe las métricas en formato de texto de Prometheus.")
+    analizador_argumentos.add_argument('--metricas-intervalo', type=float, default=None, help="Publica las métricas cada N segundos además de al final.")
+    analizador_argumentos.add_argument('--perfil', metavar='RUTA', help="Ejecuta el lote bajo cProfile y guarda las estadísticas en RUTA.")
+    opciones = analizador_argumentos.parse_args(argumentos)
+    ruta_entrada, ruta_salida = opciones.entrada, opciones.salida
+    inicializar_entorno()
+    _instalar_salida_en_senales()
 
-# --- Constantes para análisis de proteínas ---
-MIN_LONGITUD_PROTEINA_FUNCIONAL = 5
-MAX_LONGITUD_PROTEINA_FUNCIONAL = 100
+    # En modo lote el log se escribe de forma asíncrona y solo desde WARNING, para no frenar el pipeline
+    configurar_registro_asincrono(nivel=logging.WARNING)
+    registrador = RegistradorSecuencias()
 
-# --- Tabla de codones ---
-tabla_codones = {
-    'UUU': 'F', 'UUC': 'F', 'UUA': 'L', 'UUG': 'L',
-    'UCU': 'S', 'UCC': 'S', 'UCA': 'S', 'UCG': 'S',
-    'UAU': 'Y', 'UAC': 'Y', 'UAA': 'STOP', 'UAG': 'STOP',
-    'UGU': 'C', 'UGC': 'C', 'UGA': 'STOP', 'UGG': 'W',
-    'CUU': 'L', 'CUC': 'L', 'CUA': 'L', 'CUG': 'L',
-    'CCU': 'P', 'CCC': 'P', 'CCA': 'P', 'CCG': 'P',
-    'CAU': 'H', 'CAC': 'H', 'CAA': 'Q', 'CAG': 'Q',
-    'CGU': 'R', 'CGC': 'R', 'CGA': 'R', 'CGG': 'R',
-    'AUU': 'I', 'AUC': 'I', 'AUA': 'I', 'AUG': 'M',
-    'ACU': 'T', 'ACC': 'T', 'ACA': 'T', 'ACG': 'T',
-    'AAU': 'N', 'AAC': 'N', 'AAA': 'K', 'AAG': 'K',
-    'AGU': 'S', 'AGC': 'S', 'AGA': 'R', 'AGG': 'R',
-    'GUU': 'V', 'GUC': 'V', 'GUA': 'V', 'GUG': 'V',
-    'GCU': 'A', 'GCC': 'A', 'GCA': 'A', 'GCG': 'A',
-    'GAU': 'D', 'GAC': 'D', 'GAA': 'E', 'GAG': 'E',
-    'GGU': 'G', 'GGC': 'G', 'GGA': 'G', 'GGG': 'G'
-}# --- Clases ---
+    # Las métricas solo se activan si se pidió algún sumidero
+    sumideros = []
+    if opciones.metricas_consola:
+        sumideros.append(SumideroConsola())
+    if opciones.metricas_json:
+        sumideros.append(SumideroJSON(opciones.metricas_json))
+    if opciones.metricas_prometheus:
+        sumideros.append(SumideroPrometheus(opciones.metricas_prometheus))
+    metricas = RegistroMetricas() if sumideros else None
 
-class RegistradorSecuencias:
-    #Clase para encapsular las operaciones de logging para secuencias de ADN/ARN/Proteínas.
-    
-    def __init__(self, nombre_registrador='simulador_biologico'):
-    
-        
-        self.registrador = logging.getLogger(nombre_registrador)
+    if opciones.trabajadores == 1:
+        procesador = ProcesadorLotes(
+            GestorADN(registrador, mostrar_avisos=False),
+            AnalizadorProteinas(registrador, mostrar_avisos=False),
+            registrador,
+            cache=CacheTraducciones(opciones.cache_mb * 1024 * 1024) if opciones.cache_mb else None,
+            metricas=metricas,
+        )
+    else:
+        procesador = ProcesadorParalelo(registrador, numero_trabajadores=opciones.trabajadores or None,
+                                        tamano_bloque=opciones.bloque, ordenado=not opciones.desordenado,
+                                        presupuesto_cache_bytes=opciones.cache_mb * 1024 * 1024, metricas=metricas)
+    publicador = PublicadorMetricas(metricas, sumideros, opciones.metricas_intervalo) if metricas is not None else None
+    try:
+        with perfilar_ejecucion(opciones.perfil) if opciones.perfil else contextlib.nullcontext():
+            estadisticas = procesador.procesar_archivo(ruta_entrada, ruta_salida)
+    except (OSError, ValueError) as e:
+        registrador.registrar_error(f"Error en el procesamiento por lotes de '{ruta_entrada}': {e}", info_exc=True)
+        print(f"Error: {e}")
+        return 1
+    finally:
+        if publicador is not None:
+            publicador.detener()
 
-    def registrar_info(self, mensaje):
-        """Registra un mensaje de información."""
-        self.registrador.info(mensaje)
+    print("\n--- Resumen del Procesamiento por Lotes ---")
+    print(f"Registros leídos: {estadisticas['registros']}")
+    print(f"Registros válidos: {estadisticas['registros_validos']}")
+    print(f"Registros inválidos: {estadisticas['registros_invalidos']}")
+    print(f"Bases procesadas: {estadisticas['bases']}")
+    print(f"Tiempo: {estadisticas['segundos']:.2f} s")
+    print(f"Rendimiento: {estadisticas['registros_por_segundo']:.1f} registros/s, {estadisticas['bases_por_segundo']:.1f} bases/s")
+    if 'cache' in estadisticas:
+        cache = estadisticas['cache']
+        print(f"Caché de traducciones: {cache['aciertos']} aciertos, {cache['fallos']} fallos ({cache['tasa_aciertos']:.1%} de aciertos)")
+    print(f"Resultados guardados en '{ruta_salida}'.")
+    if opciones.perfil:
+        print(f"Perfil de cProfile guardado en '{opciones.perfil}'.")
+    print("-------------------------------------------\n")
+    return 0
 
-    def registrar_advertencia(self, mensaje, extra_data=None):
-      
-        self.registrador.warning(mensaje)
-        if SENTRY_DSN:
-            with sentry_sdk.push_scope() as scope:
-                if extra_data:
-                   
-                    scope.set_extras(extra_data)
-                sentry_sdk.capture_message(f"Advertencia/Anomalía: {mensaje}", level='warning')
+# --- Benchmarks del pipeline ---
+class GeneradorSecuenciasSinteticas:
+    """
+    Genera cargas de trabajo de ADN sintético reproducibles (misma semilla, mismas secuencias):
+        'lecturas_cortas': lecturas de 100-300 nt.
+        'transcritos_largos': transcritos de 30-90 kb que empiezan en ATG y no tienen STOP en marco.
+        'alta_duplicacion': lecturas cortas tomadas de un conjunto pequeño de secuencias únicas.
+        'bases_invalidas': lecturas cortas en las que un 30 % contiene N u otros caracteres no válidos.
+        'rico_en_stop': lecturas cortas con un codón STOP cada pocos codones.
+    """
+    CARGAS = ('lecturas_cortas', 'transcritos_largos', 'alta_duplicacion', 'bases_invalidas', 'rico_en_stop')
+    _BASES = b'ACGT'
+    _CODONES_SIN_STOP = [codon.replace('U', 'T') for codon, aminoacido in tabla_codones.items() if aminoacido != 'STOP']
 
-    def registrar_error(self, mensaje, info_exc=False, extra_data=None):
-        
-        
-        self.registrador.error(mensaje, exc_info=info_exc)
-        if SENTRY_DSN:
-            with sentry_sdk.push_scope() as scope:
-                if extra_data:
-                   
-                    scope.set_extras(extra_data)
-                if info_exc:
-                    sentry_sdk.capture_exception()
-                else:
-                    sentry_sdk.capture_message(f"Error: {mensaje}", level='error')
+    def __init__(self, semilla: int = 42):
+        self.semilla = semilla
 
-    def registrar_critico(self, mensaje, info_exc=False, extra_data=None):
-        """
-        Registra un mensaje crítico y, opcionalmente, envía la excepción a Sentry.
-        Args:
-            mensaje (str): Mensaje crítico.
-            info_exc (bool): Si es True, incluye información de la excepción.
-            extra_data (dict, optional): Datos adicionales para enviar a Sentry.
-        """
-        self.registrador.critical(mensaje, exc_info=info_exc)
-        if SENTRY_DSN:
-            with sentry_sdk.push_scope() as scope:
-                if extra_data:
-                    
-                    scope.set_extras(extra_data)
-                if info_exc:
-                    sentry_sdk.capture_exception()
-                else:
-                    sentry_sdk.capture_message(f"Crítico: {mensaje}", level='fatal')
+    def _aleatorio(self, carga):
+        # Cada carga tiene su propio generador, así no depende del orden en que se pidan
+        return np.random.default_rng([self.semilla, self.CARGAS.index(carga)])
 
+    def _adn_aleatorio(self, rng, longitud):
+        return np.frombuffer(self._BASES, dtype=np.uint8)[rng.integers(0, 4, longitud)].tobytes().decode('ascii')
 
+    def generar(self, carga: str, numero: int) -> list:
+        if carga not in self.CARGAS:
+            raise ValueError(f"Carga desconocida: '{carga}'. Opciones: {', '.join(self.CARGAS)}.")
+        rng = self._aleatorio(carga)
+        if carga == 'lecturas_cortas':
+            return [self._adn_aleatorio(rng, longitud) for longitud in rng.integers(100, 301, numero)]
+        if carga == 'transcritos_largos':
+            codones = np.array(self._CODONES_SIN_STOP)
+            return ['ATG' + "".join(codones[rng.integers(0, len(codones), longitud // 3)]) for longitud in rng.integers(30000, 90001, max(1, numero // 100))]
+        if carga == 'alta_duplicacion':
+            unicas = [self._adn_aleatorio(rng, longitud) for longitud in rng.integers(100, 301, max(1, numero // 100))]
+            return [unicas[indice] for indice in rng.integers(0, len(unicas), numero)]
+        if carga == 'bases_invalidas':
+            secuencias = []
+            for longitud in rng.integers(100, 301, numero):
+                secuencia = self._adn_aleatorio(rng, longitud)
+                if rng.random() < 0.3:
+                    posicion = int(rng.integers(0, longitud))
+                    secuencia = secuencia[:posicion] + str(rng.choice(list('NNNRYX'))) + secuencia[posicion + 1:]
+                secuencias.append(secuencia)
+            return secuencias
+        # rico_en_stop
+        stops = np.array(['TAA', 'TAG', 'TGA'])
+        secuencias = []
+        for longitud in rng.integers(33, 101, numero):
+            codones = np.array(self._CODONES_SIN_STOP)[rng.integers(0, len(self._CODONES_SIN_STOP), longitud)]
+            codones[rng.random(longitud) < 0.2] = stops[rng.integers(0, 3)]
+            secuencias.append('ATG' + "".join(codones))
+        return secuencias
 
-class GestorADN:
+    def escribir_fasta(self, ruta_archivo: str, carga: str, numero: int):
+        """Escribe una carga como archivo FASTA (útil para medir el modo lote)."""
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            for indice, secuencia in enumerate(self.generar(carga, numero)):
+                archivo.write(f">{carga}_{indice}\n{secuencia}\n")
+
+
+class SuiteBenchmark:
     """
-    Gestiona las operaciones de limpieza, validación, transcripción de ADN y obtención de complementarias.
+    Mide cada etapa del pipeline por separado y de extremo a extremo sobre las cargas sintéticas.
+    Para cada etapa informa del rendimiento (registros/s y bases/s, mejor de las repeticiones), los
+    percentiles de latencia por registro y el pico de memoria (medido con tracemalloc en una pasada aparte,
+    para no distorsionar los tiempos). Los resultados se guardan en JSON y se comparan con una línea base.
     """
-    def __init__(self, registrador: RegistradorSecuencias):  
-        self.registrador = registrador
-        self.complementos = {'A': 'T', 'T': 'A', 'C': 'G', 'G': 'C'}
+    ETAPAS = ('limpiar_adn', 'validar_adn', 'transcribir_adn', 'normalizar_adn', 'traducir_arn',
+              'analizar_longitud_proteina', 'save_results_to_csv', 'extremo_a_extremo')
 
-    def limpiar_adn(self, adn: str) -> str:
-        """
-        Elimina el formato 3' 5' y convierte la secuencia de ADN a mayúsculas.
-        """
-        adn_limpio = adn.replace("5'-","").replace("-3'","").upper()
-        self.registrador.registrar_info(f"ADN limpiado: '{adn}' -> '{adn_limpio}'")
-        return adn_limpio
+    def __init__(self, numero_secuencias: int = 2000, repeticiones: int = 3, semilla: int = 42):
+        self.numero_secuencias = numero_secuencias
+        self.repeticiones = repeticiones
+        self.generador = GeneradorSecuenciasSinteticas(semilla)
+        # Registrador aislado: formatea como en modo lote (WARNING) pero descarta los mensajes
+        registrador_benchmark = logging.getLogger('simulador_biologico_benchmark')
+        registrador_benchmark.propagate = False
+        registrador_benchmark.setLevel(logging.WARNING)
+        if not registrador_benchmark.handlers:
+            registrador_benchmark.addHandler(logging.NullHandler())
+        self.registrador = RegistradorSecuencias('simulador_biologico_benchmark', reportador=None)
+        self.gestor_adn = GestorADN(self.registrador, mostrar_avisos=False)
+        self.analizador_proteinas = AnalizadorProteinas(self.registrador, mostrar_avisos=False)
 
-    def transcribir_adn(self, adn: str) -> str:
-        """
-        Cambia las secuencias de ADN a ARN (reemplazando T por U).
-        """
-        arn = adn.replace('T','U')
-        self.registrador.registrar_info(f"ADN transcrito a ARN: '{adn}' -> '{arn}'")
-        return arn
+    def _preparar_etapas(self, secuencias, directorio):
+        gestor, analizador = self.gestor_adn, self.analizador_proteinas
+        limpias = [gestor.limpiar_adn(secuencia) for secuencia in secuencias]
+        validas = [adn for adn in limpias if gestor.validar_adn(adn)]
+        arns = [gestor.transcribir_adn(adn) for adn in validas]
+        proteinas = [analizador.traducir_arn(arn) for arn in arns]
+        filas = list(zip(validas, validas, arns, proteinas))
+        procesador = ProcesadorLotes(gestor, analizador, self.registrador)
+        ruta_csv = os.path.join(directorio, 'benchmark.csv')
 
-    def validar_adn(self, adn: str) -> bool:
+        def guardar_resultados(fila):
+            analizador.save_results_to_csv(*fila, nombre_archivo=ruta_csv)
+
+        def extremo_a_extremo(secuencia):
+            fila = procesador.procesar_registro(secuencia)
+            if fila is not None:
+                analizador.save_results_to_csv(*fila[:4], nombre_archivo=ruta_csv)
+
+        return {
+            'limpiar_adn': (gestor.limpiar_adn, secuencias),
+            'validar_adn': (gestor.validar_adn, limpias),
+            'transcribir_adn': (gestor.transcribir_adn, validas),
+            'normalizar_adn': (gestor.normalizar_adn, secuencias),
+            'traducir_arn': (analizador.traducir_arn, arns),
+            'analizar_longitud_proteina': (analizador.analizar_longitud_proteina, proteinas),
+            'save_results_to_csv': (guardar_resultados, filas),
+            'extremo_a_extremo': (extremo_a_extremo, secuencias),
+        }
+
+    def _medir(self, funcion, entradas):
+        latencias = np.empty(len(entradas), dtype=np.int64)
+        reloj = time.perf_counter_ns
+        inicio = reloj()
+        for indice, entrada in enumerate(entradas):
+            antes = reloj()
+            funcion(entrada)
+            latencias[indice] = reloj() - antes
+        self.analizador_proteinas.vaciar_resultados()
+        return (reloj() - inicio) / 1e9, latencias
+
+    def _medir_memoria(self, funcion, entradas):
+        tracemalloc.start()
+        try:
+            for entrada in entradas:
+                funcion(entrada)
+            self.analizador_proteinas.vaciar_resultados()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def ejecutar(self, cargas=None) -> dict:
+        """Ejecuta las cargas indicadas (todas por defecto) y devuelve el diccionario de resultados."""
+        resultados = {}
+        with tempfile.TemporaryDirectory() as directorio:
+            for carga in cargas or GeneradorSecuenciasSinteticas.CARGAS:
+                secuencias = self.generador.generar(carga, self.numero_secuencias)
+                resultados[carga] = {}
+                for etapa, (funcion, entradas) in self._preparar_etapas(secuencias, directorio).items():
+                    bases = sum(len(entrada) if isinstance(entrada, str) else len(entrada[0]) for entrada in entradas)
+                    mejor_segundos, mejores_latencias = math.inf, None
+                    for _ in range(self.repeticiones):
+                        segundos, latencias = self._medir(funcion, entradas)
+                        if segundos < mejor_segundos:
+                            mejor_segundos, mejores_latencias = segundos, latencias
+                    p50, p95, p99 = (np.percentile(mejores_latencias, [50, 95, 99]) / 1000.0).tolist() if len(entradas) else (0.0, 0.0, 0.0)
+                    resultados[carga][etapa] = {
+                        'registros': len(entradas),
+                        'bases': bases,
+                        'segundos': mejor_segundos,
+                        'registros_por_segundo': len(entradas) / mejor_segundos if mejor_segundos > 0 else 0.0,
+                        'bases_por_segundo': bases / mejor_segundos if mejor_segundos > 0 else 0.0,
+                        'latencia_p50_us': p50,
+                        'latencia_p95_us': p95,
+                        'latencia_p99_us': p99,
+                        'memoria_pico_bytes': self._medir_memoria(funcion, entradas),
+                    }
+        return {
+            'metadatos': {
+                'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'plataforma': platform.platform(),
+                'semilla': self.generador.semilla,
+                'numero_secuencias': self.numero_secuencias,
+                'repeticiones': self.repeticiones,
+            },
+            'resultados': resultados,
+        }
+
+    @staticmethod
+    def guardar(resultados: dict, ruta_archivo: str):
+        with open(ruta_archivo, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    @staticmethod
+    def cargar(ruta_archivo: str) -> dict:
+        with open(ruta_archivo, encoding='utf-8') as archivo:
+            return json.load(archivo)
+
+    @staticmethod
+    def comparar(resultados: dict, linea_base: dict, umbral: float = 0.10) -> list:
         """
-        Verifica que la secuencia de ADN solo contenga caracteres válidos (A, T, C, G).
+        Compara el rendimiento (registros/s) con una línea base. Devuelve la lista de regresiones:
+        etapas cuyo rendimiento cae más de umbral (0.10 = 10 %) respecto a la línea base.
         """
-        bases_invalidas = [base for base in adn if base not in "ATCG"]
-        if bases_invalidas:
-            self.registrador.registrar_advertencia(f"Validación de ADN fallida: '{adn}' contiene caracteres inválidos: {', '.join(set(bases_invalidas))}.")
-            return False
-        self.registrador.registrar_info(f"Validación de ADN exitosa para: '{adn}'")
-        return True
+        regresiones = []
+        for carga, etapas in resultados['resultados'].items():
+            for etapa, medida in etapas.items():
+                base = linea_base.get('resultados', {}).get(carga, {}).get(etapa)
+                if not base or not base['registros_por_segundo']:
+                    continue
+                cambio = medida['registros_por_segundo'] / base['registros_por_segundo'] - 1.0
+                if cambio < -umbral:
+                    regresiones.append({'carga': carga, 'etapa': etapa, 'linea_base': base['registros_por_segundo'],
+                                        'actual': medida['registros_por_segundo'], 'cambio': cambio})
+        return regresiones
 
-    def obtener_cadena_complementaria(self, adn: str) -> str:
+
+def main_benchmark(argumentos):
+    """
+    Punto de entrada: python main.py benchmark [--salida resultados.json] [--linea-base base.json] [--umbral 0.1]
+    Devuelve 1 si hay regresiones respecto a la línea base.
+    """
+    analizador_argumentos = argparse.ArgumentParser(prog='python main.py benchmark', description="Mide el rendimiento del pipeline con cargas sintéticas.")
+    analizador_argumentos.add_argument('--secuencias', type=int, default=2000, help="Secuencias por carga.")
+    analizador_argumentos.add_argument('--repeticiones', type=int, default=3, help="Repeticiones por etapa (se toma la mejor).")
+    analizador_argumentos.add_argument('--semilla', type=int, default=42)
+    analizador_argumentos.add_argument('--cargas', nargs='+', choices=GeneradorSecuenciasSinteticas.CARGAS, help="Cargas a ejecutar (todas por defecto).")
+    analizador_argumentos.add_argument('--salida', default='benchmark.json', help="Archivo JSON de resultados.")
+    analizador_argumentos.add_argument('--linea-base', help="JSON de una ejecución anterior con el que comparar.")
+    analizador_argumentos.add_argument('--umbral', type=float, default=0.10, help="Caída de rendimiento tolerada (0.10 = 10 %%).")
+    opciones = analizador_argumentos.parse_args(argumentos)
+    inicializar_entorno(usar_sentry=False) # Las mediciones no deben enviar eventos a Sentry
+
+    suite = SuiteBenchmark(opciones.secuencias, opciones.repeticiones, opciones.semilla)
+    resultados = suite.ejecutar(opciones.cargas)
+    SuiteBenchmark.guardar(resultados, opciones.salida)
+
+    print("\n--- Resultados del Benchmark ---")
+    for carga, etapas in resultados['resultados'].items():
+        print(f"\n{carga}:")
+        for etapa, medida in etapas.items():
+            print(f"  {etapa:<28} {medida['registros_por_segundo']:>12.1f} reg/s {medida['bases_por_segundo']:>14.1f} bases/s"
+                  f"  p50 {medida['latencia_p50_us']:.1f} us  p99 {medida['latencia_p99_us']:.1f} us  pico {medida['memoria_pico_bytes'] / 1024:.0f} KiB")
+    print(f"\nResultados guardados en '{opciones.salida}'.")
+
+    if opciones.linea_base:
+        regresiones = SuiteBenchmark.comparar(resultados, SuiteBenchmark.cargar(opciones.linea_base), opciones.umbral)
+        if regresiones:
+            print(f"\nSe detectaron {len(regresiones)} regresiones (umbral {opciones.umbral:.0%}):")
+            for regresion in regresiones:
+                print(f"  - {regresion['carga']}/{regresion['etapa']}: {regresion['linea_base']:.1f} -> {regresion['actual']:.1f} reg/s ({regresion['cambio']:+.1%})")
+            return 1
+        print(f"\nSin regresiones respecto a '{opciones.linea_base}' (umbral {opciones.umbral:.0%}).")
+    return 0
+
+# --- Servicio asíncrono (HTTP) ---
+# asyncio se importa dentro de las funciones del servicio para no alargar el arranque de la CLI
+class _AgrupadorLotes:
+    """
+    Junta en micro-lotes las secuencias de peticiones concurrentes: espera hasta espera segundos a que se
+    acumulen tamano_maximo secuencias y entrega el lote a procesar_lote (corrutina que devuelve una fila
+    por registro). Como mucho hay lotes_en_vuelo lotes procesándose a la vez.
+    """
+    def __init__(self, procesar_lote, tamano_maximo: int = 256, espera: float = 0.002, lotes_en_vuelo: int = 1):
+        import asyncio
+        self.procesar_lote = procesar_lote
+        self.tamano_maximo = tamano_maximo
+        self.espera = espera
+        self._pendientes = []
+        self._hay_pendientes = asyncio.Event()
+        self._huecos = asyncio.Semaphore(lotes_en_vuelo)
+        self._tareas = set()
+
+    @property
+    def pendientes(self) -> int:
+        return len(self._pendientes)
+
+    async def enviar(self, registros) -> list:
+        """Encola los registros (identificador, secuencia) y espera sus filas de resultados."""
+        import asyncio
+        bucle = asyncio.get_running_loop()
+        futuros = []
+        for registro in registros:
+            futuro = bucle.create_future()
+            self._pendientes.append((registro, futuro))
+            futuros.append(futuro)
+        self._hay_pendientes.set()
+        return await asyncio.gather(*futuros)
+
+    async def ejecutar(self):
+        import asyncio
+        while True:
+            await self._hay_pendientes.wait()
+            if len(self._pendientes) < self.tamano_maximo:
+                await asyncio.sleep(self.espera) # Da tiempo a que lleguen más peticiones
+            await self._huecos.acquire()
+            lote, self._pendientes = self._pendientes[:self.tamano_maximo], self._pendientes[self.tamano_maximo:]
+            if not self._pendientes:
+                self._hay_pendientes.clear()
+            # Las peticiones que ya vencieron (tiempo límite) no se procesan
+            lote = [(registro, futuro) for registro, futuro in lote if not futuro.done()]
+            if not lote:
+                self._huecos.release()
+                continue
+            tarea = asyncio.ensure_future(self._procesar(lote))
+            self._tareas.add(tarea)
+            tarea.add_done_callback(self._tareas.discard)
+
+    async def cerrar(self):
         """
-        Genera la cadena de ADN complementaria (A-T, C-G).
+        Se llama tras cancelar ejecutar(): procesa los registros que aún esperaban lote y aguarda a los lotes en vuelo,
+        de modo que ninguna petición aceptada se queda sin respuesta ni llega a ejecutores ya cerrados.
         """
-        if not self.validar_adn(adn):
-            self.registrador.registrar_error(f"No se pudo obtener la cadena complementaria: ADN inválido '{adn}'.")
-            return ""
-        
-        cadena_complementaria = "".join([self.complementos.get(base, '?') for base in adn])
-        if '?' in cadena_complementaria:
-            self.registrador.registrar_advertencia(f"Se encontraron bases desconocidas al generar la cadena complementaria para '{adn}'.")
-            print(f"Advertencia: Se encontraron bases desconocidas al generar la cadena complementaria para '{adn}'.")
+        import asyncio
+        while self._pendientes:
+            lote, self._pendientes = self._pendientes[:self.tamano_maximo], self._pendientes[self.tamano_maximo:]
+            lote = [(registro, futuro) for registro, futuro in lote if not futuro.done()]
+            if lote:
+                await self._huecos.acquire()
+                await self._procesar(lote)
+        self._hay_pendientes.clear()
+        if self._tareas:
+            await asyncio.gather(*list(self._tareas), return_exceptions=True)
 
-        self.registrador.registrar_info(f"Cadena complementaria de '{adn}' es '{cadena_complementaria}'")
-        return cadena_complementaria
+    async def _procesar(self, lote):
+        try:
+            filas = await self.procesar_lote([registro for registro, _ in lote])
+            for (_, futuro), fila in zip(lote, filas):
+                if not futuro.done():
+                    futuro.set_result(fila)
+        except Exception as e:
+            for _, futuro in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+        finally:
+            self._huecos.release()
 
-class AnalizadorProteinas:
+
+class ServicioSecuencias:
     """
-    Maneja la traducción de ARN a proteína y el análisis de la secuencia de proteínas.
+    Servicio de larga duración que procesa secuencias por HTTP (TCP o socket Unix) con el mismo pipeline que
+    ProcesadorLotes. Mantiene el estado en caliente (tablas de codones, caché de traducciones, escritor de
+    resultados abierto) y agrupa las secuencias de peticiones concurrentes en micro-lotes que se procesan
+    fuera del bucle de eventos: en un hilo (trabajadores=0) o en un pool de procesos (trabajadores>0).
+    Rutas:
+        POST /procesar  {"secuencia": "ATG..."} o {"secuencias": ["ATG...", {"id": "r1", "secuencia": "..."}]}
+        GET  /salud     estado del servicio
+        GET  /metricas  métricas en formato de texto de Prometheus
+        GET  /buscar    ?adn=...|proteina=...|motivo=...|minimo=&maximo=  [&limite=N] (con indexar=True)
     """
-    def __init__(self, registrador: RegistradorSecuencias):  
+    def __init__(self, registrador: RegistradorSecuencias, trabajadores: int = 0, tamano_lote: int = 256, espera_lote: float = 0.002,
+                 max_concurrencia: int = 64, tiempo_limite: float = 10.0, max_bytes_peticion: int = 16 * 1024 * 1024,
+                 presupuesto_cache_bytes: int = 64 * 1024 * 1024, ruta_resultados: str = None, intervalo_vaciado: float = 5.0,
+                 indexar: bool = False):
         self.registrador = registrador
+        self.trabajadores = trabajadores
+        self.tamano_lote = tamano_lote
+        self.espera_lote = espera_lote
+        self.max_concurrencia = max_concurrencia
+        self.tiempo_limite = tiempo_limite
+        self.max_bytes_peticion = max_bytes_peticion
+        self.presupuesto_cache_bytes = presupuesto_cache_bytes
+        self.intervalo_vaciado = intervalo_vaciado
+        self.metricas = RegistroMetricas()
+        # Con indexar, las filas escritas se indexan al vaciar cada bloque y se pueden consultar en /buscar
+        self.indice = IndiceResultados(ruta_resultados) if ruta_resultados and indexar else None
+        self.escritor = EscritorResultados(ruta_resultados, indice=self.indice) if ruta_resultados else None
+        self.procesador = None
+        self._tareas = []
 
-    def traducir_arn(self, arn: str) -> str:
-        """
-        Traduce la secuencia de ARN en una secuencia de proteínas usando la tabla de codones.
-        También detecta y cuenta codones desconocidos, reportando anomalías.
-        """
-        proteina = ""
-        conteo_codones_desconocidos = 0
-        
-        if len(arn) % 3 != 0:
-            mensaje = f"La secuencia de ARN '{arn}' (longitud {len(arn)}) no es un múltiplo de 3. Se truncarán los últimos nucleótidos."
-            self.registrador.registrar_advertencia(mensaje)
-            print(f"Advertencia: {mensaje}")
-            
-        for i in range(0, len(arn) -2, 3):
-            codon = arn[i:i+3]
-            aminoacido = tabla_codones.get(codon, '?')
-            if aminoacido == '?':
-                conteo_codones_desconocidos += 1
-            
-            if aminoacido == 'STOP':
-                self.registrador.registrar_info(f"Codón de parada 'STOP' encontrado en '{arn}' en posición {i}. Traducción terminada.")
-                break
-            proteina += aminoacido
-        
-        if conteo_codones_desconocidos > 0: 
-            mensaje_usuario = f"¡Anomalía detectada! Se encontraron {conteo_codones_desconocidos} codones desconocidos en la secuencia de ARN. Esto podría indicar un error o una mutación."
-            self.registrador.registrar_advertencia(f"Anomalía: {conteo_codones_desconocidos} codones desconocidos encontrados en la secuencia de ARN '{arn}'.")
-            print(mensaje_usuario)
-            if SENTRY_DSN:
-                sentry_sdk.capture_message(
-                    f"Anomalía Biológica: Alta cantidad de codones desconocidos ({conteo_codones_desconocidos})",
-                    level='warning',
-                    tags={"tipo_anomalia": "codones_desconocidos", "longitud_arn": len(arn), "conteo_desconocidos": conteo_codones_desconocidos},
-                    extras={"secuencia_arn": arn, "proteina_traducida": proteina}
-                )
-
-        self.registrador.registrar_info(f"ARN '{arn}' traducido a proteína: '{proteina}'")
-        return proteina
+    async def iniciar(self):
+        """Crea los ejecutores, el agrupador de lotes y las tareas en segundo plano."""
+        import asyncio
+        if self.trabajadores:
+            self._cola_registro = multiprocessing.Queue()
+            self._escuchador = logging.handlers.QueueListener(self._cola_registro, _ReenvioRegistro())
+            self._escuchador.start()
+            nivel_registro = logging.getLogger('simulador_biologico').getEffectiveLevel()
+            self._ejecutor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.trabajadores, initializer=_inicializar_trabajador,
+                initargs=(self._cola_registro, nivel_registro, 'auto', self.presupuesto_cache_bytes, False,
+                          self.registrador.reportador is not None))
+            # Los procesos se crean con fork en el primer envío: se fuerzan ahora, antes de abrir el socket de escucha,
+            # para que no hereden el socket ni las conexiones de clientes (que quedarían abiertas al cerrarlas aquí)
+            bucle = asyncio.get_running_loop()
+            await asyncio.gather(*(bucle.run_in_executor(self._ejecutor, os.getpid) for _ in range(self.trabajadores)))
+        else:
+            # Un solo hilo: el pipeline es CPU puro, así que más hilos no ganarían nada por el GIL
+            self.procesador = ProcesadorLotes(GestorADN(self.registrador, mostrar_avisos=False),
+                                              AnalizadorProteinas(self.registrador, mostrar_avisos=False), self.registrador,
+                                              cache=CacheTraducciones(self.presupuesto_cache_bytes) if self.presupuesto_cache_bytes else None)
+            self._ejecutor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='servicio-pipeline')
+        # La escritura de resultados va en su propio hilo, en orden, sin bloquear el bucle de eventos
+        self._ejecutor_escritura = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='servicio-escritura')
+        self._limite_concurrencia = asyncio.Semaphore(self.max_concurrencia)
+        self.agrupador = _AgrupadorLotes(self._procesar_lote, self.tamano_lote, self.espera_lote, max(1, self.trabajadores))
+        self._tareas = [asyncio.ensure_future(self.agrupador.ejecutar())]
+        if self.escritor is not None and self.intervalo_vaciado:
+            self._tareas.append(asyncio.ensure_future(self._vaciar_periodicamente()))
 
-    def analizar_longitud_proteina(self, secuencia_proteina: str) -> int:
+    async def detener(self):
         """
-        Calcula y registra la longitud de la secuencia de proteínas.
-        También monitorea anomalías en la longitud de las proteínas (demasiado cortas/largas).
+        Cancela las tareas en segundo plano, termina los micro-lotes pendientes y en vuelo, y solo entonces
+        cierra los ejecutores y el escritor de resultados.
         """
-        longitud = len(secuencia_proteina)
-        self.registrador.registrar_info(f"Longitud de la proteína '{secuencia_proteina}': {longitud} aminoácidos.")
-        
-        if longitud < MIN_LONGITUD_PROTEINA_FUNCIONAL and longitud > 0:
-            mensaje_usuario = f"¡Anomalía detectada! Proteína inusualmente corta ({longitud} aminoácidos). Esto podría afectar su función."
-            self.registrador.registrar_advertencia(f"Anomalía: Proteína inusualmente corta detectada ({longitud} aminoácidos): '{secuencia_proteina}'.")
-            print(mensaje_usuario)
-            if SENTRY_DSN:
-                sentry_sdk.capture_message(
-                    f"Anomalía Biológica: Proteína inusualmente corta ({longitud} aa)",
-                    level='warning',
-                    tags={"tipo_anomalia": "proteina_corta", "longitud_proteina": longitud},
-                    extras={"secuencia_proteina": secuencia_proteina}
-                )
-        elif longitud > MAX_LONGITUD_PROTEINA_FUNCIONAL:
-            mensaje_usuario = f"¡Anomalía detectada! Proteína inusualmente larga ({longitud} aminoácidos). Esto podría ser un error de traducción."
-            self.registrador.registrar_advertencia(f"Anomalía: Proteína inusualmente larga detectada ({longitud} aminoácidos): '{secuencia_proteina}'.")
-            print(mensaje_usuario)
-            if SENTRY_DSN:
-                sentry_sdk.capture_message(
-                    f"Anomalía Biológica: Proteína inusualmente larga ({longitud} aa)",
-                    level='warning',
-                    tags={"tipo_anomalia": "proteina_larga", "longitud_proteina": longitud},
-                    extras={"secuencia_proteina": secuencia_proteina}
-                )
-        
-        return longitud
+        import asyncio
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        await self.agrupador.cerrar()
+        self._ejecutor.shutdown(wait=True)
+        if self.escritor is not None:
+            self._ejecutor_escritura.submit(self.escritor.cerrar)
+        if self.indice is not None:
+            self._ejecutor_escritura.submit(self.indice.cerrar)
+        self._ejecutor_escritura.shutdown(wait=True)
+        if self.trabajadores:
+            self._escuchador.stop()
 
-    def analizar_frecuencia_aminoacidos(self, secuencia_proteina: str):
-        """
-        Calcula y muestra la frecuencia de cada aminoácido en una secuencia de proteína.
-        """
-        if not secuencia_proteina:
-            print("No hay proteína para analizar la frecuencia de aminoácidos.")
-            return
+    def _procesar_lote_local(self, lote):
+        # Las secuencias del micro-lote se traducen juntas, en una sola pasada vectorizada
+        return self.procesador.procesar_registros([secuencia for _, secuencia in lote])
 
-        frecuencia = Counter(secuencia_proteina)
-        total_aminoacidos = len(secuencia_proteina)
-        
-        print("\n--- Frecuencia de Aminoácidos ---")
-        for aminoacido, conteo in frecuencia.most_common():
-            porcentaje = (conteo / total_aminoacidos) * 100
-            print(f"  {aminoacido}: {conteo} ({porcentaje:.2f}%)")
-        self.registrador.registrar_info(f"Análisis de frecuencia de aminoácidos completado para proteína de longitud {total_aminoacidos}.")
+    async def _procesar_lote(self, lote):
+        import asyncio
+        bucle = asyncio.get_running_loop()
+        if self.trabajadores:
+            filas, _, _, _, _, telemetria = await bucle.run_in_executor(self._ejecutor, _procesar_bloque_trabajador, lote)
+            if telemetria:
+                self.registrador.reportador.incorporar(telemetria)
+        else:
+            filas = await bucle.run_in_executor(self._ejecutor, self._procesar_lote_local, lote)
+        validas = [fila for fila in filas if fila is not None]
+        self.metricas.incrementar('lotes_total')
+        self.metricas.incrementar('secuencias_procesadas_total', len(validas), {'resultado': 'valido'})
+        self.metricas.incrementar('secuencias_procesadas_total', len(filas) - len(validas), {'resultado': 'invalido'})
+        if self.escritor is not None and validas:
+            self._ejecutor_escritura.submit(self.escritor.agregar_filas, validas)
+        return filas
 
-    def save_results_to_csv(self, adn_original: str, adn_limpio: str, secuencia_arn: str, proteina_secuencia: str, nombre_archivo='datos_adn.csv'):
+    async def _vaciar_periodicamente(self):
+        import asyncio
+        while True:
+            await asyncio.sleep(self.intervalo_vaciado)
+            self._ejecutor_escritura.submit(self.escritor.vaciar)
+
+    async def procesar(self, registros) -> list:
         """
-        Guarda los resultados del procesamiento en un archivo CSV.
+        Procesa registros (identificador, secuencia) con límite de concurrencia y tiempo límite.
+        Devuelve un diccionario de resultados por registro (ver registro_resultado).
         """
-        datos = {
-            'ADN_Original': [adn_original],
-            'ADN_Limpio': [adn_limpio],
-            'ARN_Secuencia': [secuencia_arn],
-            'Proteina_Secuencia': [proteina_secuencia],
-            'Longitud_Proteina': [len(proteina_secuencia)]
-        }
-        df = pd.DataFrame(datos)
+        import asyncio
 
-        if os.path.exists(nombre_archivo):
-            df.to_csv(nombre_archivo, mode='a', header=False, index=False)
-            self.registrador.registrar_info(f"Resultados añadidos a '{nombre_archivo}'.")
+        async def procesar_con_limite():
+            async with self._limite_concurrencia:
+                return await self.agrupador.enviar(registros)
+        filas = await asyncio.wait_for(procesar_con_limite(), self.tiempo_limite)
+        return [registro_resultado(identificador, secuencia, fila) for (identificador, secuencia), fila in zip(registros, filas)]
+
+    @staticmethod
+    def _leer_registros_peticion(cuerpo: bytes):
+        datos = json.loads(cuerpo.decode('utf-8'))
+        if not isinstance(datos, dict):
+            raise ValueError("El cuerpo debe ser un objeto JSON.")
+        if 'secuencia' in datos:
+            elementos = [datos['secuencia']]
+        elif isinstance(datos.get('secuencias'), list):
+            elementos = datos['secuencias']
         else:
-            df.to_csv(nombre_archivo, mode='w', header=True, index=False)
-            self.registrador.registrar_info(f"Archivo '{nombre_archivo}' creado y resultados guardados.")
+            raise ValueError("Se esperaba 'secuencia' o una lista 'secuencias'.")
+        registros = []
+        for indice, elemento in enumerate(elementos, start=1):
+            if isinstance(elemento, dict):
+                elemento, identificador = elemento.get('secuencia'), str(elemento.get('id', indice))
+            else:
+                identificador = str(indice)
+            if not isinstance(elemento, str):
+                raise ValueError(f"La secuencia {identificador} no es una cadena de texto.")
+            registros.append((identificador, elemento))
+        return registros
 
-    def cargar_y_analizar_datos(self, nombre_archivo='datos_adn.csv'):
-        """
-        Carga datos desde un CSV y realiza un análisis básico con pandas, presentando los resultados claramente.
-        """
-        if not os.path.exists(nombre_archivo):
-            self.registrador.registrar_advertencia(f"El archivo '{nombre_archivo}' no existe para análisis.")
-            print(f"\nNo se pudo encontrar el archivo '{nombre_archivo}' para análisis de datos. Por favor, procese algunas secuencias primero.")
-            return
+    async def _despachar(self, metodo: str, ruta: str, cuerpo: bytes):
+        """Devuelve (código HTTP, contenido, tipo de contenido) para una petición."""
+        import asyncio
+        ruta, _, consulta = ruta.partition('?')
+        if ruta == '/procesar':
+            if metodo != 'POST':
+                return 405, {'error': "Use POST."}, None
+            try:
+                registros = self._leer_registros_peticion(cuerpo)
+            except (ValueError, UnicodeDecodeError) as e:
+                return 400, {'error': str(e)}, None
+            try:
+                return 200, {'resultados': await self.procesar(registros)}, None
+            except asyncio.TimeoutError:
+                self.registrador.registrar_advertencia("Petición de %d secuencias cancelada por tiempo límite (%.1f s).", len(registros), self.tiempo_limite)
+                return 504, {'error': f"Tiempo límite de {self.tiempo_limite} s superado."}, None
+        if ruta == '/salud' and metodo == 'GET':
+            estado = {'estado': 'ok', 'pendientes': self.agrupador.pendientes, 'trabajadores': self.trabajadores}
+            if self.procesador is not None and self.procesador.cache is not None:
+                estado['cache'] = self.procesador.cache.estadisticas()
+            return 200, estado, None
+        if ruta == '/metricas' and metodo == 'GET':
+            return 200, self.metricas.a_prometheus(), 'text/plain; version=0.0.4'
+        if ruta == '/buscar' and metodo == 'GET':
+            if self.indice is None:
+                return 404, {'error': "El servicio no mantiene un índice (use --resultados con --indexar)."}, None
+            from urllib.parse import parse_qs
+            parametros = {clave: valores[-1] for clave, valores in parse_qs(consulta).items()}
+            try:
+                filas = await asyncio.get_running_loop().run_in_executor(self._ejecutor_escritura, consultar_indice, self.indice, parametros)
+            except ValueError as e:
+                return 400, {'error': str(e)}, None
+            return 200, {'resultados': filas}, None
+        return 404, {'error': f"Ruta desconocida: {metodo} {ruta}"}, None
 
+    async def _atender_conexion(self, lector, escritor):
+        """Atiende una conexión HTTP/1.1 (con keep-alive) leyendo peticiones con Content-Length."""
+        import asyncio
         try:
-            df = pd.read_csv(nombre_archivo)
-            self.registrador.registrar_info(f"Datos cargados desde '{nombre_archivo}'.")
+            while True:
+                try:
+                    linea = await asyncio.wait_for(lector.readline(), 60.0) # Conexiones inactivas se cierran
+                except asyncio.TimeoutError:
+                    break
+                if not linea:
+                    break
+                inicio = time.perf_counter_ns()
+                try:
+                    metodo, ruta, version = linea.decode('latin-1').split()
+                except ValueError:
+                    await self._responder(escritor, 400, {'error': "Línea de petición mal formada."}, None, False)
+                    break
+                cabeceras = {}
+                while True:
+                    linea = await lector.readline()
+                    if linea in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = linea.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                longitud = int(cabeceras.get('content-length', 0) or 0)
+                if longitud > self.max_bytes_peticion:
+                    await self._responder(escritor, 413, {'error': f"La petición supera {self.max_bytes_peticion} bytes."}, None, False)
+                    break
+                if longitud and cabeceras.get('expect', '').lower() == '100-continue':
+                    # El cliente (p. ej. curl con cuerpos grandes) espera permiso antes de enviar el cuerpo
+                    escritor.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+                    await escritor.drain()
+                cuerpo = await lector.readexactly(longitud) if longitud else b''
+                mantener = version == 'HTTP/1.1' and cabeceras.get('connection', '').lower() != 'close'
+                try:
+                    codigo, contenido, tipo = await self._despachar(metodo, ruta, cuerpo)
+                except Exception as e:
+                    # Un fallo inesperado (p. ej. BrokenProcessPool) se responde con 500 en lugar de cortar la conexión
+                    self.registrador.registrar_error(f"Error inesperado al atender {metodo} {ruta}: {e}", info_exc=True)
+                    codigo, contenido, tipo = 500, {'error': "Error interno del servidor."}, None
+                await self._responder(escritor, codigo, contenido, tipo, mantener)
+                self.metricas.incrementar('peticiones_total', etiquetas={'ruta': ruta.split('?', 1)[0], 'codigo': str(codigo)})
+                self.metricas.histograma('duracion_peticion_segundos').observar_ns(time.perf_counter_ns() - inicio)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
 
-            print("\n--- Análisis de Datos de Secuencias ---")
-            print(f"Total de secuencias procesadas: {len(df)}")
+    @staticmethod
+    async def _responder(escritor, codigo: int, contenido, tipo: str, mantener: bool):
+        razones = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+                   500: 'Internal Server Error', 504: 'Gateway Timeout'}
+        if tipo is None:
+            cuerpo, tipo = json.dumps(contenido, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8'
+        else:
+            cuerpo = contenido.encode('utf-8')
+        escritor.write(f"HTTP/1.1 {codigo} {razones.get(codigo, '')}\r\nContent-Type: {tipo}\r\nContent-Length: {len(cuerpo)}\r\n"
+                       f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n".encode('latin-1') + cuerpo)
+        await escritor.drain()
 
-            if not df.empty:
-                print("\nEstadísticas de longitud de proteínas:")
-                estadisticas_longitud_proteina = df['Longitud_Proteina'].describe()
-                print(f"  Promedio: {estadisticas_longitud_proteina['mean']:.2f} aminoácidos")
-                print(f"  Mínimo: {estadisticas_longitud_proteina['min']:.0f} aminoácidos")
-                print(f"  Máximo: {estadisticas_longitud_proteina['max']:.0f} aminoácidos")
-                print(f"  Desviación estándar: {estadisticas_longitud_proteina['std']:.2f} aminoácidos")
+    async def abrir_servidor(self, host: str = '127.0.0.1', puerto: int = 8080, ruta_unix: str = None):
+        """Inicia el servicio y devuelve el servidor asyncio (TCP, o socket Unix si se indica ruta_unix)."""
+        import asyncio
+        await self.iniciar()
+        if ruta_unix:
+            return await asyncio.start_unix_server(self._atender_conexion, path=ruta_unix)
+        return await asyncio.start_server(self._atender_conexion, host, puerto)
 
-                
-                print("\n--- Búsqueda de Proteínas Largas (Longitud > 10) ---")
-                long_proteins = df[df['Longitud_Proteina'] > 10]
-                if not long_proteins.empty:
-                    print(f"Se encontraron {len(long_proteins)} secuencias con proteínas de longitud mayor a 10:")
-                    for indice, fila in long_proteins.iterrows():
-                        print(f"  - ADN Original: {fila['ADN_Original']} | Longitud Proteína: {fila['Longitud_Proteina']}")
-                else:
-                    print("No hay proteínas con longitud mayor a 10.")
+    async def servir(self, host: str = '127.0.0.1', puerto: int = 8080, ruta_unix: str = None):
+        """Atiende peticiones hasta recibir SIGINT/SIGTERM; después vacía los resultados y cierra."""
+        import asyncio
+        servidor = await self.abrir_servidor(host, puerto, ruta_unix)
+        detener = asyncio.Event()
+        bucle = asyncio.get_running_loop()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                bucle.add_signal_handler(senal, detener.set)
+            except (NotImplementedError, RuntimeError):
+                pass # Windows: se detiene con KeyboardInterrupt
+        print(f"Servicio escuchando en {ruta_unix or f'http://{host}:{puerto}'} (Ctrl+C para detener).")
+        try:
+            async with servidor:
+                await detener.wait()
+        finally:
+            await self.detener()
+            if ruta_unix and os.path.exists(ruta_unix):
+                os.remove(ruta_unix)
 
-               
-                unique_adn_count = df['ADN_Limpio'].nunique()
-                print(f"\nNúmero de secuencias de ADN limpias únicas: {unique_adn_count}")
 
-               
-               
+def main_servir(argumentos):
+    """
+    Punto de entrada: python main.py servir [--puerto 8080 | --unix /ruta/socket] [--trabajadores N] [--resultados datos_adn.csv]
+    """
+    analizador_argumentos = argparse.ArgumentParser(prog='python main.py servir', description="Servicio HTTP de procesamiento de secuencias.")
+    analizador_argumentos.add_argument('--host', default='127.0.0.1')
+    analizador_argumentos.add_argument('--puerto', type=int, default=8080)
+    analizador_argumentos.add_argument('--unix', metavar='RUTA', help="Escucha en un socket Unix en lugar de TCP.")
+    analizador_argumentos.add_argument('--trabajadores', type=int, default=0, help="Procesos para el pipeline (0 = un hilo del propio servicio).")
+    analizador_argumentos.add_argument('--lote-maximo', type=int, default=256, help="Secuencias por micro-lote.")
+    analizador_argumentos.add_argument('--espera-ms', type=float, default=2.0, help="Espera máxima para completar un micro-lote.")
+    analizador_argumentos.add_argument('--concurrencia', type=int, default=64, help="Peticiones /procesar atendidas a la vez.")
+    analizador_argumentos.add_argument('--tiempo-limite', type=float, default=10.0, help="Segundos por petición antes de responder 504.")
+    analizador_argumentos.add_argument('--cache-mb', type=int, default=64, help="Memoria de la caché de traducciones en MB (por trabajador).")
+    analizador_argumentos.add_argument('--resultados', metavar='RUTA', help="Añade las filas válidas a este archivo de resultados.")
+    analizador_argumentos.add_argument('--indexar', action='store_true', help="Mantiene el índice de --resultados al día y habilita GET /buscar.")
+    opciones = analizador_argumentos.parse_args(argumentos)
+
+    import asyncio
+    inicializar_entorno()
+    configurar_registro_asincrono(nivel=logging.WARNING)
+    servicio = ServicioSecuencias(RegistradorSecuencias(), trabajadores=opciones.trabajadores, tamano_lote=opciones.lote_maximo,
+                                  espera_lote=opciones.espera_ms / 1000.0, max_concurrencia=opciones.concurrencia,
+                                  tiempo_limite=opciones.tiempo_limite, presupuesto_cache_bytes=opciones.cache_mb * 1024 * 1024,
+                                  ruta_resultados=opciones.resultados, indexar=opciones.indexar)
+    try:
+        asyncio.run(servicio.servir(opciones.host, opciones.puerto, opciones.unix))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print("Servicio detenido.")
+    return 0
+
+# --- Interfaz de línea de comandos ---
+def registro_resultado(identificador: str, adn_original: str, fila) -> dict:
+    """Diccionario de salida (CLI y servicio) para una fila de resultados, o para un ADN inválido si fila es None."""
+    if fila is None:
+        return {'id': identificador, 'valido': False, 'ADN_Original': adn_original}
+    return {'id': identificador, 'valido': True, **dict(zip(COLUMNAS_RESULTADOS, fila))}
+
+def _leer_entradas_cli(opciones):
+    """Secuencias de los argumentos o, si no hay, de --entrada (FASTA/FASTQ/texto; '-' = entrada estándar)."""
+    if opciones.secuencias:
+        return ((str(indice), secuencia) for indice, secuencia in enumerate(opciones.secuencias, start=1))
+    return leer_registros_secuencias(opciones.entrada)
+
+class _SalidaCLI:
+    """
+    Escribe los resultados de un subcomando en la salida estándar o en un archivo:
+    'json' produce JSON Lines (un objeto por registro) y 'tsv' una tabla con cabecera.
+    """
+    def __init__(self, ruta_archivo: str, formato: str, columnas):
+        self.formato = formato
+        self.columnas = columnas
+        self._archivo = sys.stdout if ruta_archivo == '-' else open(ruta_archivo, 'w', encoding='utf-8', newline='')
+        if formato == 'tsv':
+            self._escritor = csv.writer(self._archivo, delimiter='\t', lineterminator='\n')
+            self._escritor.writerow(columnas)
+
+    def escribir(self, registro: dict):
+        if self.formato == 'json':
+            self._archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        else:
+            self._escritor.writerow([registro.get(columna, '') for columna in self.columnas])
+
+    def cerrar(self):
+        if self._archivo is sys.stdout:
+            self._archivo.flush()
+        else:
+            self._archivo.close()
+
+    def __enter__(self):
+        return self
 
+    def __exit__(self, tipo_exc, valor_exc, traza):
+        self.cerrar()
+        return False
+
+
+def _comando_procesar(opciones, registrador):
+    """Opción 1 del menú: limpia, valida, transcribe y traduce cada secuencia."""
+    procesador = ProcesadorLotes(GestorADN(registrador, mostrar_avisos=False), AnalizadorProteinas(registrador, mostrar_avisos=False), registrador)
+    invalidos = 0
+    escritor = EscritorResultados(opciones.resultados) if opciones.resultados else None
+    try:
+        with _SalidaCLI(opciones.salida, opciones.formato, ['id', 'valido'] + COLUMNAS_RESULTADOS) as salida:
+            for identificador, secuencia in _leer_entradas_cli(opciones):
+                fila = procesador.procesar_registro(secuencia)
+                salida.escribir(registro_resultado(identificador, secuencia, fila))
+                if fila is None:
+                    invalidos += 1
+                    continue
+                if escritor is not None:
+                    escritor.agregar(fila)
+    finally:
+        if escritor is not None:
+            escritor.cerrar()
+    return 1 if invalidos else 0
+
+def _comando_complementaria(opciones, registrador):
+    """Opción 3 del menú: cadena complementaria (o complementaria inversa con --inversa) de cada secuencia."""
+    gestor_adn = GestorADN(registrador, mostrar_avisos=False)
+    invalidos = 0
+    with _SalidaCLI(opciones.salida, opciones.formato, ['id', 'valido', 'ADN_Original', 'ADN_Limpio', 'ADN_Complementario']) as salida:
+        for identificador, secuencia in _leer_entradas_cli(opciones):
+            if opciones.inversa:
+                normalizado = gestor_adn.normalizar_adn(secuencia, complementaria_inversa=True)
+                adn_limpio, complementaria = normalizado['adn_limpio'], normalizado['complementaria_inversa'] if normalizado['valido'] else ""
             else:
-                print("\nEl archivo de datos está vacío. No hay estadísticas para mostrar.")
+                adn_limpio = gestor_adn.limpiar_adn(secuencia)
+                complementaria = gestor_adn.obtener_cadena_complementaria(adn_limpio)
+            registro = {'id': identificador, 'valido': bool(complementaria), 'ADN_Original': secuencia, 'ADN_Limpio': adn_limpio}
+            if complementaria:
+                registro['ADN_Complementario'] = complementaria
+            else:
+                invalidos += 1
+            salida.escribir(registro)
+    return 1 if invalidos else 0
 
-            print("--- Fin del Análisis ---")
-            self.registrador.registrar_info("Análisis de datos con pandas completado.")
+def _comando_frecuencia(opciones, registrador):
+    """Opción 4 del menú: frecuencia de aminoácidos de cada proteína."""
+    with _SalidaCLI(opciones.salida, opciones.formato, ['id', 'Aminoacido', 'Conteo', 'Porcentaje']) as salida:
+        for identificador, proteina in _leer_entradas_cli(opciones):
+            proteina = proteina.strip().upper()
+            frecuencias = AnalizadorProteinas.calcular_frecuencia_aminoacidos(proteina) if proteina else []
+            if opciones.formato == 'json':
+                salida.escribir({'id': identificador, 'Proteina_Secuencia': proteina, 'Longitud': len(proteina),
+                                 'Frecuencias': [{'Aminoacido': aminoacido, 'Conteo': conteo, 'Porcentaje': porcentaje}
+                                                 for aminoacido, conteo, porcentaje in frecuencias]})
+            else:
+                for aminoacido, conteo, porcentaje in frecuencias:
+                    salida.escribir({'id': identificador, 'Aminoacido': aminoacido, 'Conteo': conteo, 'Porcentaje': f"{porcentaje:.4f}"})
+    return 0
 
-        except pd.errors.EmptyDataError:
-            self.registrador.registrar_error(f"El archivo '{nombre_archivo}' está vacío.", info_exc=True)
-            print(f"Error: El archivo '{nombre_archivo}' está vacío. No hay datos para analizar.")
-        except Exception as e:
-            self.registrador.registrar_error(f"Error al cargar o analizar el archivo '{nombre_archivo}': {e}", info_exc=True)
-            print(f"Ocurrió un error inesperado al analizar los datos: {e}")
-            if SENTRY_DSN: sentry_sdk.capture_exception()
+def _comando_buscar(opciones, registrador):
+    """Consulta el índice del archivo de resultados (lo crea o lo pone al día si hace falta)."""
+    minimo, maximo = opciones.longitud or (None, None)
+    with IndiceResultados(opciones.archivo) as indice:
+        if opciones.reconstruir:
+            indice.reconstruir()
+        filas = consultar_indice(indice, {'adn': opciones.adn, 'proteina': opciones.proteina, 'motivo': opciones.motivo,
+                                          'minimo': minimo, 'maximo': maximo, 'limite': opciones.limite})
+    with _SalidaCLI(opciones.salida, opciones.formato, COLUMNAS_RESULTADOS) as salida:
+        for fila in filas:
+            salida.escribir(fila)
+    return 0
+
+def _comando_analizar(opciones, registrador):
+    """Opción 2 del menú: estadísticas de un archivo de resultados, como un único objeto JSON."""
+    resumen = resumir_resultados(opciones.archivo, opciones.bloque, opciones.aproximado)
+    with _SalidaCLI(opciones.salida, 'json', None) as salida:
+        salida.escribir(resumen)
+    return 0
+
+
+# Subcomandos con su propio analizador de argumentos: se les pasan los argumentos tal cual
+_COMANDOS_DELEGADOS = {
+    'lote': (main_lote, "Procesa un archivo FASTA/FASTQ completo (ver 'lote --help')."),
+    'benchmark': (main_benchmark, "Mide el rendimiento del pipeline (ver 'benchmark --help')."),
+    'servir': (main_servir, "Inicia el servicio HTTP de procesamiento (ver 'servir --help')."),
+}
+
+def main_cli(argumentos):
+    """
+    Punto de entrada no interactivo: python main.py <subcomando> [opciones]
+    Los subcomandos procesar, analizar, complementaria y frecuencia equivalen a las opciones del menú;
+    leen secuencias de los argumentos, de un archivo o de la entrada estándar y escriben JSON Lines o TSV.
+    Devuelve 0 si todo fue bien y 1 si alguna secuencia era inválida o hubo un error.
+    """
+    if argumentos and argumentos[0] in _COMANDOS_DELEGADOS:
+        return _COMANDOS_DELEGADOS[argumentos[0]][0](argumentos[1:])
+
+    analizador_argumentos = argparse.ArgumentParser(prog='python main.py', description="Procesador de Secuencias Biológicas. Sin subcomando se abre el menú interactivo.")
+    analizador_argumentos.add_argument('--sentry', action='store_true', help="Envía errores y anomalías a Sentry (requiere SENTRY_DSN).")
+    subcomandos = analizador_argumentos.add_subparsers(dest='subcomando', metavar='subcomando')
+    subcomandos.required = True
+
+    def agregar_entrada_salida(subcomando, descripcion_secuencias):
+        subcomando.add_argument('secuencias', nargs='*', help=f"{descripcion_secuencias} Si no se indican, se leen de --entrada.")
+        subcomando.add_argument('-e', '--entrada', default='-', help="Archivo FASTA/FASTQ/texto (una secuencia por línea); '-' = entrada estándar.")
+        subcomando.add_argument('-o', '--salida', default='-', help="Archivo de salida; '-' = salida estándar.")
+        subcomando.add_argument('-f', '--formato', choices=('json', 'tsv'), default='json', help="JSON Lines (por defecto) o TSV.")
+
+    procesar = subcomandos.add_parser('procesar', help="Transcribe y traduce secuencias de ADN.")
+    agregar_entrada_salida(procesar, "Secuencias de ADN.")
+    procesar.add_argument('--resultados', metavar='RUTA', help="Añade además las filas válidas a este archivo de resultados (p. ej. datos_adn.csv).")
+    procesar.set_defaults(funcion=_comando_procesar)
+
+    analizar = subcomandos.add_parser('analizar', help="Estadísticas de un archivo de resultados.")
+    analizar.add_argument('archivo', nargs='?', default='datos_adn.csv', help="Archivo de resultados (.csv o .parquet).")
+    analizar.add_argument('-o', '--salida', default='-', help="Archivo de salida; '-' = salida estándar.")
+    analizar.add_argument('--bloque', type=int, default=100000, help="Filas por bloque de lectura.")
+    analizar.add_argument('--aproximado', action='store_true', help="Cuenta los ADN únicos con HyperLogLog.")
+    analizar.set_defaults(funcion=_comando_analizar)
+
+    complementaria = subcomandos.add_parser('complementaria', help="Cadena de ADN complementaria.")
+    agregar_entrada_salida(complementaria, "Secuencias de ADN.")
+    complementaria.add_argument('--inversa', action='store_true', help="Devuelve la complementaria inversa (5'->3').")
+    complementaria.set_defaults(funcion=_comando_complementaria)
+
+    frecuencia = subcomandos.add_parser('frecuencia', help="Frecuencia de aminoácidos de proteínas.")
+    agregar_entrada_salida(frecuencia, "Secuencias de proteína.")
+    frecuencia.set_defaults(funcion=_comando_frecuencia)
+
+    buscar = subcomandos.add_parser('buscar', help="Busca en un archivo de resultados mediante su índice.")
+    buscar.add_argument('archivo', nargs='?', default='datos_adn.csv', help="Archivo de resultados CSV (el índice es <archivo>.idx.sqlite).")
+    criterio = buscar.add_mutually_exclusive_group(required=True)
+    criterio.add_argument('--adn', help="ADN limpio exacto (¿ya se procesó?).")
+    criterio.add_argument('--proteina', help="Proteína exacta (¿qué ADN la producen?).")
+    criterio.add_argument('--motivo', help="Subcadena de la proteína.")
+    criterio.add_argument('--longitud', nargs=2, type=int, metavar=('MINIMO', 'MAXIMO'), help="Rango de longitud de proteína.")
+    buscar.add_argument('--limite', type=int, help="Número máximo de filas.")
+    buscar.add_argument('--reconstruir', action='store_true', help="Vuelve a indexar el archivo completo.")
+    buscar.add_argument('-o', '--salida', default='-', help="Archivo de salida; '-' = salida estándar.")
+    buscar.add_argument('-f', '--formato', choices=('json', 'tsv'), default='json', help="JSON Lines (por defecto) o TSV.")
+    buscar.set_defaults(funcion=_comando_buscar)
+
+    for nombre, (_, ayuda) in _COMANDOS_DELEGADOS.items():
+        subcomandos.add_parser(nombre, help=ayuda, add_help=False)
+
+    opciones = analizador_argumentos.parse_args(argumentos)
+    inicializar_entorno(usar_sentry=opciones.sentry)
+    _instalar_salida_en_senales()
+    # Igual que en modo lote: log asíncrono desde WARNING y sin avisos por consola, para no mezclarlos con la salida
+    configurar_registro_asincrono(nivel=logging.WARNING)
+    registrador = RegistradorSecuencias()
+    try:
+        return opciones.funcion(opciones, registrador)
+    except (OSError, ValueError) as e:
+        registrador.registrar_error(f"Error en el subcomando '{opciones.subcomando}': {e}", info_exc=True)
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
 # --- Lógica principal del programa ---
 def main():
+    inicializar_entorno()
+    _instalar_salida_en_senales()
     registrador = RegistradorSecuencias()
     gestor_adn = GestorADN(registrador)
     analizador_proteinas = AnalizadorProteinas(registrador)
@@ -383,6 +3708,7 @@ def main():
                 longitud_proteina = analizador_proteinas.analizar_longitud_proteina(proteina)
 
                 analizador_proteinas.save_results_to_csv(adn_usuario, adn_limpio, arn, proteina)
+                analizador_proteinas.vaciar_resultados() # En el menú cada secuencia se escribe en el momento
                 
                 registrador.registrar_info("Transcripción y traducción completadas correctamente")
                 
@@ -400,7 +3726,9 @@ def main():
             except Exception as e:
                 registrador.registrar_critico(f"Error inesperado: {e}", info_exc=True)
                 print(f"Ocurrió un error inesperado: {e}\nPor favor, contacte al soporte técnico.")
-                if SENTRY_DSN: sentry_sdk.capture_exception()
+                if SENTRY_DSN:
+                    import sentry_sdk
+                    sentry_sdk.capture_exception()
         
         elif opcion == '2':
             analizador_proteinas.cargar_y_analizar_datos()
@@ -433,4 +3761,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if len(sys.argv) > 1:
+        sys.exit(main_cli(sys.argv[1:]))
+    main()
@@ -0,0 +1,66 @@
+import re
+
+import pytest
+
+import main
+
+
+def test_generador_reproducible_e_independiente_del_orden():
+    primero = main.GeneradorSecuenciasSinteticas(7)
+    segundo = main.GeneradorSecuenciasSinteticas(7)
+    cortas = primero.generar('lecturas_cortas', 50)
+    segundo.generar('rico_en_stop', 10)
+    assert segundo.generar('lecturas_cortas', 50) == cortas
+    assert main.GeneradorSecuenciasSinteticas(8).generar('lecturas_cortas', 50) != cortas
+    with pytest.raises(ValueError):
+        primero.generar('desconocida', 1)
+
+
+def test_propiedades_de_cada_carga():
+    generador = main.GeneradorSecuenciasSinteticas()
+    cortas = generador.generar('lecturas_cortas', 200)
+    assert all(100 <= len(secuencia) <= 300 and set(secuencia) <= set('ACGT') for secuencia in cortas)
+
+    largos = generador.generar('transcritos_largos', 200)
+    assert len(largos) == 2
+    for transcrito in largos:
+        assert transcrito.startswith('ATG') and len(transcrito) >= 30000
+        codones = {transcrito[i:i + 3] for i in range(0, len(transcrito) - 2, 3)}
+        assert not codones & {'TAA', 'TAG', 'TGA'}
+
+    duplicadas = generador.generar('alta_duplicacion', 1000)
+    assert len(duplicadas) == 1000 and len(set(duplicadas)) <= 10
+
+    invalidas = generador.generar('bases_invalidas', 1000)
+    proporcion = sum(bool(re.search('[^ACGT]', secuencia)) for secuencia in invalidas) / len(invalidas)
+    assert 0.2 < proporcion < 0.4
+
+    analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False)
+    ricas = generador.generar('rico_en_stop', 100)
+    longitudes = [len(analizador.traducir_arn(secuencia.replace('T', 'U'))) for secuencia in ricas]
+    assert sum(longitudes) < sum(len(secuencia) // 3 for secuencia in ricas) / 2
+
+
+def test_escribir_fasta(tmp_path):
+    ruta = tmp_path / 'c.fa'
+    generador = main.GeneradorSecuenciasSinteticas()
+    generador.escribir_fasta(str(ruta), 'lecturas_cortas', 5)
+    assert [secuencia for _, secuencia in main.leer_registros_secuencias(str(ruta))] == generador.generar('lecturas_cortas', 5)
+
+
+def test_suite_y_comparacion_con_linea_base(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suite = main.SuiteBenchmark(numero_secuencias=20, repeticiones=1)
+    resultados = suite.ejecutar(['lecturas_cortas'])
+    medidas = resultados['resultados']['lecturas_cortas']
+    assert set(medidas) == set(main.SuiteBenchmark.ETAPAS)
+    assert medidas['limpiar_adn']['registros'] == 20
+    assert all(medida['registros_por_segundo'] > 0 for medida in medidas.values())
+
+    ruta = str(tmp_path / 'b.json')
+    main.SuiteBenchmark.guardar(resultados, ruta)
+    linea_base = main.SuiteBenchmark.cargar(ruta)
+    assert main.SuiteBenchmark.comparar(resultados, linea_base) == []
+    linea_base['resultados']['lecturas_cortas']['traducir_arn']['registros_por_segundo'] *= 2
+    regresiones = main.SuiteBenchmark.comparar(resultados, linea_base)
+    assert [(regresion['etapa'], round(regresion['cambio'], 2)) for regresion in regresiones] == [('traducir_arn', -0.5)]
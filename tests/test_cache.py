@@ -0,0 +1,55 @@
+import sys
+
+import main
+
+
+def _procesador(cache, transporte):
+    reportador = main.ReportadorAnomalias(transporte, intervalo_resumen=3600, muestras_por_tipo=10)
+    registrador = main.RegistradorSecuencias(reportador=reportador)
+    procesador = main.ProcesadorLotes(main.GestorADN(registrador, mostrar_avisos=False, politica_iupac='aceptar'),
+                                      main.AnalizadorProteinas(registrador, mostrar_avisos=False), registrador, cache=cache)
+    return procesador, reportador
+
+
+def _muestras(transporte):
+    return {evento['etiquetas']['tipo_anomalia']: evento['extras']['muestras']
+            for evento in transporte.eventos if 'etiquetas' in evento}
+
+
+def test_acierto_de_cache_reporta_las_mismas_anomalias_que_un_fallo():
+    secuencias = ['ATGNNNGCC', 'atgnnngcc', 'ATGNNNGCC']
+    transporte = main.TransporteLocal()
+    procesador, reportador = _procesador(main.CacheTraducciones(1024 * 1024), transporte)
+    filas = [procesador.procesar_registro(secuencia) for secuencia in secuencias]
+    reportador.cerrar()
+    assert procesador.cache.aciertos == 2
+    muestras = _muestras(transporte)
+    assert muestras['codones_desconocidos'] == [{'secuencia': 'AUGNNNGCC', 'longitud_arn': 9, 'conteo_desconocidos': 1}] * 3
+    assert muestras['proteina_corta'] == [{'secuencia': 'M?A', 'longitud_proteina': 3}] * 3
+
+    transporte_sin_cache = main.TransporteLocal()
+    procesador, reportador = _procesador(None, transporte_sin_cache)
+    assert [procesador.procesar_registro(secuencia) for secuencia in secuencias] == filas
+    reportador.cerrar()
+    assert _muestras(transporte_sin_cache) == muestras
+
+
+def test_cache_expulsa_lo_menos_usado():
+    tamano = sys.getsizeof('AAA') + sys.getsizeof('K') + main.CacheTraducciones.BYTES_POR_ENTRADA
+    cache = main.CacheTraducciones(presupuesto_bytes=3 * tamano, usar_resumen=False)
+    for adn in ('AAA', 'CCC', 'GGG'):
+        cache.guardar(adn, 'K', 1, ())
+    assert cache.obtener('AAA') is not None
+    cache.guardar('TTT', 'F', 1, ())
+    assert cache.obtener('CCC') is None
+    assert cache.obtener('AAA') == ('K', 1, ())
+    assert cache.expulsiones == 1
+
+
+def test_traduccion_empaquetada_reporta_el_arn():
+    transporte = main.TransporteLocal()
+    reportador = main.ReportadorAnomalias(transporte, intervalo_resumen=3600)
+    analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(reportador=reportador), mostrar_avisos=False)
+    assert analizador.traducir_secuencia_empaquetada(main.SecuenciaEmpaquetada.desde_texto('ATGNNNGCC')) == 'M?A'
+    reportador.cerrar()
+    assert _muestras(transporte)['codones_desconocidos'][0]['secuencia'] == 'AUGNNNGCC'
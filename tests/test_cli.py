@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ejecutar(directorio, *argumentos, entrada=None):
+    proceso = subprocess.run([sys.executable, os.path.join(RAIZ, 'main.py'), *argumentos], cwd=directorio,
+                             input=entrada, capture_output=True, text=True, timeout=60)
+    return proceso.returncode, proceso.stdout
+
+
+def _json_lines(texto):
+    return [json.loads(linea) for linea in texto.splitlines()]
+
+
+def test_procesar_argumentos_y_codigo_de_salida(tmp_path):
+    codigo, salida = _ejecutar(tmp_path, 'procesar', 'ATGGCCTAA')
+    assert codigo == 0
+    assert _json_lines(salida) == [{'id': '1', 'valido': True, 'ADN_Original': 'ATGGCCTAA', 'ADN_Limpio': 'ATGGCCTAA',
+                                    'ARN_Secuencia': 'AUGGCCUAA', 'Proteina_Secuencia': 'MA', 'Longitud_Proteina': 2}]
+    codigo, salida = _ejecutar(tmp_path, 'procesar', 'ATGGCC', 'ATGX')
+    assert codigo == 1
+    assert [fila['valido'] for fila in _json_lines(salida)] == [True, False]
+
+
+def test_entrada_estandar_y_tsv(tmp_path):
+    codigo, salida = _ejecutar(tmp_path, 'complementaria', '--inversa', '-f', 'tsv', entrada="ATGC\nAAC\n")
+    assert codigo == 0
+    assert salida.splitlines() == ['id\tvalido\tADN_Original\tADN_Limpio\tADN_Complementario',
+                                   '1\tTrue\tATGC\tATGC\tGCAT', '2\tTrue\tAAC\tAAC\tGTT']
+
+
+def test_frecuencia(tmp_path):
+    codigo, salida = _ejecutar(tmp_path, 'frecuencia', 'maaw')
+    assert codigo == 0
+    frecuencias = _json_lines(salida)[0]['Frecuencias']
+    assert {fila['Aminoacido']: fila['Conteo'] for fila in frecuencias} == {'A': 2, 'M': 1, 'W': 1}
+
+
+def test_resultados_analizar_y_buscar(tmp_path):
+    assert _ejecutar(tmp_path, 'procesar', 'ATGGCCTAA', '--resultados', 'r.csv')[0] == 0
+    codigo, salida = _ejecutar(tmp_path, 'analizar', 'r.csv')
+    assert codigo == 0
+    resumen = json.loads(salida)
+    assert resumen['secuencias'] == 1 and resumen['longitud_proteina']['desviacion_estandar'] is None
+    codigo, salida = _ejecutar(tmp_path, 'buscar', 'r.csv', '--motivo', 'ma')
+    assert codigo == 0
+    assert [fila['ADN_Limpio'] for fila in _json_lines(salida)] == ['ATGGCCTAA']
+
+
+def test_errores_de_archivo(tmp_path):
+    codigo, _ = _ejecutar(tmp_path, 'procesar', '-e', 'no_existe.fa')
+    assert codigo == 1
+
+
+def test_complementaria_no_importa_dependencias_pesadas(tmp_path):
+    codigo = ("import sys\nsys.path.insert(0, sys.argv[1])\nimport main\n"
+              "assert main.main_cli(['complementaria', 'ATGC']) == 0\n"
+              "print(sorted(m for m in ('numpy', 'pandas', 'sentry_sdk', 'dotenv') if m in sys.modules))\n")
+    proceso = subprocess.run([sys.executable, '-c', codigo, RAIZ], cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    assert proceso.returncode == 0, proceso.stderr
+    assert proceso.stdout.splitlines()[-1] == '[]'
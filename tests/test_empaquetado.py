@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+import main
+
+COMPLEMENTO = str.maketrans('ACGTNRY', 'TGCANYR')
+
+
+def _adn(longitud, semilla, alfabeto='ACGTACGTACGTACGTNRY'):
+    aleatorio = random.Random(semilla)
+    return "".join(aleatorio.choice(alfabeto) for _ in range(longitud))
+
+
+@pytest.mark.parametrize('longitud', [0, 1, 3, 4, 5, 1001])
+def test_ida_y_vuelta_en_memoria(longitud):
+    adn = _adn(longitud, longitud)
+    empaquetada = main.SecuenciaEmpaquetada.desde_texto(adn)
+    assert len(empaquetada) == longitud
+    assert empaquetada.a_texto() == adn
+    assert empaquetada.complementaria_inversa().a_texto() == adn.translate(COMPLEMENTO)[::-1]
+    assert empaquetada[2:longitud - 3].a_texto() == adn[2:longitud - 3]
+
+
+def test_ventanas_y_rebanadas():
+    adn = _adn(500, 1)
+    empaquetada = main.SecuenciaEmpaquetada.desde_texto(adn)
+    assert empaquetada.ventana(97, 311).a_texto() == adn[97:311]
+    assert empaquetada[97:311][5:20].a_texto() == adn[102:117]
+    with pytest.raises(TypeError):
+        empaquetada[::2]
+
+
+def test_alfabeto_arn():
+    arn = _adn(200, 2, 'ACGUN')
+    empaquetada = main.SecuenciaEmpaquetada.desde_texto(arn)
+    assert empaquetada.alfabeto == 'ACGU'
+    assert empaquetada.a_texto() == arn
+    adn = arn.replace('U', 'T')
+    assert main.SecuenciaEmpaquetada.desde_texto(adn).transcribir().a_texto() == arn
+
+
+def test_guardar_y_cargar(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'TAMANO_VENTANA_EMPAQUETADA', 48)
+    for texto in (_adn(1003, 3), _adn(500, 4, 'ACGU')):
+        ruta = str(tmp_path / 'x.2bit')
+        main.SecuenciaEmpaquetada.desde_texto(texto).guardar(ruta)
+        cargada = main.SecuenciaEmpaquetada.cargar(ruta)
+        assert cargada.a_texto() == texto
+        assert cargada.alfabeto == main.SecuenciaEmpaquetada.desde_texto(texto).alfabeto
+        assert cargada[10:70].a_texto() == texto[10:70]
+
+
+def test_empaquetar_fasta(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'TAMANO_VENTANA_EMPAQUETADA', 48)
+    adn = _adn(1000, 5)
+    fasta = tmp_path / 'c.fa'
+    fasta.write_text(">cromosoma\n" + "\n".join(adn[i:i + 60].lower() for i in range(0, len(adn), 60)) + "\n>otro\nACGT\n")
+    ruta = str(tmp_path / 'c.2bit')
+    assert main.empaquetar_fasta(str(fasta), ruta) == len(adn)
+    assert main.SecuenciaEmpaquetada.cargar(ruta).a_texto() == adn
+
+
+def test_archivo_que_no_es_empaquetado(tmp_path):
+    ruta = tmp_path / 'x.bin'
+    ruta.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        main.SecuenciaEmpaquetada.cargar(str(ruta))
+
+
+def test_traduccion_empaquetada_equivale_al_texto(monkeypatch):
+    monkeypatch.setattr(main, 'TAMANO_VENTANA_EMPAQUETADA', 36)
+    analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False)
+    for semilla in range(10):
+        adn = 'ATG' + _adn(400, semilla, 'ACGTACGTACGTN')
+        arn = adn.replace('T', 'U')
+        assert analizador.traducir_secuencia_empaquetada(main.SecuenciaEmpaquetada.desde_texto(adn)) == analizador.traducir_arn(arn)
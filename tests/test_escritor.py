@@ -0,0 +1,73 @@
+import csv
+import os
+import signal
+import subprocess
+import sys
+
+import pytest
+
+import main
+
+FILA = ('atg', 'ATG', 'AUG', 'M', 1)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _leer_csv(ruta):
+    with open(ruta, newline='') as archivo:
+        return list(csv.reader(archivo))
+
+
+def test_csv_por_bloques_y_anadiendo(tmp_path):
+    ruta = str(tmp_path / 'r.csv')
+    with main.EscritorResultados(ruta, tamano_bloque=2) as escritor:
+        escritor.agregar_filas([FILA] * 3)
+    with main.EscritorResultados(ruta) as escritor:
+        escritor.agregar(FILA)
+    filas = _leer_csv(ruta)
+    assert filas[0] == main.COLUMNAS_RESULTADOS
+    assert filas[1:] == [[str(valor) for valor in FILA]] * 4
+    assert escritor.filas_escritas == 1
+
+
+def test_parquet_existente_se_rechaza(tmp_path):
+    pytest.importorskip('pyarrow')
+    ruta = str(tmp_path / 'r.parquet')
+    with main.EscritorResultados(ruta) as escritor:
+        escritor.agregar(FILA)
+    with pytest.raises(FileExistsError):
+        main.EscritorResultados(ruta)
+
+
+def test_crear_un_escritor_no_cambia_los_manejadores_de_senales(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, '_senales_instaladas', False)
+    antes = signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    try:
+        main.EscritorResultados(str(tmp_path / 'r.csv')).cerrar()
+        assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+    finally:
+        signal.signal(signal.SIGTERM, antes)
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGTERM') or os.name == 'nt', reason="requiere SIGTERM de POSIX")
+def test_sigterm_vuelca_las_filas_pendientes(tmp_path):
+    ruta = str(tmp_path / 'r.csv')
+    codigo = (f"import os, signal, main\n"
+              f"escritor = main.EscritorResultados({ruta!r})\n"
+              f"escritor.agregar({FILA!r})\n"
+              f"main._instalar_salida_en_senales()\n"
+              f"os.kill(os.getpid(), signal.SIGTERM)\n")
+    proceso = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ)
+    assert proceso.returncode == 128 + signal.SIGTERM
+    assert _leer_csv(ruta)[1:] == [[str(valor) for valor in FILA]]
+
+
+def test_save_results_to_csv_acumula_hasta_vaciar(tmp_path):
+    ruta = str(tmp_path / 'r.csv')
+    analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False, tamano_bloque_resultados=3)
+    analizador.save_results_to_csv(*FILA[:4], nombre_archivo=ruta)
+    analizador.save_results_to_csv(*FILA[:4], nombre_archivo=ruta)
+    assert not os.path.exists(ruta) or len(_leer_csv(ruta)) <= 1
+    analizador.save_results_to_csv(*FILA[:4], nombre_archivo=ruta)
+    analizador.save_results_to_csv(*FILA[:4], nombre_archivo=ruta)
+    analizador.vaciar_resultados(ruta)
+    assert _leer_csv(ruta)[1:] == [[str(valor) for valor in FILA]] * 4
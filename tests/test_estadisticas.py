@@ -0,0 +1,94 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+import main
+
+
+def _rango_de_referencia(valor, precision):
+    """Posición (desde 1) del primer bit a 1 tras los precision bits de índice; bits_restantes + 1 si no hay ninguno."""
+    bits_restantes = 64 - precision
+    resto = valor & ((1 << bits_restantes) - 1)
+    return bits_restantes - resto.bit_length() + 1
+
+
+def test_estadisticas_por_bloques_equivalen_a_numpy():
+    aleatorio = np.random.default_rng(3)
+    valores = aleatorio.integers(0, 500, size=10007).astype(np.float64)
+    total = main.EstadisticasIncrementales()
+    for bloque in np.array_split(valores, 13):
+        total.actualizar(bloque)
+    assert total.n == len(valores)
+    assert total.media == pytest.approx(valores.mean())
+    assert total.desviacion_estandar == pytest.approx(valores.std(ddof=1))
+    assert (total.minimo, total.maximo) == (valores.min(), valores.max())
+
+
+def test_combinar_estadisticas_parciales():
+    valores = [float(valor) for valor in range(1, 101)]
+    primera, segunda = main.EstadisticasIncrementales(), main.EstadisticasIncrementales()
+    primera.actualizar(valores[:30])
+    segunda.actualizar(valores[30:])
+    segunda.actualizar([])
+    primera.combinar(segunda)
+    primera.combinar(main.EstadisticasIncrementales())
+    assert primera.media == pytest.approx(50.5)
+    assert primera.desviacion_estandar == pytest.approx(np.std(valores, ddof=1))
+    assert math.isnan(main.EstadisticasIncrementales().desviacion_estandar)
+
+
+@pytest.mark.parametrize('precision', [4, 10, 14, 18])
+def test_rangos_exactos_de_hyperloglog(precision):
+    aleatorio = random.Random(precision)
+    hashes = [aleatorio.getrandbits(64) for _ in range(2000)]
+    bits_restantes = 64 - precision
+    # Valores extremos: sin ningún bit a 1, solo el último, y con el bit 52/53 (límite de precisión de float64)
+    hashes += [0, 1, (1 << bits_restantes) - 1, 1 << min(52, bits_restantes - 1), (1 << min(53, bits_restantes)) - 1]
+    hll = main.HyperLogLog(precision)
+    hll.agregar_hashes(hashes)
+    esperado = np.zeros(1 << precision, dtype=np.uint8)
+    for valor in hashes:
+        indice = valor >> bits_restantes
+        esperado[indice] = max(esperado[indice], _rango_de_referencia(valor, precision))
+    assert np.array_equal(hll.registros, esperado)
+
+
+def test_hyperloglog_estima_y_combina():
+    aleatorio = np.random.default_rng(11)
+    hashes = aleatorio.integers(0, 2 ** 64, size=200000, dtype=np.uint64)
+    completo, primera, segunda = main.HyperLogLog(), main.HyperLogLog(), main.HyperLogLog()
+    completo.agregar_hashes(hashes)
+    primera.agregar_hashes(hashes[:120000])
+    segunda.agregar_hashes(hashes[80000:])
+    primera.combinar(segunda)
+    assert np.array_equal(primera.registros, completo.registros)
+    assert completo.estimar() == pytest.approx(len(np.unique(hashes)), rel=0.03)
+    pequeno = main.HyperLogLog()
+    pequeno.agregar_hashes(hashes[:100])
+    assert pequeno.estimar() == pytest.approx(100, abs=3)
+    with pytest.raises(ValueError):
+        main.HyperLogLog(3)
+
+
+def test_resumir_resultados_por_bloques_equivale_a_pandas(tmp_path):
+    pd = pytest.importorskip('pandas')
+    ruta = tmp_path / 'r.csv'
+    aleatorio = random.Random(1)
+    with main.EscritorResultados(str(ruta)) as escritor:
+        for _ in range(500):
+            adn = "".join(aleatorio.choice('ACGT') for _ in range(aleatorio.randrange(3, 12)))
+            escritor.agregar((adn, adn, adn.replace('T', 'U'), 'M', aleatorio.randrange(0, 20)))
+    df = pd.read_csv(ruta)
+    descripcion = df['Longitud_Proteina'].describe()
+    for conteo_aproximado in (False, True):
+        resumen = main.resumir_resultados(str(ruta), tamano_bloque=37, conteo_aproximado=conteo_aproximado)
+        assert resumen['secuencias'] == len(df)
+        assert resumen['longitud_proteina']['promedio'] == pytest.approx(descripcion['mean'])
+        assert resumen['longitud_proteina']['desviacion_estandar'] == pytest.approx(descripcion['std'])
+        assert resumen['proteinas_largas'] == int((df['Longitud_Proteina'] > 10).sum())
+        if conteo_aproximado:
+            assert resumen['adn_limpio_unicos'] == pytest.approx(df['ADN_Limpio'].nunique(), rel=0.05)
+        else:
+            assert resumen['adn_limpio_unicos'] == df['ADN_Limpio'].nunique()
@@ -0,0 +1,71 @@
+import os
+
+import main
+
+
+def _fila(adn_limpio, proteina):
+    return (adn_limpio.lower(), adn_limpio, adn_limpio.replace('T', 'U'), proteina, len(proteina))
+
+
+def _escribir(ruta, filas):
+    with main.EscritorResultados(str(ruta)) as escritor:
+        escritor.agregar_filas(filas)
+
+
+def test_consultas(tmp_path):
+    ruta = tmp_path / 'r.csv'
+    _escribir(ruta, [_fila('ATGGCC', 'MA'), _fila('ATGTGGTGG', 'MWW'), _fila('ATGGCCGCC', 'MAA')])
+    with main.IndiceResultados(str(ruta)) as indice:
+        assert indice.actualizar() == 3
+        assert [fila['Proteina_Secuencia'] for fila in indice.buscar_por_adn('ATGGCC')] == ['MA']
+        assert indice.contiene_adn('ATGTGGTGG') and not indice.contiene_adn('ATG')
+        assert len(indice.buscar_por_proteina('MAA')) == 1
+        assert [fila['Longitud_Proteina'] for fila in indice.buscar_por_longitud(minimo=3)] == [3, 3]
+        assert [fila['Proteina_Secuencia'] for fila in indice.buscar_motivo('WW')] == ['MWW']
+        assert [fila['Proteina_Secuencia'] for fila in indice.buscar_motivo('MA')] == ['MA', 'MAA']
+        assert main.consultar_indice(indice, {'motivo': 'maa'})[0]['ADN_Limpio'] == 'ATGGCCGCC'
+
+
+def test_actualizacion_incremental(tmp_path):
+    ruta = tmp_path / 'r.csv'
+    _escribir(ruta, [_fila('ATGGCC', 'MA')])
+    with main.IndiceResultados(str(ruta)) as indice:
+        assert indice.actualizar() == 1
+        assert indice.actualizar() == 0
+        _escribir(ruta, [_fila('ATGTGG', 'MW')])
+        assert indice.actualizar() == 1
+        assert indice.filas_indexadas == 2
+        assert indice.bytes_indexados == os.path.getsize(ruta)
+
+
+def test_archivo_reemplazado_del_mismo_tamano_se_reindexa(tmp_path):
+    ruta = tmp_path / 'r.csv'
+    _escribir(ruta, [_fila('ATGGCC', 'MA')])
+    with main.IndiceResultados(str(ruta)) as indice:
+        indice.actualizar()
+        reemplazo = tmp_path / 'nuevo.csv'
+        _escribir(reemplazo, [_fila('ATGTGG', 'MW'), _fila('ATGTTT', 'MF')])
+        os.replace(reemplazo, ruta)
+        assert indice.actualizar() == 2
+        assert not indice.contiene_adn('ATGGCC')
+        assert [fila['Proteina_Secuencia'] for fila in indice.buscar_motivo('M')] == ['MW', 'MF']
+
+
+def test_archivo_reescrito_en_el_sitio_se_reindexa(tmp_path):
+    ruta = tmp_path / 'r.csv'
+    _escribir(ruta, [_fila('ATGGCC', 'MA')])
+    with main.IndiceResultados(str(ruta)) as indice:
+        indice.actualizar()
+        os.remove(ruta)
+        _escribir(ruta, [_fila('ATGGCA', 'MA')])
+        assert indice.actualizar() == 1
+        assert indice.contiene_adn('ATGGCA') and not indice.contiene_adn('ATGGCC')
+
+
+def test_salto_de_linea_entre_comillas(tmp_path):
+    ruta = tmp_path / 'r.csv'
+    _escribir(ruta, [('atg\ngcc', 'ATGGCC', 'AUGGCC', 'MA', 2), _fila('ATGTGG', 'MW')])
+    with main.IndiceResultados(str(ruta)) as indice:
+        assert indice.actualizar() == 2
+        assert indice.buscar_por_adn('ATGGCC')[0]['ADN_Original'] == 'atg\ngcc'
+        assert indice.buscar_por_adn('ATGTGG')[0]['Proteina_Secuencia'] == 'MW'
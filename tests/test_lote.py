@@ -0,0 +1,58 @@
+import csv
+import gzip
+import os
+import subprocess
+import sys
+
+import pytest
+
+import main
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _procesador():
+    registrador = main.RegistradorSecuencias()
+    return main.ProcesadorLotes(main.GestorADN(registrador, mostrar_avisos=False),
+                                main.AnalizadorProteinas(registrador, mostrar_avisos=False), registrador)
+
+
+def test_lectura_fasta_multilinea(tmp_path):
+    ruta = tmp_path / 'e.fa'
+    ruta.write_text(">uno descripcion\nATGG\nCCTAA\n\n>dos\natgtgg\n")
+    assert list(main.leer_registros_secuencias(str(ruta))) == [('uno descripcion', 'ATGGCCTAA'), ('dos', 'atgtgg')]
+
+
+def test_lectura_fastq_comprimido(tmp_path):
+    ruta = tmp_path / 'e.fq.gz'
+    with gzip.open(ruta, 'wt') as archivo:
+        archivo.write("@r1\nATGGCC\n+\nIIIIII\n@r2\nATGTGG\n+\n@@@@@@\n")
+    assert list(main.leer_registros_secuencias(str(ruta))) == [('r1', 'ATGGCC'), ('r2', 'ATGTGG')]
+
+
+def test_fastq_mal_formado(tmp_path):
+    ruta = tmp_path / 'e.fq'
+    ruta.write_text("@r1\nATGGCC\n+\nIIIIII\nr2\n")
+    with pytest.raises(ValueError):
+        list(main.leer_registros_secuencias(str(ruta)))
+
+
+def test_procesar_archivo_descarta_los_invalidos(tmp_path):
+    entrada, salida = tmp_path / 'e.fa', tmp_path / 's.csv'
+    entrada.write_text(">a\nATGGCCTAA\n>b\nATGXCC\n>c\n5'-atgtgg-3'\n")
+    estadisticas = _procesador().procesar_archivo(str(entrada), str(salida))
+    assert (estadisticas['registros'], estadisticas['registros_validos'], estadisticas['registros_invalidos']) == (3, 2, 1)
+    with open(salida, newline='') as archivo:
+        filas = list(csv.reader(archivo))
+    assert filas == [main.COLUMNAS_RESULTADOS,
+                     ['ATGGCCTAA', 'ATGGCCTAA', 'AUGGCCUAA', 'MA', '2'],
+                     ["5'-atgtgg-3'", 'ATGTGG', 'AUGUGG', 'MW', '2']]
+
+
+def test_subcomando_lote(tmp_path):
+    entrada, salida = tmp_path / 'e.fa', tmp_path / 's.csv'
+    entrada.write_text(">a\nATGGCCTAA\n")
+    proceso = subprocess.run([sys.executable, os.path.join(RAIZ, 'main.py'), 'lote', str(entrada), str(salida)],
+                             cwd=tmp_path, capture_output=True, text=True)
+    assert proceso.returncode == 0, proceso.stderr
+    assert salida.read_text().splitlines()[1] == 'ATGGCCTAA,ATGGCCTAA,AUGGCCUAA,MA,2'
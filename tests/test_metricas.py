@@ -0,0 +1,54 @@
+import logging
+
+import main
+
+
+def test_solo_se_instrumentan_las_etapas_del_pipeline():
+    metricas = main.RegistroMetricas()
+    registrador = main.RegistradorSecuencias()
+    gestor = main.GestorADN(registrador, mostrar_avisos=False)
+    analizador = main.AnalizadorProteinas(registrador, mostrar_avisos=False)
+    procesador = main.ProcesadorLotes(gestor, analizador, registrador, metricas=metricas)
+    procesador.procesar_registro('ATGGCCTAA')
+    procesador.procesar_registros(['ATGTGG', 'ATGXXX'])
+
+    assert set(vars(gestor)) >= set(main.ProcesadorLotes.ETAPAS_GESTOR_ADN)
+    for metodo in ('analizar_frecuencia_aminoacidos', 'cargar_y_analizar_datos', 'buscar_orfs'):
+        assert metodo not in vars(analizador)
+    histogramas = metricas.resumen()['histogramas']
+    assert {nombre.split('"')[1] for nombre in histogramas} == {'GestorADN.limpiar_adn', 'GestorADN.validar_adn', 'GestorADN.transcribir_adn', 'GestorADN.normalizar_adn',
+                      'AnalizadorProteinas.traducir_arn', 'AnalizadorProteinas.traducir_arns',
+                      'AnalizadorProteinas.analizar_longitud_proteina'}
+    assert histogramas['duracion_etapa_segundos{etapa="GestorADN.normalizar_adn"}']['llamadas'] == 3
+    assert histogramas['duracion_etapa_segundos{etapa="AnalizadorProteinas.traducir_arns"}']['llamadas'] == 1
+
+
+def test_exportar_e_incorporar_suman_los_registros():
+    origen, destino = main.RegistroMetricas(), main.RegistroMetricas()
+    for registro in (origen, destino):
+        registro.incrementar('secuencias_procesadas_total', 2)
+        registro.histograma('duracion_etapa_segundos', {'etapa': 'x'}).observar_ns(1500)
+    destino.incorporar(origen.exportar(reiniciar=True))
+    resumen = destino.resumen()
+    assert resumen['contadores']['secuencias_procesadas_total'] == 4
+    assert resumen['histogramas']['duracion_etapa_segundos{etapa="x"}']['llamadas'] == 2
+    assert origen.resumen()['contadores'] == {}
+    texto = destino.a_prometheus()
+    assert '# TYPE duracion_etapa_segundos histogram' in texto
+    assert 'duracion_etapa_segundos_count{etapa="x"} 2' in texto
+
+
+def test_escuchador_de_registro_se_puede_detener_varias_veces(tmp_path):
+    nombre = 'prueba_registro_asincrono'
+    escuchador = main.configurar_registro_asincrono(str(tmp_path / 'p.log'), nombre_registrador=nombre, nivel=logging.WARNING)
+    registrador = logging.getLogger(nombre)
+    try:
+        registrador.warning("mensaje de prueba")
+        escuchador.stop()
+        escuchador.stop()
+    finally:
+        for manejador in list(registrador.handlers):
+            registrador.removeHandler(manejador)
+        for manejador in escuchador.handlers:
+            manejador.close()
+    assert "mensaje de prueba" in (tmp_path / 'p.log').read_text(encoding='utf-8')
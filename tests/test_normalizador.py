@@ -0,0 +1,46 @@
+import pytest
+
+import main
+
+
+@pytest.fixture
+def gestor():
+    return main.GestorADN(main.RegistradorSecuencias(), mostrar_avisos=False)
+
+
+def test_normalizar_secuencia_valida(gestor):
+    for entrada in ("5'-atgGCC-3'", b"5'-atgGCC-3'", bytearray(b'ATGGCC'), memoryview(b'ATGGCC')):
+        resultado = gestor.normalizar_adn(entrada, complementaria_inversa=True)
+        assert resultado['valido']
+        assert resultado['adn_limpio'] == 'ATGGCC'
+        assert resultado['arn'] == 'AUGGCC'
+        assert resultado['complementaria_inversa'] == 'GGCCAT'
+
+
+def test_bytes_no_ascii_son_invalidos(gestor):
+    resultado = gestor.normalizar_adn(b'ATG\xffC')
+    assert not resultado['valido']
+    assert resultado['bases_invalidas'] == {'\xff'}
+    assert resultado['primera_posicion_invalida'] == 3
+    assert resultado['arn'] is None
+
+
+@pytest.mark.parametrize('entrada, invalidas, posicion', [
+    ('ATGÑC', {'Ñ'}, 3),
+    ("5'-atgñcX-3'", {'ñ', 'X'}, 3),
+    ('AT€G', {'€'}, 2),
+])
+def test_texto_no_ascii_informa_el_caracter_real(gestor, entrada, invalidas, posicion):
+    resultado = gestor.normalizar_adn(entrada)
+    assert not resultado['valido']
+    assert resultado['bases_invalidas'] == invalidas
+    assert resultado['primera_posicion_invalida'] == posicion
+    assert resultado['arn'] is None
+
+
+def test_politica_iupac_enmascarar():
+    normalizador = main.NormalizadorSecuencias('enmascarar')
+    assert normalizador.normalizar('acgtry')['adn_limpio'] == 'ACGTNN'
+    assert normalizador.normalizar('ACGTÑ')['bases_invalidas'] == {'Ñ'}
+    with pytest.raises(ValueError):
+        main.NormalizadorSecuencias('ignorar')
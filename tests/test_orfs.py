@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+import main
+
+COMPLEMENTO = str.maketrans('ACGTN', 'TGCAN')
+
+
+def _orfs_de_referencia(adn, longitud_minima, longitud_maxima):
+    """Recorrido codón a codón: cada STOP cierra el ORF abierto por el primer AUG posterior al STOP anterior."""
+    orfs = []
+    longitud_adn = len(adn)
+    for hebra, secuencia in (('+', adn), ('-', adn.translate(COMPLEMENTO)[::-1])):
+        arn = secuencia.replace('T', 'U')
+        for marco in range(3):
+            abierto = None
+            for inicio in range(marco, len(arn) - 2, 3):
+                aminoacido = main.tabla_codones.get(arn[inicio:inicio + 3], '?')
+                if abierto is None and arn[inicio:inicio + 3] == 'AUG':
+                    abierto = inicio
+                if aminoacido == 'STOP' and abierto is not None:
+                    longitud = (inicio - abierto) // 3
+                    if longitud_minima <= longitud <= longitud_maxima:
+                        proteina = "".join(main.tabla_codones.get(arn[i:i + 3], '?') for i in range(abierto, inicio, 3))
+                        inicio_nt, fin_nt = abierto, inicio + 3
+                        if hebra == '-':
+                            inicio_nt, fin_nt = longitud_adn - fin_nt, longitud_adn - inicio_nt
+                        orfs.append({'hebra': hebra, 'marco': marco, 'inicio': inicio_nt, 'fin': fin_nt,
+                                     'longitud': longitud, 'proteina': proteina})
+                    abierto = None
+    return orfs
+
+
+def _ordenar(orfs):
+    return sorted(orfs, key=lambda orf: (orf['hebra'], orf['marco'], orf['inicio']))
+
+
+@pytest.fixture
+def analizador():
+    return main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False)
+
+
+@pytest.fixture
+def gestor():
+    return main.GestorADN(main.RegistradorSecuencias(), mostrar_avisos=False)
+
+
+def test_orf_en_cada_hebra(analizador, gestor):
+    adn = 'CCATGGCCTGGTAAGG'
+    orfs = analizador.buscar_orfs(adn, gestor, longitud_minima=1)
+    assert {'hebra': '+', 'marco': 2, 'inicio': 2, 'fin': 14, 'longitud': 3, 'proteina': 'MAW'} in orfs
+    inverso = adn.translate(COMPLEMENTO)[::-1]
+    orfs_inversos = analizador.buscar_orfs(inverso, gestor, longitud_minima=1)
+    assert {'hebra': '-', 'marco': 2, 'inicio': 2, 'fin': 14, 'longitud': 3, 'proteina': 'MAW'} in orfs_inversos
+
+
+@pytest.mark.parametrize('semilla', range(20))
+def test_seis_marcos_equivalen_a_la_referencia(analizador, gestor, semilla):
+    aleatorio = random.Random(semilla)
+    adn = "".join(aleatorio.choice('ACGTACGTACGTN' if semilla % 2 else 'ACGT') for _ in range(aleatorio.randrange(0, 900)))
+    for minimo, maximo in ((1, 10 ** 6), (5, 40)):
+        esperado = _ordenar(_orfs_de_referencia(adn, minimo, maximo))
+        assert _ordenar(analizador.buscar_orfs(adn, gestor, minimo, maximo)) == esperado
+        empaquetada = main.SecuenciaEmpaquetada.desde_texto(adn)
+        assert _ordenar(analizador.buscar_orfs(empaquetada, gestor, minimo, maximo)) == esperado
+
+
+def test_ventanas_pequenas_en_secuencia_empaquetada(analizador, gestor, monkeypatch):
+    # Con ventanas de pocas bases los ORF cruzan varias ventanas
+    monkeypatch.setattr(main, 'TAMANO_VENTANA_EMPAQUETADA', 36)
+    aleatorio = random.Random(7)
+    adn = "".join(aleatorio.choice('ACGT') for _ in range(2000))
+    esperado = _ordenar(_orfs_de_referencia(adn, 1, 10 ** 6))
+    assert esperado
+    assert _ordenar(analizador.buscar_orfs(main.SecuenciaEmpaquetada.desde_texto(adn), gestor, 1, 10 ** 6)) == esperado
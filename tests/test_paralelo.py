@@ -0,0 +1,48 @@
+import main
+
+
+def _escribir_fasta(ruta, secuencias):
+    with open(ruta, 'w') as archivo:
+        for numero, secuencia in enumerate(secuencias):
+            archivo.write(f">r{numero}\n{secuencia}\n")
+
+
+def _resumenes(transporte):
+    return {evento['etiquetas']['tipo_anomalia']: evento['etiquetas']['conteo']
+            for evento in transporte.eventos if 'etiquetas' in evento}
+
+
+def _procesar(tmp_path, secuencias, trabajadores, **opciones):
+    entrada = tmp_path / 'entrada.fa'
+    _escribir_fasta(entrada, secuencias)
+    transporte = main.TransporteLocal()
+    reportador = main.ReportadorAnomalias(transporte, intervalo_resumen=3600)
+    registrador = main.RegistradorSecuencias(reportador=reportador)
+    salida = tmp_path / f'salida_{trabajadores}.csv'
+    if trabajadores:
+        procesador = main.ProcesadorParalelo(registrador, numero_trabajadores=trabajadores, tamano_bloque=7, **opciones)
+    else:
+        procesador = main.ProcesadorLotes(main.GestorADN(registrador, mostrar_avisos=False),
+                                          main.AnalizadorProteinas(registrador, mostrar_avisos=False), registrador)
+    estadisticas = procesador.procesar_archivo(str(entrada), str(salida))
+    reportador.cerrar()
+    return salida.read_bytes(), estadisticas, _resumenes(transporte)
+
+
+def test_paralelo_escribe_lo_mismo_que_el_modo_secuencial(tmp_path):
+    secuencias = main.GeneradorSecuenciasSinteticas(3).generar('bases_invalidas', 200)
+    serie, estadisticas_serie, _ = _procesar(tmp_path, secuencias, 0)
+    paralelo, estadisticas_paralelo, _ = _procesar(tmp_path, secuencias, 2)
+    desordenado, _, _ = _procesar(tmp_path, secuencias, 3, ordenado=False)
+    assert paralelo == serie
+    assert sorted(desordenado.splitlines()) == sorted(serie.splitlines())
+    assert estadisticas_paralelo['registros_validos'] == estadisticas_serie['registros_validos']
+
+
+def test_paralelo_conserva_los_resumenes_de_anomalias(tmp_path):
+    # 100 proteínas cortas ('MA') deben dar el mismo resumen con y sin trabajadores
+    secuencias = ['ATGGCCTAA'] * 100
+    _, _, resumen_serie = _procesar(tmp_path, secuencias, 0)
+    _, _, resumen_paralelo = _procesar(tmp_path, secuencias, 2)
+    assert resumen_serie == {'proteina_corta': 100}
+    assert resumen_paralelo == resumen_serie
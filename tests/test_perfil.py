@@ -0,0 +1,76 @@
+import collections
+import random
+
+import numpy as np
+import pytest
+
+import main
+
+pytest.importorskip('pandas')
+
+
+def _proteinas(cantidad, semilla):
+    aleatorio = random.Random(semilla)
+    return ["".join(aleatorio.choice('ACDEFGHIKLMNPQRSTVWY?') for _ in range(aleatorio.randrange(0, 30))) for _ in range(cantidad)]
+
+
+def _letra(residuo):
+    return residuo if residuo in main.AMINOACIDOS_PERFIL else 'X'
+
+
+def test_conteos_equivalen_a_contar_en_python():
+    proteinas = _proteinas(200, 1)
+    for k in (1, 2, 3):
+        perfil = main.PerfiladorComposicion(k)
+        perfil.agregar_proteinas(proteinas)
+        tablas = perfil.a_tablas()
+        aminoacidos = collections.Counter(_letra(residuo) for proteina in proteinas for residuo in proteina)
+        assert dict(zip(tablas['aminoacidos']['Aminoacido'], tablas['aminoacidos']['Conteo'])) == \
+            {letra: aminoacidos.get(letra, 0) for letra in main.AMINOACIDOS_PERFIL}
+        # Los k-mers no cruzan de una proteína a la siguiente
+        kmers = collections.Counter("".join(map(_letra, proteina[i:i + k])) for proteina in proteinas
+                                    for i in range(len(proteina) - k + 1))
+        assert dict(zip(tablas['kmers']['Kmer'], tablas['kmers']['Conteo'])) == dict(kmers)
+        assert perfil.numero_proteinas == len(proteinas)
+
+
+def test_uso_de_codones():
+    perfil = main.PerfiladorComposicion()
+    perfil.agregar_codones(['AUGGCCUAAGGG', 'AUGUU', 'GGG'], [2, 1, 1])
+    codones = perfil.a_tablas()['codones'].set_index('Codon')['Conteo']
+    assert codones[codones > 0].to_dict() == {'AUG': 2, 'GCC': 1, 'UAA': 1, 'GGG': 1}
+
+
+def test_combinar_y_guardar(tmp_path):
+    proteinas = _proteinas(100, 2)
+    completo, primera, segunda = main.PerfiladorComposicion(), main.PerfiladorComposicion(), main.PerfiladorComposicion()
+    completo.agregar_proteinas(proteinas)
+    primera.agregar_proteinas(proteinas[:40])
+    segunda.agregar_proteinas(proteinas[40:])
+    primera.combinar(segunda)
+    assert np.array_equal(primera.conteos_kmers, completo.conteos_kmers)
+    assert np.array_equal(primera.conteos_aminoacidos, completo.conteos_aminoacidos)
+    with pytest.raises(ValueError):
+        primera.combinar(main.PerfiladorComposicion(3))
+
+    prefijo = str(tmp_path / 'perfil')
+    completo.guardar(prefijo)
+    cargado = main.PerfiladorComposicion.cargar(prefijo)
+    assert cargado.numero_proteinas == completo.numero_proteinas
+    assert np.array_equal(cargado.conteos_kmers, completo.conteos_kmers)
+    assert np.array_equal(cargado.conteos_aminoacidos, completo.conteos_aminoacidos)
+
+
+def test_perfilar_archivo_por_bloques(tmp_path):
+    ruta, ruta_matriz = tmp_path / 'r.csv', tmp_path / 'matriz.csv'
+    with main.EscritorResultados(str(ruta)) as escritor:
+        escritor.agregar(('atggcctaa', 'ATGGCCTAA', 'AUGGCCUAA', 'MA', 2))
+        escritor.agregar(('atgtggtgg', 'ATGTGGTGG', 'AUGUGGUGG', 'MWW', 3))
+        escritor.agregar(('atg', 'ATG', 'AUG', 'M', 1))
+    perfil = main.PerfiladorComposicion.perfilar_archivo(str(ruta), k=2, tamano_bloque=2, ruta_matriz=str(ruta_matriz))
+    tablas = perfil.a_tablas()
+    assert dict(zip(tablas['kmers']['Kmer'], tablas['kmers']['Conteo'])) == {'MA': 1, 'MW': 1, 'WW': 1}
+    assert tablas['codones'].set_index('Codon')['Conteo']['AUG'] == 3
+    matriz = main.PerfiladorComposicion.matriz_composicion(['MA', 'MWW', 'M'])
+    assert ruta_matriz.read_text() == matriz.to_csv(index=False)
+    assert matriz['W'].tolist() == [0, 2, 0]
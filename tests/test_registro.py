@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def conversiones(monkeypatch):
+    """Cuenta cuántas veces se convierte a texto una SecuenciaResumida."""
+    llamadas = []
+    original = main.SecuenciaResumida.__str__
+
+    def contar(self):
+        llamadas.append(self.secuencia)
+        return original(self)
+    monkeypatch.setattr(main.SecuenciaResumida, '__str__', contar)
+    return llamadas
+
+
+def _gestor(nombre, nivel):
+    logging.getLogger(nombre).setLevel(nivel)
+    return main.GestorADN(main.RegistradorSecuencias(nombre_registrador=nombre), mostrar_avisos=False)
+
+
+def test_secuencia_resumida():
+    assert str(main.SecuenciaResumida('ATG')) == 'ATG'
+    largo = str(main.SecuenciaResumida('A' * 100, longitud_maxima=10))
+    assert largo.startswith('A' * 10 + '... (100 caracteres, blake2b=')
+
+
+def test_sin_info_no_se_formatea_nada(conversiones):
+    gestor = _gestor('prueba_registro_warning', logging.WARNING)
+    gestor.normalizar_adn('ATGGCC')
+    gestor.transcribir_adn('ATGGCC')
+    assert conversiones == []
+
+
+def test_con_info_se_formatea_al_emitir(conversiones, caplog):
+    gestor = _gestor('prueba_registro_info', logging.INFO)
+    with caplog.at_level(logging.INFO, logger='prueba_registro_info'):
+        gestor.normalizar_adn('ATGGCC')
+    assert "ADN normalizado: 'ATGGCC' -> ARN 'AUGGCC'" in caplog.messages
+    assert conversiones
+
+
+def test_nivel_por_etapa(conversiones, caplog):
+    nombre = 'prueba_registro_etapa'
+    logging.getLogger(nombre).setLevel(logging.INFO)
+    registrador = main.RegistradorSecuencias(nombre_registrador=nombre, niveles_etapa={'normalizar_adn': logging.WARNING})
+    gestor = main.GestorADN(registrador, mostrar_avisos=False)
+    with caplog.at_level(logging.INFO, logger=nombre):
+        gestor.normalizar_adn('ATGGCC')
+        gestor.normalizar_adn('ATGXCC')
+        gestor.transcribir_adn('ATG')
+    registros = {(registro.name, registro.levelno) for registro in caplog.records}
+    assert registros == {(f'{nombre}.validar_adn', logging.WARNING), (f'{nombre}.transcribir_adn', logging.INFO)}
@@ -0,0 +1,71 @@
+import sys
+import threading
+
+import main
+
+
+class _TransporteBloqueado(main.TransporteLocal):
+    """Retiene el hilo del reportador en el primer envío hasta que se libera."""
+
+    def __init__(self):
+        super().__init__()
+        self.enviando = threading.Event()
+        self.liberar = threading.Event()
+
+    def enviar(self, evento):
+        self.enviando.set()
+        self.liberar.wait(5)
+        super().enviar(evento)
+
+
+def _resumen(transporte, tipo):
+    return next(evento for evento in transporte.eventos if evento.get('etiquetas', {}).get('tipo_anomalia') == tipo)
+
+
+def test_anomalias_agregadas_por_tipo():
+    transporte = main.TransporteLocal()
+    reportador = main.ReportadorAnomalias(transporte, intervalo_resumen=3600, muestras_por_tipo=3, longitud_maxima_muestra=10)
+    for numero in range(50):
+        reportador.reportar_anomalia('proteina_corta', muestra='M' * (numero + 1), datos={'longitud_proteina': numero + 1})
+    reportador.reportar_anomalia('codones_desconocidos', muestra='AUGNNN')
+    reportador.cerrar()
+    assert len(transporte.eventos) == 2
+    corta = _resumen(transporte, 'proteina_corta')
+    assert corta['etiquetas']['conteo'] == 50
+    assert len(corta['extras']['muestras']) == 3
+    assert all(len(muestra['secuencia']) <= 10 or muestra['secuencia'].endswith('caracteres)')
+               for muestra in corta['extras']['muestras'])
+    assert _resumen(transporte, 'codones_desconocidos')['extras']['muestras'] == [{'secuencia': 'AUGNNN'}]
+
+
+def test_cola_llena_descarta_y_lo_resume_en_un_evento():
+    transporte = _TransporteBloqueado()
+    reportador = main.ReportadorAnomalias(transporte, capacidad_cola=5, intervalo_resumen=3600)
+    reportador.reportar_evento("error", 'error')
+    assert transporte.enviando.wait(5)
+    for _ in range(20):
+        reportador.reportar_anomalia('proteina_larga', muestra='M')
+    reportador.reportar_evento("otro error", 'error')
+    transporte.liberar.set()
+    reportador.cerrar()
+    descartados = _resumen(transporte, 'eventos_descartados')
+    assert descartados['extras']['descartados_por_tipo'] == {'proteina_larga': 15, 'evento': 1}
+    assert descartados['etiquetas']['conteo'] == 16
+    assert _resumen(transporte, 'proteina_larga')['etiquetas']['conteo'] == 5
+
+
+def test_telemetria_de_trabajador_se_incorpora():
+    telemetria = main.TelemetriaTrabajador()
+    telemetria.reportar_anomalia('proteina_corta', muestra='MA')
+    try:
+        raise RuntimeError("fallo en el trabajador")
+    except RuntimeError:
+        telemetria.reportar_evento("fallo", 'error', exc_info=sys.exc_info())
+    transporte = main.TransporteLocal()
+    reportador = main.ReportadorAnomalias(transporte, intervalo_resumen=3600)
+    reportador.incorporar(telemetria.extraer())
+    reportador.cerrar()
+    assert telemetria.extraer() == []
+    assert _resumen(transporte, 'proteina_corta')['etiquetas']['conteo'] == 1
+    evento = next(evento for evento in transporte.eventos if evento['mensaje'] == "fallo")
+    assert 'RuntimeError: fallo en el trabajador' in evento['extras']['traza']
@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import main
+
+
+async def _peticion(puerto, metodo, ruta, cuerpo=b'', cabeceras=None):
+    """Envía una petición con Connection: close y lee la respuesta hasta EOF."""
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    lineas = [f"{metodo} {ruta} HTTP/1.1", "Host: prueba", f"Content-Length: {len(cuerpo)}", "Connection: close"]
+    lineas += [f"{nombre}: {valor}" for nombre, valor in (cabeceras or {}).items()]
+    escritor.write(("\r\n".join(lineas) + "\r\n\r\n").encode('latin-1') + cuerpo)
+    await escritor.drain()
+    respuesta = await lector.read() # Hasta que el servidor cierre la conexión
+    escritor.close()
+    cabecera, _, contenido = respuesta.partition(b'\r\n\r\n')
+    return int(cabecera.split()[1]), contenido
+
+
+def _con_servicio(prueba, **opciones):
+    async def ejecutar():
+        servicio = main.ServicioSecuencias(main.RegistradorSecuencias(), **opciones)
+        servidor = await servicio.abrir_servidor('127.0.0.1', 0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        try:
+            async with servidor:
+                return await prueba(servicio, puerto)
+        finally:
+            await servicio.detener()
+    return asyncio.run(ejecutar())
+
+
+def test_procesar_devuelve_el_mismo_resultado_que_el_lote():
+    async def prueba(servicio, puerto):
+        cuerpo = json.dumps({'secuencias': ['ATGGCCTAA', {'id': 'r2', 'secuencia': 'ATGXX'}]}).encode()
+        return await _peticion(puerto, 'POST', '/procesar', cuerpo)
+    codigo, contenido = _con_servicio(prueba)
+    resultados = json.loads(contenido)['resultados']
+    assert codigo == 200
+    assert resultados[0]['Proteina_Secuencia'] == 'MA'
+    assert resultados[1] == {'id': 'r2', 'valido': False, 'ADN_Original': 'ATGXX'}
+
+
+def test_peticiones_concurrentes_con_connection_close_terminan_con_trabajadores():
+    # Los procesos del pool no deben heredar las conexiones: si lo hacen, el cliente no recibe EOF
+    async def prueba(servicio, puerto):
+        cuerpo = json.dumps({'secuencia': 'ATGAAATTTTAG'}).encode()
+        return await asyncio.wait_for(
+            asyncio.gather(*(_peticion(puerto, 'POST', '/procesar', cuerpo) for _ in range(60))), 20)
+    respuestas = _con_servicio(prueba, trabajadores=2)
+    assert [codigo for codigo, _ in respuestas] == [200] * 60
+    assert all(json.loads(contenido)['resultados'][0]['Proteina_Secuencia'] == 'MKF' for _, contenido in respuestas)
+
+
+def test_expect_100_continue_y_errores():
+    async def prueba(servicio, puerto):
+        continuar = await _peticion(puerto, 'POST', '/procesar', b'{"secuencia": "ATG"}', {'Expect': '100-continue'})
+        invalida = await _peticion(puerto, 'POST', '/procesar', b'{"nada": 1}')
+        desconocida = await _peticion(puerto, 'GET', '/nada')
+        return continuar, invalida, desconocida
+    continuar, invalida, desconocida = _con_servicio(prueba)
+    # La respuesta provisional 100 precede a la definitiva
+    assert continuar[0] == 100 and b'HTTP/1.1 200 OK' in continuar[1]
+    assert invalida[0] == 400
+    assert desconocida[0] == 404
+
+
+def test_error_inesperado_responde_500(monkeypatch):
+    async def fallar(lote):
+        raise RuntimeError("pool roto")
+
+    async def prueba(servicio, puerto):
+        monkeypatch.setattr(servicio, 'procesar', lambda registros: fallar(registros))
+        return await _peticion(puerto, 'POST', '/procesar', b'{"secuencia": "ATG"}')
+    codigo, contenido = _con_servicio(prueba)
+    assert codigo == 500
+    assert 'error' in json.loads(contenido)
+
+
+def test_micro_lote_se_traduce_igual_que_registro_a_registro():
+    registrador = main.RegistradorSecuencias()
+    procesador = main.ProcesadorLotes(main.GestorADN(registrador, mostrar_avisos=False),
+                                      main.AnalizadorProteinas(registrador, mostrar_avisos=False), registrador,
+                                      cache=main.CacheTraducciones(1 << 20))
+    generador = main.GeneradorSecuenciasSinteticas(2)
+    secuencias = generador.generar('bases_invalidas', 300) + generador.generar('rico_en_stop', 300) + ['', 'AT', 'ATGÑ']
+    assert procesador.procesar_registros(secuencias) == [procesador.procesar_registro(secuencia) for secuencia in secuencias]
+
+
+def test_traduccion_vectorizada_por_lotes_coincide_con_la_individual():
+    arns = ['', 'AU', 'UAA', 'AUGUAG', 'AUGNNNGCC', 'AUGGCCUAAGGG', 'CCCAUGAAAUUU', 'AUGÑÑÑUAA']
+    assert main.traducir_arns_vectorizado(arns) == [main.traducir_arn_vectorizado(arn) for arn in arns]
+
+
+def test_detener_responde_a_las_peticiones_en_curso(tmp_path):
+    async def ejecutar():
+        servicio = main.ServicioSecuencias(main.RegistradorSecuencias(), espera_lote=0.2, ruta_resultados=str(tmp_path / 'r.csv'))
+        await servicio.iniciar()
+        # Peticiones aceptadas justo antes de detener: una esperando lote y otra ya en vuelo
+        peticiones = [asyncio.ensure_future(servicio.procesar([('1', 'ATGGCCTAA')]))]
+        await asyncio.sleep(0.3)
+        peticiones.append(asyncio.ensure_future(servicio.procesar([('2', 'ATGAAATAA')])))
+        await asyncio.sleep(0)
+        await servicio.detener()
+        return await asyncio.gather(*peticiones)
+    resultados = asyncio.run(ejecutar())
+    assert [resultado[0]['Proteina_Secuencia'] for resultado in resultados] == ['MA', 'MK']
+    assert (tmp_path / 'r.csv').read_text().count('\n') == 3 # Cabecera y las dos filas
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import main
+
+
+def _secuencias_aleatorias(cantidad=300, semilla=2):
+    aleatorio = random.Random(semilla)
+    secuencias = ['', 'A', 'AU', 'AUG', 'AUGUAA', 'UAAAUG', 'AUGNNNGCC', 'augGCC', 'AUGGC']
+    for _ in range(cantidad):
+        # Algún carácter no ACGU para ejercitar los codones desconocidos
+        secuencias.append("".join(aleatorio.choice('ACGUACGUACGUN') for _ in range(aleatorio.randrange(0, 240))))
+    return secuencias
+
+
+@pytest.mark.parametrize('arn', _secuencias_aleatorias())
+def test_motor_vectorizado_equivale_al_bucle(arn):
+    analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False, motor_traduccion='python')
+    assert main.traducir_arn_vectorizado(arn) == analizador._traducir_codones(arn)
+
+
+def test_traducir_arn_con_cada_motor():
+    arns = _secuencias_aleatorias(50, semilla=5)
+    resultados = {}
+    for motor in main.AnalizadorProteinas.MOTORES_TRADUCCION:
+        analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False, motor_traduccion=motor)
+        resultados[motor] = ([analizador.traducir_arn(arn) for arn in arns], analizador.traducir_arns(arns))
+    assert resultados['python'] == resultados['vectorizado'] == resultados['auto']
+    assert resultados['python'][0] == resultados['python'][1]
+
+
+def test_tabla_de_codones():
+    analizador = main.AnalizadorProteinas(main.RegistradorSecuencias(), mostrar_avisos=False, motor_traduccion='vectorizado')
+    for codon, aminoacido in main.tabla_codones.items():
+        esperado = '' if aminoacido == 'STOP' else aminoacido
+        assert analizador.traducir_arn(codon) == esperado
+    assert analizador.traducir_arn('AUGUUUUAGGCC') == 'MF'
+
+
+def test_motor_desconocido():
+    with pytest.raises(ValueError):
+        main.AnalizadorProteinas(main.RegistradorSecuencias(), motor_traduccion='gpu')